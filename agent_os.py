@@ -1,15 +1,19 @@
-from agno.os import AgentOS
+from devkit.os_app import LazyAgentOS
+from devkit.registry import TEAM, AgentRegistry
 
-from devkit.agent_dev import wakeup_agent
-from devkit.agent_team import reasoning_finance_team
+# Components are declared as factories and built on the first request (or prewarmed at startup)
+registry = AgentRegistry()
+registry.register("dev-pet", "devkit.agent_dev:wakeup_agent")
+registry.register("finance-team", "devkit.agent_team:build_reasoning_finance_team", kind=TEAM)
 
-agent = wakeup_agent()
-agent_os = AgentOS(
+agent_os = LazyAgentOS(
+    registry,
+    prewarm=True,
+    telemetry=True,
     os_id="agent-os",
     description="AgentOS",
-    agents=[agent],
-    teams=[reasoning_finance_team]
 )
 app = agent_os.get_app()
 if __name__ == "__main__":
-    agent_os.serve(app="agent_os:app", reload=True)
\ No newline at end of file
+    # Development server; in production run `python -m devkit.serve agent_os:app --workers 4`
+    agent_os.serve(app="agent_os:app", reload=True)
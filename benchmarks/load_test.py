@@ -0,0 +1,196 @@
+"""
+Load test of the pre-forked AgentOS server (`devkit.serve`) against the local stub model.
+
+    python -m benchmarks.load_test                                  # 1, 2 and 4 workers
+    python -m benchmarks.load_test --workers 1 4 --clients 64 --duration 20 --stream
+
+For each worker count the stub model and `python -m devkit.serve agent_os:app` are started,
+the test waits until every worker answers `/readyz`, then `--clients` concurrent clients post
+DEV-PET runs (a new session each) for `--duration` seconds. Throughput, latency and errors
+per worker count are printed, with the speedup over the first worker count, and written as
+JSON to `--output` when given. With `--latency` and `--token-delay` at 0 the numbers measure
+the server's own overhead, which is what extra workers scale.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .run import PROMPT, ROOT, summarize
+from .stub_server import StubModelServer
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace, workers: int, port: int, workdir: str, stub: StubModelServer) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT), os.environ.get("PYTHONPATH", "")]),
+        "OPENAI_BASE_URL": stub.base_url,
+        "OPENAI_API_KEY": "sk-load-test",
+        "AGNO_TELEMETRY": "false",
+        "DB_FILE": str(Path(workdir) / "data.db"),
+        # Admission control is per worker; keep it out of the way of the measured limits
+        "LLM_MAX_CONCURRENCY": str(args.clients),
+        "LLM_MAX_QUEUE": str(args.clients * 4),
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "devkit.serve", args.app,
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+            "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(base_url: str, workers: int, server: subprocess.Popen, timeout: float) -> float:
+    """Wait until `workers` distinct worker processes answer ready; returns the seconds it took."""
+    start = time.perf_counter()
+    pids = set()
+    while time.perf_counter() - start < timeout:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with {server.returncode} before it was ready")
+        try:
+            response = httpx.get(f"{base_url}/readyz", headers={"Connection": "close"}, timeout=2)
+            if response.status_code == 200:
+                pids.add(response.json()["pid"])
+                if len(pids) >= workers:
+                    return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{len(pids)} of {workers} workers ready after {timeout}s")
+
+
+async def run_load(args: argparse.Namespace, base_url: str, agent_id: str) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: List[str] = []
+    deadline = time.perf_counter() + args.duration
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+
+    async def client(http: httpx.AsyncClient, index: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            data = {"message": f"{PROMPT} ({n})", "stream": str(args.stream).lower(), "session_id": f"load-{index}-{n}"}
+            start = time.perf_counter()
+            try:
+                if args.stream:
+                    async with http.stream("POST", f"/agents/{agent_id}/runs", data=data) as response:
+                        async for _ in response.aiter_lines():
+                            pass
+                else:
+                    response = await http.post(f"/agents/{agent_id}/runs", data=data)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors.append(f"{response.status_code}")
+            except httpx.HTTPError as e:
+                errors.append(type(e).__name__)
+            n += 1
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.request_timeout) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http, i) for i in range(args.clients)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "latency": summarize(latencies) if latencies else None,
+        "errors": len(errors),
+        "error_kinds": sorted(set(errors)),
+    }
+
+
+def load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    cpus = os.cpu_count() or 1
+    if max(args.workers) > cpus:
+        print(f"Only {cpus} CPU(s): worker counts above that cannot scale throughput", file=sys.stderr)
+    with StubModelServer(reply_tokens=args.reply_tokens, latency=args.latency, token_delay=args.token_delay) as stub:
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory(prefix="devkit-load-") as workdir:
+                port = _free_port()
+                base_url = f"http://127.0.0.1:{port}"
+                print(f"Testing {workers} worker(s)...", file=sys.stderr)
+                server = start_server(args, workers, port, workdir, stub)
+                try:
+                    ready_seconds = wait_until_ready(base_url, workers, server, args.startup_timeout)
+                    # One request per worker count to warm connections and first-run code paths
+                    asyncio.run(_warmup(base_url, args.agent))
+                    result = asyncio.run(run_load(args, base_url, args.agent))
+                    result["ready_seconds"] = round(ready_seconds, 2)
+                finally:
+                    server.send_signal(signal.SIGTERM)
+                    try:
+                        server.wait(timeout=60)
+                    except subprocess.TimeoutExpired:
+                        server.kill()
+                results[str(workers)] = result
+    baseline = results[str(args.workers[0])]["requests_per_second"]
+    for result in results.values():
+        result["speedup"] = round(result["requests_per_second"] / baseline, 2) if baseline else None
+    return results
+
+
+async def _warmup(base_url: str, agent_id: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+        await http.post(f"/agents/{agent_id}/runs", data={"message": PROMPT, "stream": "false", "session_id": "warmup"})
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"{'workers':>7} {'req/s':>8} {'speedup':>7} {'p50 ms':>9} {'p95 ms':>9} {'errors':>6}")
+    for workers, result in results.items():
+        latency = result["latency"] or {}
+        print(
+            f"{workers:>7} {result['requests_per_second']:>8} {result['speedup'] or 0:>7} "
+            f"{latency.get('p50_ms', 0):>9} {latency.get('p95_ms', 0):>9} {result['errors']:>6}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="agent_os:app", help="ASGI app import string, default agent_os:app")
+    parser.add_argument("--agent", default="dev-pet", help="Agent id the runs are posted to")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per worker count")
+    parser.add_argument("--stream", action="store_true", help="Request streamed runs")
+    parser.add_argument("--reply-tokens", type=int, default=50, help="Words in every stub reply")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub seconds before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Stub seconds between streamed words")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--verbose", action="store_true", help="Show the server's log")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    results = load_test(args)
+    print_report(results)
+    if args.output:
+        report = {"config": {k: v for k, v in vars(args).items() if k != "output"}, "results": results}
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Offline benchmarks of DEV-PET's own overhead.
+
+Every model call goes to a local `StubModelServer`, so the numbers measure agent
+construction, prompt assembly, tool dispatch, storage and streaming, not a provider.
+
+    python -m benchmarks.run                       # all benchmarks, JSON in benchmarks/results/
+    python -m benchmarks.run --only turns streaming --output bench.json
+    python -m benchmarks.run --compare benchmarks/results/<older commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .stub_server import StubModelServer
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+PROMPT = "Explain what a race condition is in two sentences"
+TOOL_PROMPT = 'Encode this for me [call:base64_encode {"text": "hello benchmark"}]'
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds."""
+    ordered = sorted(seconds)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    index = (len(ordered) - 1) * q
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def _model():
+    from devkit.router import RoutingOpenAIChat
+
+    return RoutingOpenAIChat(id="gpt-4.1-mini", fast_id="gpt-4.1-nano")
+
+
+def bench_build_agent(args: argparse.Namespace) -> Dict[str, Any]:
+    """`build_agent` with fresh toolkits, and the `AgentPool` path that reuses shared ones."""
+    from devkit.agent_dev import build_agent
+    from devkit.agent_pool import AgentPool
+
+    fresh = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        build_agent(model=_model(), session_id=str(uuid.uuid4()), debug_mode=False)
+        fresh.append(time.perf_counter() - start)
+
+    pool = AgentPool(debug_mode=False)
+    pool.warmup()
+    pooled = []
+    for _ in range(args.iterations):
+        session_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        pool.get(session_id)
+        pooled.append(time.perf_counter() - start)
+        pool.evict(session_id)
+    return {"fresh_tools": summarize(fresh), "agent_pool": summarize(pooled)}
+
+
+def bench_cold_start(args: argparse.Namespace) -> Dict[str, Any]:
+    """`main.wakeup_agent` in a fresh interpreter (imports plus the first agent), and the `agent_os` import."""
+    script = (
+        "import time; start = time.perf_counter()\n"
+        "import main\n"
+        "imported = time.perf_counter()\n"
+        "main.wakeup_agent()\n"
+        "print(imported - start, time.perf_counter() - imported)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), os.environ.get("PYTHONPATH", "")])}
+    imports, wakeups, processes = [], [], []
+    for _ in range(args.cold_runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        processes.append(time.perf_counter() - start)
+        imported, woken = map(float, output.strip().splitlines()[-1].split())
+        imports.append(imported)
+        wakeups.append(woken)
+    from devkit.utils.startup import startup_report
+
+    report = startup_report("agent_os", path=str(ROOT))
+    return {
+        "import": summarize(imports),
+        "wakeup_agent": summarize(wakeups),
+        "process": summarize(processes),
+        "agent_os_import_ms": round(report.total_seconds * 1000, 3),
+        "slowest_imports_ms": {m.name: round(m.cumulative_seconds * 1000, 3) for m in report.slowest(10)},
+    }
+
+
+def bench_turns(args: argparse.Namespace) -> Dict[str, Any]:
+    """Consecutive turns of one session with history on; every `tool_every`-th turn calls a tool."""
+    from devkit.agent_dev import build_agent
+
+    agent = build_agent(model=_model(), session_id=str(uuid.uuid4()), debug_mode=False)
+    latencies, tool_latencies = [], []
+    input_tokens = cached_tokens = 0
+    for turn in range(args.turns):
+        with_tool = args.tool_every and turn % args.tool_every == args.tool_every - 1
+        start = time.perf_counter()
+        output = agent.run(f"{TOOL_PROMPT if with_tool else PROMPT} (turn {turn})")
+        (tool_latencies if with_tool else latencies).append(time.perf_counter() - start)
+        if output.metrics is not None:
+            input_tokens += output.metrics.input_tokens
+            cached_tokens += output.metrics.cache_read_tokens
+    result = {
+        "per_turn_ms": [round(s * 1000, 3) for s in latencies],
+        "text_turns": summarize(latencies),
+        # As the stub's imitation of provider prefix caching would serve it
+        "cached_token_ratio": round(cached_tokens / input_tokens, 3) if input_tokens else 0.0,
+    }
+    if tool_latencies:
+        result["tool_turns"] = summarize(tool_latencies)
+    return result
+
+
+def bench_streaming(args: argparse.Namespace) -> Dict[str, Any]:
+    """Stream replies through `web.py`'s `on_message` handler and measure time to first token and throughput."""
+    try:
+        import chainlit  # noqa: F401
+    except ImportError:
+        return _stream_without_chainlit(args)
+
+    import web
+
+    ui = _FakeChainlit()
+    web.cl = ui
+    handler = getattr(web.main, "__wrapped__", web.main)
+    runs = []
+    for i in range(args.streams):
+        ui.session_id = f"bench-stream-{i}"
+        start = time.perf_counter()
+        asyncio.run(handler(_FakeMessage(PROMPT)))
+        runs.append(_stream_run(start, ui.messages[-1]))
+    return {"handler": "web.main", **_stream_summary(runs)}
+
+
+def _stream_without_chainlit(args: argparse.Namespace) -> Dict[str, Any]:
+    # Same path as web.main (pooled agent, arun stream, CoalescingStream) without the Chainlit UI calls
+    from devkit.agent_pool import AgentPool
+    from devkit.context import ContextBudget
+    from devkit.utils.streaming import CoalescingStream
+
+    pool = AgentPool(debug_mode=False, context_budget=ContextBudget())
+    pool.warmup()
+
+    async def stream(session_id: str) -> Dict[str, Any]:
+        message = _FakeMessage("")
+        start = time.perf_counter()
+        agent = pool.get(session_id)
+        async for text in CoalescingStream(agent.arun(PROMPT, stream=True), max_chars=256, max_delay=0.04):
+            await message.stream_token(text)
+        return _stream_run(start, message)
+
+    runs = [asyncio.run(stream(f"bench-stream-{i}")) for i in range(args.streams)]
+    return {"handler": "AgentPool + CoalescingStream (chainlit not installed)", **_stream_summary(runs)}
+
+
+def _stream_run(start: float, message: "_FakeMessage") -> Dict[str, float]:
+    end = message.updated_at or time.perf_counter()
+    first = message.token_times[0] if message.token_times else end
+    return {"total": end - start, "first": first - start, "chars": len(message.content), "updates": len(message.token_times)}
+
+
+def _stream_summary(runs: List[Dict[str, float]]) -> Dict[str, Any]:
+    total_chars = sum(run["chars"] for run in runs)
+    total_seconds = sum(run["total"] for run in runs)
+    return {
+        "time_to_first_token": summarize([run["first"] for run in runs]),
+        "total": summarize([run["total"] for run in runs]),
+        "chars_per_second": round(total_chars / total_seconds, 1) if total_seconds else 0.0,
+        "ui_updates_per_reply": round(statistics.fmean(run["updates"] for run in runs), 1),
+    }
+
+
+class _FakeMessage:
+    """Stands in for `cl.Message`, recording when each coalesced chunk reaches the UI."""
+
+    def __init__(self, content: str = "", **kwargs: Any):
+        self.content = content
+        self.token_times: List[float] = []
+        self.updated_at: Optional[float] = None
+
+    async def stream_token(self, token: str) -> None:
+        self.token_times.append(time.perf_counter())
+        self.content += token
+
+    async def send(self) -> "_FakeMessage":
+        return self
+
+    async def update(self) -> None:
+        self.updated_at = time.perf_counter()
+
+
+class _FakeChainlit:
+    """The few `chainlit` attributes `web.main` touches, so the handler can run outside a Chainlit server."""
+
+    def __init__(self):
+        self.session_id = "bench"
+        self.messages: List[_FakeMessage] = []
+        self.user_session = _FakeUserSession()
+
+    @property
+    def context(self) -> Any:
+        return _Namespace(session=_Namespace(id=self.session_id, user=None))
+
+    def Message(self, content: str = "", **kwargs: Any) -> _FakeMessage:
+        message = _FakeMessage(content, **kwargs)
+        self.messages.append(message)
+        return message
+
+
+class _FakeUserSession(dict):
+    def set(self, key: str, value: Any) -> None:
+        self[key] = value
+
+
+class _Namespace:
+    def __init__(self, **kwargs: Any):
+        self.__dict__.update(kwargs)
+
+
+def bench_agent_os(args: argparse.Namespace) -> Dict[str, Any]:
+    """`POST /agents/{id}/runs` on the `agent_os` app from N concurrent clients (in-process ASGI, no sockets)."""
+    import httpx
+
+    import agent_os
+
+    agent_id = agent_os.registry.get("dev-pet").id
+
+    async def client(app_client: "httpx.AsyncClient", index: int, latencies: List[float], errors: List[str]) -> None:
+        for i in range(args.requests_per_client):
+            start = time.perf_counter()
+            response = await app_client.post(
+                f"/agents/{agent_id}/runs",
+                data={"message": f"{PROMPT} ({i})", "stream": "false", "session_id": f"bench-os-{index}"},
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(f"{response.status_code}: {response.text[:200]}")
+
+    async def level(concurrency: int) -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors: List[str] = []
+        transport = httpx.ASGITransport(app=agent_os.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://agent-os", timeout=120) as app_client:
+            start = time.perf_counter()
+            await asyncio.gather(*(client(app_client, i, latencies, errors) for i in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        return {
+            "requests_per_second": round(len(latencies) / elapsed, 2),
+            "latency": summarize(latencies),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+        }
+
+    return {str(concurrency): asyncio.run(level(concurrency)) for concurrency in args.concurrency}
+
+
+def bench_session_writes(args: argparse.Namespace) -> Dict[str, Any]:
+    """`upsert_session` latency on the SQLite storage as a session grows by one run per write."""
+    from agno.models.message import Message
+    from agno.run.agent import RunOutput
+    from agno.session import AgentSession
+
+    from devkit.db.settings import DbSettings
+    from devkit.db.storage import get_storage
+
+    storage = get_storage(DbSettings(db_file=str(Path(args.workdir) / "session_writes.db")))
+    now = int(time.time())
+    session = AgentSession(
+        session_id=str(uuid.uuid4()), agent_id="bench", user_id="bench", runs=[], created_at=now, updated_at=now
+    )
+    reply = "x" * 2000
+    latencies = []
+    for i in range(args.session_writes):
+        session.runs.append(RunOutput(
+            run_id=str(uuid.uuid4()),
+            agent_id="bench",
+            session_id=session.session_id,
+            content=reply,
+            messages=[Message(role="user", content=f"{PROMPT} ({i})"), Message(role="assistant", content=reply)],
+        ))
+        session.updated_at = int(time.time())
+        start = time.perf_counter()
+        stored = storage.upsert_session(session)
+        latencies.append(time.perf_counter() - start)
+        if stored is None:
+            raise RuntimeError(f"upsert_session failed on write {i + 1}")
+    tenth = max(1, len(latencies) // 10)
+    return {
+        "all": summarize(latencies),
+        "first_10pct": summarize(latencies[:tenth]),
+        "last_10pct": summarize(latencies[-tenth:]),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, Any]]] = {
+    "build_agent": bench_build_agent,
+    "cold_start": bench_cold_start,
+    "turns": bench_turns,
+    "streaming": bench_streaming,
+    "agent_os": bench_agent_os,
+    "session_writes": bench_session_writes,
+}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Relative change of every mean, p95 and throughput figure present in both result files."""
+    lines = []
+
+    def walk(new: Any, old: Any, path: str) -> None:
+        if isinstance(new, dict) and isinstance(old, dict):
+            for key in new:
+                if key in old:
+                    walk(new[key], old[key], f"{path}.{key}" if path else key)
+        elif isinstance(new, (int, float)) and isinstance(old, (int, float)) and old:
+            if path.endswith(("mean_ms", "p95_ms", "per_second")):
+                lines.append(f"{path}: {old:g} -> {new:g} ({(new - old) / old * 100:+.1f}%)")
+
+    walk(current.get("results", {}), baseline.get("results", {}), "")
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run, default all")
+    parser.add_argument("--output", help="Result file, default benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="Earlier result file to print relative changes against")
+    parser.add_argument("--iterations", type=int, default=20, help="Agents built per build_agent variant")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Fresh interpreters for the cold start")
+    parser.add_argument("--turns", type=int, default=12, help="Turns in the history benchmark")
+    parser.add_argument("--tool-every", type=int, default=4, help="Every n-th turn calls a tool, 0 for none")
+    parser.add_argument("--streams", type=int, default=5, help="Streamed replies")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="AgentOS client counts")
+    parser.add_argument("--requests-per-client", type=int, default=5)
+    parser.add_argument("--session-writes", type=int, default=50)
+    parser.add_argument("--reply-tokens", type=int, default=200, help="Words in every stub reply")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub seconds before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Stub seconds between streamed words")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    names = args.only or list(BENCHMARKS)
+    commit = _git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit or 'unknown'}.json"
+    output = output.resolve()
+
+    with tempfile.TemporaryDirectory(prefix="devkit-bench-") as workdir, \
+            StubModelServer(
+                reply_tokens=args.reply_tokens, latency=args.latency, token_delay=args.token_delay, prompt_cache=True
+            ) as stub:
+        args.workdir = workdir
+        # Before devkit is imported: settings are read at import, files land in the scratch directory
+        os.environ.update({
+            "OPENAI_BASE_URL": stub.base_url,
+            "OPENAI_API_KEY": "sk-benchmark",
+            "AGNO_TELEMETRY": "false",
+            "DB_FILE": str(Path(workdir) / "data.db"),
+        })
+        sys.path.insert(0, str(ROOT))
+        os.chdir(workdir)
+
+        results: Dict[str, Any] = {}
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            start = time.perf_counter()
+            try:
+                results[name] = BENCHMARKS[name](args)
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+            results[name]["wall_seconds"] = round(time.perf_counter() - start, 3)
+        model_requests = stub.requests
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model_requests": model_requests,
+            "config": {k: v for k, v in vars(args).items() if k not in ("workdir", "output", "compare", "only")},
+        },
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    if args.compare:
+        for line in compare(report, json.loads(Path(args.compare).read_text())):
+            print(line)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# `[call:<tool> <json arguments>]` in the last user message makes the stub answer with that tool call
+TOOL_CALL_PATTERN = re.compile(r"\[call:(?P<name>[\w.-]+)\s*(?P<arguments>\{.*?\})?\]", re.DOTALL)
+WORDS = (
+    "the agent answers with a short canned reply so that every measured millisecond "
+    "is spent in our own code instead of waiting for a remote model to think"
+).split()
+
+
+class StubModelServer:
+    """
+    Local OpenAI-compatible chat completions server for offline benchmarks.
+
+    `POST /v1/chat/completions` answers every request with `reply_tokens` canned words,
+    as one message or as an SSE stream (one word per chunk, `token_delay` seconds apart,
+    with a final usage chunk when `stream_options.include_usage` is set). `latency` is
+    slept before the first byte to model the time to first token of a real provider.
+
+    Tool calls are scripted from the prompt: when the last message is a user message
+    containing `[call:base64_encode {"text": "hi"}]` and the request offers that tool,
+    the stub calls it; once the tool result comes back it replies with text as usual.
+
+    With `prompt_cache` the stub imitates provider prompt caching: the usage reports as
+    `cached_tokens` the longest prefix of the prompt, in whole `prompt_cache_block`
+    character blocks, that an earlier request to the same model with the same tools
+    started with.
+    """
+
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            reply_tokens: int = 40,
+            latency: float = 0.0,
+            token_delay: float = 0.0,
+            prompt_cache: bool = False,
+            prompt_cache_block: int = 512,
+    ):
+        self.reply_tokens = reply_tokens
+        self.latency = latency
+        self.token_delay = token_delay
+        self.prompt_cache = prompt_cache
+        self.prompt_cache_block = prompt_cache_block
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._cached_prefixes: Set[str] = set()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubModelServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-model-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubModelServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def reply(self, request: Dict[str, Any]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """The text or the tool calls the stub answers `request` with."""
+        with self._lock:
+            self.requests += 1
+        messages = request.get("messages") or []
+        last = messages[-1] if messages else {}
+        if last.get("role") == "user":
+            offered = {tool.get("function", {}).get("name") for tool in request.get("tools") or []}
+            calls = [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "function",
+                    "function": {"name": match["name"], "arguments": match["arguments"] or "{}"},
+                }
+                for match in TOOL_CALL_PATTERN.finditer(_text(last.get("content")))
+                if match["name"] in offered
+            ]
+            if calls:
+                return None, calls
+        return " ".join(WORDS[i % len(WORDS)] for i in range(self.reply_tokens)), []
+
+    def cached_tokens(self, request: Dict[str, Any]) -> int:
+        """Prompt tokens of `request` a caching provider would serve from its prefix cache."""
+        if not self.prompt_cache:
+            return 0
+        block = self.prompt_cache_block
+        prompt = "".join(f"{m.get('role')}:{_text(m.get('content'))}\n" for m in request.get("messages") or [])
+        # Each block is keyed on everything before it, so a changed byte invalidates the rest
+        prefix = hashlib.sha256(json.dumps([request.get("model"), request.get("tools")], sort_keys=True).encode())
+        cached_blocks, hit = 0, True
+        with self._lock:
+            for start in range(0, len(prompt) - block + 1, block):
+                prefix.update(prompt[start:start + block].encode())
+                key = prefix.hexdigest()
+                if hit and key in self._cached_prefixes:
+                    cached_blocks += 1
+                else:
+                    hit = False
+                    self._cached_prefixes.add(key)
+        return cached_blocks * block // 4
+
+
+def _make_handler(stub: StubModelServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            content, tool_calls = stub.reply(request)
+            cached_tokens = stub.cached_tokens(request)
+            if stub.latency:
+                time.sleep(stub.latency)
+            if request.get("stream"):
+                self._stream(request, content, tool_calls, cached_tokens)
+            else:
+                self._send_json(200, _completion(request, content, tool_calls, cached_tokens))
+
+        def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(
+                self,
+                request: Dict[str, Any],
+                content: Optional[str],
+                tool_calls: List[Dict[str, Any]],
+                cached_tokens: int,
+        ) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = request.get("model", "stub")
+            if tool_calls:
+                deltas = [{"role": "assistant", "tool_calls": [{"index": i, **call} for i, call in enumerate(tool_calls)]}]
+                finish_reason = "tool_calls"
+            else:
+                words = content.split(" ")
+                deltas = [{"role": "assistant", "content": ""}]
+                deltas += [{"content": word if i == 0 else f" {word}"} for i, word in enumerate(words)]
+                finish_reason = "stop"
+            for i, delta in enumerate(deltas):
+                if i > 1 and stub.token_delay:
+                    time.sleep(stub.token_delay)
+                self._event(_chunk(completion_id, model, delta))
+            self._event(_chunk(completion_id, model, {}, finish_reason))
+            if (request.get("stream_options") or {}).get("include_usage"):
+                self._event({**_chunk(completion_id, model, None), "usage": _usage(request, content, tool_calls, cached_tokens)})
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def _event(self, body: Dict[str, Any]) -> None:
+            self._write_chunk(f"data: {json.dumps(body)}\n\n".encode())
+
+        def _write_chunk(self, data: bytes) -> None:
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def _completion(
+        request: Dict[str, Any], content: Optional[str], tool_calls: List[Dict[str, Any]], cached_tokens: int = 0
+) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+        "usage": _usage(request, content, tool_calls, cached_tokens),
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: Optional[Dict[str, Any]], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+    choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": choices,
+    }
+
+
+def _usage(
+        request: Dict[str, Any], content: Optional[str], tool_calls: List[Dict[str, Any]], cached_tokens: int = 0
+) -> Dict[str, Any]:
+    # Rough 4 characters per token, enough for the token counters to move
+    prompt_chars = sum(len(_text(m.get("content"))) for m in request.get("messages") or [])
+    completion_chars = len(content or "") + sum(len(json.dumps(call)) for call in tool_calls)
+    prompt_tokens, completion_tokens = prompt_chars // 4 + 1, completion_chars // 4 + 1
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": min(cached_tokens, prompt_tokens)},
+    }
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
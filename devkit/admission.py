@@ -0,0 +1,257 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from os import getenv
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional
+
+from agno.utils.log import log_debug, logger
+
+from .utils.metrics import MetricsRegistry
+
+# Who the model calls made in this context are admitted for; overrides the run's user_id
+current_user: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("admission_user", default=None)
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted: the queue is full or the wait timed out."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, user: Optional[str], loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.user = user
+        self.loop = loop
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+        self.event = threading.Event() if loop is None else None
+        self.future: Optional[asyncio.Future] = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+
+class AdmissionController:
+    """
+    Bounds the model requests in flight, globally and per user, with a fair queue.
+
+    A request takes a slot when fewer than `max_concurrent` are in flight and its user has
+    fewer than `max_per_user`; otherwise it queues. Queued requests are grouped per user
+    and freed slots go round-robin across users, so one user's burst cannot starve the
+    others. Requests without a user only count against the global limit. At most
+    `max_queue` requests wait, for at most `timeout` seconds; beyond that
+    `AdmissionRejected` is raised. Works for threads (`slot_sync`) and event loops (`slot`)
+    alike. In-flight requests, queue depth and wait times are recorded in `metrics`.
+    """
+
+    def __init__(
+            self,
+            max_concurrent: int = 16,
+            max_per_user: Optional[int] = 4,
+            max_queue: int = 256,
+            timeout: Optional[float] = 60.0,
+            metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.metrics = metrics or MetricsRegistry()
+        self.in_flight = 0
+        self._in_flight_by_user: Dict[str, int] = {}
+        self._queues: "OrderedDict[Optional[str], Deque[_Waiter]]" = OrderedDict()
+        self._queued = 0
+        self._lock = threading.Lock()
+        self.in_flight_gauge = self.metrics.gauge("devkit_admission_in_flight", "Model requests holding a slot.")
+        self.queue_gauge = self.metrics.gauge("devkit_admission_queue_depth", "Model requests waiting for a slot.")
+        self.wait_time = self.metrics.histogram(
+            "devkit_admission_wait_seconds", "Time model requests waited for a slot.", ("outcome",)
+        )
+        self.rejected = self.metrics.counter(
+            "devkit_admission_rejected_total", "Model requests turned away, by reason.", ("reason",)
+        )
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self._queued,
+                "in_flight_by_user": dict(self._in_flight_by_user),
+                "queued_by_user": {user: len(waiters) for user, waiters in self._queues.items()},
+            }
+
+    def acquire_sync(self, user: Optional[str] = None) -> None:
+        waiter = self._enqueue(user, None)
+        if waiter is None:
+            return
+        if not waiter.event.wait(self.timeout):
+            self._abandon(waiter, "timeout")
+
+    async def acquire(self, user: Optional[str] = None) -> None:
+        waiter = self._enqueue(user, asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter, "timeout")
+        except asyncio.CancelledError:
+            self._abandon(waiter, None)
+            raise
+
+    def release(self, user: Optional[str] = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if user is not None:
+                remaining = self._in_flight_by_user.get(user, 1) - 1
+                if remaining > 0:
+                    self._in_flight_by_user[user] = remaining
+                else:
+                    self._in_flight_by_user.pop(user, None)
+            self._grant_waiting()
+            self._update_gauges()
+
+    @contextmanager
+    def slot_sync(self, user: Optional[str] = None) -> Iterator[None]:
+        self.acquire_sync(user)
+        try:
+            yield
+        finally:
+            self.release(user)
+
+    @asynccontextmanager
+    async def slot(self, user: Optional[str] = None) -> AsyncIterator[None]:
+        await self.acquire(user)
+        try:
+            yield
+        finally:
+            self.release(user)
+
+    def _enqueue(self, user: Optional[str], loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_Waiter]:
+        """Take a slot right away (None), or return the waiter queued for one."""
+        with self._lock:
+            if not self._queues and self._has_room(user):
+                self._take(user)
+                self.wait_time.observe(0.0, outcome="admitted")
+                self._update_gauges()
+                return None
+            if self._queued >= self.max_queue:
+                self.rejected.inc(reason="queue_full")
+                raise AdmissionRejected(f"Admission queue is full ({self.max_queue} waiting)")
+            waiter = _Waiter(user, loop)
+            self._queues.setdefault(user, deque()).append(waiter)
+            self._queued += 1
+            # A slot may be free for this user even though others are queued at their own limit
+            self._grant_waiting()
+            self._update_gauges()
+        if not waiter.granted:
+            log_debug(f"Model request of {user or 'anonymous'} queued behind {self._queued - 1} others")
+        return waiter
+
+    def _abandon(self, waiter: _Waiter, reason: Optional[str]) -> None:
+        """Leave the queue after a timeout (`reason`) or a cancellation (None)."""
+        with self._lock:
+            granted = waiter.granted
+            if not granted:
+                waiters = self._queues[waiter.user]
+                waiters.remove(waiter)
+                self._queued -= 1
+                if not waiters:
+                    del self._queues[waiter.user]
+                self._update_gauges()
+        if granted:
+            # The slot was granted while giving up: a timed out request keeps it, a cancelled one frees it
+            if reason is None:
+                self.release(waiter.user)
+            return
+        if reason is not None:
+            wait = time.perf_counter() - waiter.enqueued_at
+            self.wait_time.observe(wait, outcome=reason)
+            self.rejected.inc(reason=reason)
+            logger.warning(f"Model request of {waiter.user or 'anonymous'} not admitted after {wait:.1f}s")
+            raise AdmissionRejected(f"No model capacity within {self.timeout}s", retry_after=self.timeout or 1.0)
+
+    def _has_room(self, user: Optional[str]) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            return False
+        return user is None or self.max_per_user is None or self._in_flight_by_user.get(user, 0) < self.max_per_user
+
+    def _take(self, user: Optional[str]) -> None:
+        self.in_flight += 1
+        if user is not None:
+            self._in_flight_by_user[user] = self._in_flight_by_user.get(user, 0) + 1
+
+    def _grant_waiting(self) -> None:
+        while True:
+            for user, waiters in self._queues.items():
+                if self._has_room(user):
+                    break
+            else:
+                return
+            waiter = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                # Round-robin: the user goes to the back of the line for the next slot
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            self._take(user)
+            self.wait_time.observe(time.perf_counter() - waiter.enqueued_at, outcome="admitted")
+            waiter.grant()
+
+    def _update_gauges(self) -> None:
+        self.in_flight_gauge.set(self.in_flight)
+        self.queue_gauge.set(self._queued)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+@contextmanager
+def admission_user(user: Optional[str]) -> Iterator[None]:
+    """Admit the model calls made inside the block for `user`."""
+    token = current_user.set(user)
+    try:
+        yield
+    finally:
+        current_user.reset(token)
+
+
+_default_controller: Optional[AdmissionController] = None
+_default_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Return the process-wide admission controller, its metrics served with the telemetry.
+    Limits come from `LLM_MAX_CONCURRENCY` (16), `LLM_MAX_PER_USER` (4), `LLM_MAX_QUEUE` (256)
+    and `LLM_QUEUE_TIMEOUT` (60 seconds).
+    """
+    global _default_controller
+    with _default_controller_lock:
+        if _default_controller is None:
+            from .telemetry import get_telemetry
+
+            _default_controller = AdmissionController(
+                max_concurrent=int(getenv("LLM_MAX_CONCURRENCY", "16")),
+                max_per_user=int(getenv("LLM_MAX_PER_USER", "4")),
+                max_queue=int(getenv("LLM_MAX_QUEUE", "256")),
+                timeout=float(getenv("LLM_QUEUE_TIMEOUT", "60")),
+                metrics=get_telemetry().metrics,
+            )
+        return _default_controller
@@ -1,27 +1,42 @@
 import uuid
 from textwrap import dedent
-from typing import Optional
+from typing import List, Optional
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
+from agno.db.base import BaseDb
 from agno.models.base import Model
-from agno.models.openai import OpenAIChat
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.file import FileTools
-from agno.tools.giphy import GiphyTools
-from agno.tools.googlesearch import GoogleSearchTools
-from agno.tools.reasoning import ReasoningTools
-from agno.tools.shell import ShellTools
 
+from .context import ContextBudget
+from .db.storage import get_storage
 from .prompt import AGENT_DEV_DESCRIPTION, AGENT_DEV_INSTRUCTION
+from .response_cache import CachedAgent, ResponseCache
+from .router import RoutingOpenAIChat
+from .tools.devutils import DevUtilsTools
+from .tools.files import LargeFileTools
 from .tools.pexels import PexelsTools
+from .tools.search import SharedSearchTools
+from .tools.shell import PersistentShellTools
 
 
-def init_local_storage():
-    return SqliteDb(
-        db_file="data.db",
-        memory_table="memories"
-    )
+def init_local_storage() -> BaseDb:
+    """Process-wide storage selected by `DbSettings`, SQLite `data.db` unless a server is configured."""
+    return get_storage()
+
+
+def build_tools(async_tools: bool = False, session_id: Optional[str] = None, shell: bool = True) -> List:
+    """
+    Build DEV-PET's toolkits. Shell commands run in a pooled persistent shell bound to
+    `session_id`; pass `shell=False` to leave it out of toolkits shared between sessions.
+    """
+    tools = [
+        SharedSearchTools(),
+        PexelsTools(async_mode=async_tools),
+        LargeFileTools(),
+        DevUtilsTools(),
+    ]
+    if shell:
+        tools.insert(1, PersistentShellTools(session_id=session_id, async_mode=async_tools))
+    return tools
 
 
 def build_agent(
@@ -29,21 +44,31 @@ def build_agent(
         user_id: Optional[str] = None,
         session_id: Optional[str] = None,
         debug_mode: bool = True,
+        async_tools: bool = False,
+        tools: Optional[List] = None,
+        db: Optional[BaseDb] = None,
+        context_budget: Optional[ContextBudget] = None,
+        response_cache: Optional[ResponseCache] = None,
 ) -> Agent:
+    """
+    Build the DEV-PET agent.
 
-
-    return Agent(
+    Set `async_tools` when the agent is driven by `arun` (Chainlit, AgentOS) so I/O bound
+    toolkits await their calls instead of blocking the event loop. Pass `tools` and `db`
+    to reuse instances shared between agents instead of constructing new ones.
+    With a `context_budget` the history sent each turn is kept within its token ceilings.
+    A `response_cache` (opt-in) answers repeated side-effect free questions without a model
+    call; as DEV-PET sends history, only repeats within the same session hit.
+    The prompt keeps a stable prefix (description, instructions, sorted tool definitions)
+    ahead of the memories and history, so providers can serve it from their prompt cache.
+    """
+    return CachedAgent(
         name="DEV-PET",
         user_id=user_id,
         session_id=session_id,
         model=model,
-        db=init_local_storage(),
-        tools=[
-            DuckDuckGoTools(),
-            ShellTools(),
-            PexelsTools(),
-            FileTools()
-        ],
+        db=db or init_local_storage(),
+        tools=tools if tools is not None else build_tools(async_tools, session_id=session_id),
         description=dedent(AGENT_DEV_DESCRIPTION),
         instructions=dedent(AGENT_DEV_INSTRUCTION),
         add_history_to_context=True,
@@ -52,12 +77,17 @@ def build_agent(
         markdown=True,
         read_chat_history=True,
         debug_mode=debug_mode,
+        context_budget=context_budget,
+        response_cache=response_cache,
+        stable_prefix=True,
     )
 
 
 def wakeup_agent():
-    model = OpenAIChat(id="gpt-4.1-mini")
+    model = RoutingOpenAIChat(id="gpt-4.1-mini", fast_id="gpt-4.1-nano")
     return build_agent(model=model,
                        user_id="John",
                        session_id=str(uuid.uuid1()),
-                       debug_mode=True)
\ No newline at end of file
+                       debug_mode=True,
+                       async_tools=True,
+                       context_budget=ContextBudget())
\ No newline at end of file
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from agno.agent import Agent
+from agno.db.base import BaseDb
+from agno.models.base import Model
+from agno.utils.log import logger
+
+from .agent_dev import build_agent, build_tools, init_local_storage
+from .context import ContextBudget
+from .registry import aclose_tools
+from .router import RoutingOpenAIChat
+from .tools.shell import PersistentShellTools
+from .utils.shell_pool import get_shell_pool
+
+
+class AgentPool:
+    """
+    One DEV-PET agent per chat session, built on a shared model, storage and toolkit set.
+
+    The shared instances are created once (eagerly with `warmup`, or on first use) and
+    handed to every agent, so a new session only pays for the `Agent` object itself.
+    The bundled toolkits keep no per-agent state, which makes sharing them safe; only the
+    shell toolkit is per session, so each session keeps its own pooled shell worker.
+    Requests are routed between `fast_model_id` and `model_id` by difficulty.
+    Sessions idle for longer than `idle_timeout` seconds are evicted on the next access.
+    """
+
+    def __init__(
+            self,
+            model_id: str = "gpt-4.1-mini",
+            fast_model_id: str = "gpt-4.1-nano",
+            user_id: str = "phong",
+            idle_timeout: float = 1800,
+            async_tools: bool = True,
+            debug_mode: bool = True,
+            context_budget: Optional[ContextBudget] = None,
+    ):
+        self.model_id = model_id
+        self.fast_model_id = fast_model_id
+        self.user_id = user_id
+        self.idle_timeout = idle_timeout
+        self.async_tools = async_tools
+        self.debug_mode = debug_mode
+        self.context_budget = context_budget
+        self._model: Optional[Model] = None
+        self._db: Optional[BaseDb] = None
+        self._tools: Optional[List] = None
+        self._agents: Dict[str, Tuple[Agent, float]] = {}
+        self._lock = threading.Lock()
+
+    def warmup(self) -> None:
+        """Build the shared model, storage and toolkits ahead of the first session."""
+        with self._lock:
+            self._ensure_shared()
+
+    def get(self, session_id: str, user_id: Optional[str] = None) -> Agent:
+        """Return the agent bound to `session_id`, building it on first use."""
+        self.evict_idle()
+        with self._lock:
+            entry = self._agents.get(session_id)
+            if entry is not None:
+                agent = entry[0]
+            else:
+                self._ensure_shared()
+                agent = build_agent(
+                    model=self._model,
+                    user_id=user_id or self.user_id,
+                    session_id=session_id,
+                    debug_mode=self.debug_mode,
+                    tools=[*self._tools, PersistentShellTools(session_id=session_id, async_mode=self.async_tools)],
+                    db=self._db,
+                    context_budget=self.context_budget,
+                )
+                logger.debug(f"Agent created for session {session_id}")
+            self._agents[session_id] = (agent, time.monotonic())
+            return agent
+
+    def evict(self, session_id: str) -> None:
+        with self._lock:
+            if self._agents.pop(session_id, None) is not None:
+                logger.debug(f"Agent evicted for session {session_id}")
+        get_shell_pool().release(session_id)
+
+    def evict_idle(self) -> int:
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [session_id for session_id, (_, last_used) in self._agents.items() if last_used < deadline]
+            for session_id in idle:
+                del self._agents[session_id]
+        for session_id in idle:
+            get_shell_pool().release(session_id)
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle agent(s)")
+        return len(idle)
+
+    async def aclose(self) -> None:
+        """Close the shared toolkits and every session's shell, e.g. when the app shuts down."""
+        with self._lock:
+            tools, self._tools = self._tools, None
+            self._agents.clear()
+        await aclose_tools(tools or [])
+        get_shell_pool().close()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def _ensure_shared(self) -> None:
+        if self._model is None:
+            self._model = RoutingOpenAIChat(id=self.model_id, fast_id=self.fast_model_id)
+        if self._db is None:
+            self._db = init_local_storage()
+        if self._tools is None:
+            self._tools = build_tools(async_tools=self.async_tools, shell=False)
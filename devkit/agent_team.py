@@ -1,47 +1,100 @@
+import threading
+from typing import Any
+
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.team.team import Team
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.reasoning import ReasoningTools
-from agno.tools.yfinance import YFinanceTools
-
-web_agent = Agent(
-    name="Web Search Agent",
-    role="Handle web search requests and general research",
-    model=OpenAIChat(id="gpt-4.1"),
-    tools=[DuckDuckGoTools()],
-    instructions="Always include sources",
-    add_datetime_to_context=True,
-)
-
-finance_agent = Agent(
-    name="Finance Agent",
-    role="Handle financial data requests and market analysis",
-    model=OpenAIChat(id="gpt-4.1"),
-    tools=[YFinanceTools()],
-    instructions=[
-        "Use tables to display stock prices, fundamentals (P/E, Market Cap), and recommendations.",
-        "Clearly state the company name and ticker symbol.",
-        "Focus on delivering actionable financial insights.",
-    ],
-    add_datetime_to_context=True,
-)
-
-reasoning_finance_team = Team(
-    id="finance-team",
-    name="Reasoning Finance Team",
-    model=OpenAIChat(id="gpt-4.1"),
-    members=[web_agent, finance_agent],
-    tools=[ReasoningTools(add_instructions=True)],
-    instructions=[
-        "Collaborate to provide comprehensive financial and investment insights",
-        "Consider both fundamental analysis and market sentiment",
-        "Use tables and charts to display data clearly and professionally",
-        "Present findings in a structured, easy-to-follow format",
-        "Only output the final consolidated analysis, not individual agent responses",
-    ],
-    markdown=True,
-    show_members_responses=True,
-    add_datetime_to_context=True,
-    debug_mode=True,
-)
+
+from .context import BudgetedAgent
+from .parallel_team import ParallelTeam
+from .router import RoutingOpenAIChat
+
+
+def build_web_agent() -> Agent:
+    from .tools.search import SharedSearchTools
+
+    return BudgetedAgent(
+        name="Web Search Agent",
+        role="Handle web search requests and general research",
+        model=RoutingOpenAIChat(id="gpt-4.1", fast_id="gpt-4.1-mini"),
+        tools=[SharedSearchTools()],
+        instructions=[
+            "Always include sources",
+            "When a question needs several searches, run them together with search_many.",
+        ],
+        add_datetime_to_context=True,
+        stable_prefix=True,
+    )
+
+
+def build_finance_agent() -> Agent:
+    # yfinance and pandas take most of the import time, only pay for them when the agent is built
+    from agno.tools.yfinance import YFinanceTools
+
+    from .db.settings import db_settings
+    from .tools.finance import MarketDataTools
+
+    return BudgetedAgent(
+        name="Finance Agent",
+        role="Handle financial data requests and market analysis",
+        model=RoutingOpenAIChat(id="gpt-4.1", fast_id="gpt-4.1-mini"),
+        tools=[
+            MarketDataTools(cache_file=db_settings.cache_file("market_data.db")),
+            YFinanceTools(include_tools=[
+                "get_company_info",
+                "get_income_statements",
+                "get_analyst_recommendations",
+                "get_company_news",
+            ]),
+        ],
+        instructions=[
+            "Request all tickers of a comparison in a single market data call.",
+            "Use tables to display stock prices, fundamentals (P/E, Market Cap), and recommendations.",
+            "Clearly state the company name and ticker symbol.",
+            "Focus on delivering actionable financial insights.",
+        ],
+        add_datetime_to_context=True,
+        stable_prefix=True,
+    )
+
+
+def build_reasoning_finance_team() -> ParallelTeam:
+    from agno.tools.reasoning import ReasoningTools
+
+    return ParallelTeam(
+        id="finance-team",
+        name="Reasoning Finance Team",
+        model=RoutingOpenAIChat(id="gpt-4.1", fast_id="gpt-4.1-mini"),
+        members=[build_web_agent(), build_finance_agent()],
+        tools=[ReasoningTools(add_instructions=True)],
+        instructions=[
+            "Collaborate to provide comprehensive financial and investment insights",
+            "Consider both fundamental analysis and market sentiment",
+            "Use tables and charts to display data clearly and professionally",
+            "Present findings in a structured, easy-to-follow format",
+            "Only output the final consolidated analysis, not individual agent responses",
+        ],
+        markdown=True,
+        show_members_responses=True,
+        add_datetime_to_context=True,
+        stable_prefix=True,
+        debug_mode=True,
+        member_timeout=90,
+    )
+
+
+# The module-level instances of earlier versions, now built on first access and cached
+_ALIASES = {
+    "web_agent": build_web_agent,
+    "finance_agent": build_finance_agent,
+    "reasoning_finance_team": build_reasoning_finance_team,
+}
+_aliases_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Any:
+    factory = _ALIASES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _aliases_lock:
+        if name not in globals():
+            globals()[name] = factory()
+        return globals()[name]
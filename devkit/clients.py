@@ -0,0 +1,147 @@
+import asyncio
+import importlib.util
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from agno.models.openai import OpenAIChat
+from agno.utils.log import log_debug
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+import httpx
+
+from .admission import current_user, get_admission_controller
+
+
+class ClientProvider:
+    """
+    Process-wide OpenAI SDK clients, one per provider configuration.
+
+    `OpenAIChat` builds a new SDK client, and with it a new connection pool, for every
+    request. Models asking the provider for a client instead share one pooled client per
+    distinct configuration (API key, base URL, timeouts, headers), so connections are
+    kept alive across requests, agents and sessions. Async clients are additionally kept
+    per event loop, because their connections cannot move between loops.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._clients: Dict[str, OpenAI] = {}
+        self._async_clients: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, AsyncOpenAI]] = {}
+        self._lock = threading.Lock()
+
+    def client(self, **params: Any) -> OpenAI:
+        key = _params_key(params)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.is_closed():
+                http_client = DefaultHttpxClient(limits=self.limits, http2=self.http2)
+                client = self._clients[key] = OpenAI(**params, http_client=http_client)
+                log_debug(f"Created shared OpenAI client for {params.get('base_url') or 'the default base URL'}")
+            return client
+
+    def async_client(self, **params: Any) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        key = (_params_key(params), id(loop))
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is None or entry[0] is not loop or entry[1].is_closed():
+                # Clients of loops that have since closed can never be used again
+                for stale in [k for k, (l, _) in self._async_clients.items() if l.is_closed()]:
+                    del self._async_clients[stale]
+                http_client = DefaultAsyncHttpxClient(limits=self.limits, http2=self.http2)
+                entry = self._async_clients[key] = (loop, AsyncOpenAI(**params, http_client=http_client))
+                log_debug(f"Created shared async OpenAI client for {params.get('base_url') or 'the default base URL'}")
+            return entry[1]
+
+    def close(self) -> None:
+        """Close the sync clients. Async clients are dropped, their pools close with their loop."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._async_clients.clear()
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+_default_provider: Optional[ClientProvider] = None
+_default_provider_lock = threading.Lock()
+
+
+def get_client_provider() -> ClientProvider:
+    global _default_provider
+    with _default_provider_lock:
+        if _default_provider is None:
+            _default_provider = ClientProvider()
+        return _default_provider
+
+
+@dataclass
+class SharedOpenAIChat(OpenAIChat):
+    """
+    OpenAI chat model on the process-wide pooled clients, with admission control.
+
+    Every provider request first takes a slot from the process-wide `AdmissionController`
+    (unless `admission_control` is off), on behalf of the user set with `admission_user`
+    or else the run's `user_id`. A streamed request holds its slot until the stream ends.
+    An explicit `http_client` opts the model out of the shared clients.
+    """
+
+    name: str = "SharedOpenAIChat"
+    admission_control: bool = True
+
+    def get_client(self) -> OpenAI:
+        if self.http_client is not None:
+            return super().get_client()
+        return get_client_provider().client(**self._get_client_params())
+
+    def get_async_client(self) -> AsyncOpenAI:
+        if self.http_client is not None:
+            return super().get_async_client()
+        return get_client_provider().async_client(**self._get_client_params())
+
+    def invoke(self, *args: Any, **kwargs: Any) -> Any:
+        if not self.admission_control:
+            return super().invoke(*args, **kwargs)
+        with get_admission_controller().slot_sync(_admission_user(kwargs)):
+            return super().invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> Any:
+        if not self.admission_control:
+            return await super().ainvoke(*args, **kwargs)
+        async with get_admission_controller().slot(_admission_user(kwargs)):
+            return await super().ainvoke(*args, **kwargs)
+
+    def invoke_stream(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        if not self.admission_control:
+            yield from super().invoke_stream(*args, **kwargs)
+            return
+        with get_admission_controller().slot_sync(_admission_user(kwargs)):
+            yield from super().invoke_stream(*args, **kwargs)
+
+    async def ainvoke_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        if not self.admission_control:
+            async for chunk in super().ainvoke_stream(*args, **kwargs):
+                yield chunk
+            return
+        async with get_admission_controller().slot(_admission_user(kwargs)):
+            async for chunk in super().ainvoke_stream(*args, **kwargs):
+                yield chunk
+
+
+def _admission_user(kwargs: Dict[str, Any]) -> Optional[str]:
+    return current_user.get() or getattr(kwargs.get("run_response"), "user_id", None)
@@ -0,0 +1,239 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from agno.agent import Agent
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.run.base import RunStatus
+from agno.run.messages import RunMessages
+from agno.session import AgentSession
+from agno.utils.log import log_debug
+
+from .utils.tokens import count_message_tokens, count_tokens, message_text
+
+HISTORY_SUMMARY_KEY = "history_summary"
+SKIPPED_RUN_STATUSES = (RunStatus.paused, RunStatus.cancelled, RunStatus.error)
+
+# (previous summary, runs to fold in) -> new summary
+Summarizer = Callable[[Optional[str], List[RunOutput]], str]
+
+# Parts of agno's system prompt that change between turns, users or sessions
+VOLATILE_SECTIONS = (
+    re.compile(r"^- The current time is .*\n?", re.MULTILINE),
+    re.compile(r"^- Your approximate location is: .*\n?", re.MULTILINE),
+    re.compile(
+        r"You have access to memories from previous interactions with the user.*?"
+        r"</memories_from_previous_interactions>\s*(?:Note: this information is from previous interactions[^\n]*\n?)?",
+        re.DOTALL,
+    ),
+    re.compile(r"You have the capability to retain memories from previous interactions with the user, [^\n]*\n?"),
+    re.compile(
+        r"Here is a brief summary of your previous interactions:.*?"
+        r"</summary_of_previous_interactions>\s*(?:Note: this information is from previous interactions[^\n]*\n?)?",
+        re.DOTALL,
+    ),
+    re.compile(r"<session_state>.*?</session_state>\n?", re.DOTALL),
+)
+EMPTY_ADDITIONAL_INFORMATION = re.compile(r"<additional_information>\s*</additional_information>\n*")
+
+
+@dataclass
+class ContextBudget:
+    """Token ceilings applied to the history an agent sends with each run."""
+
+    # Total tokens for history messages, including the rolling summary
+    max_history_tokens: int = 8000
+    # Tool results in history above this size are cut down to head and tail
+    max_tool_result_tokens: int = 1000
+    # The rolling summary keeps its most recent part within this size
+    max_summary_tokens: int = 600
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of `text` within roughly `max_tokens` tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    max_chars = max_tokens * 4
+    head = text[: max_chars * 2 // 3]
+    tail = text[-(max_chars // 3):]
+    return f"{head}\n... [{len(text) - len(head) - len(tail)} characters truncated] ...\n{tail}"
+
+
+def extractive_summary(previous: Optional[str], runs: List[RunOutput], max_chars: int = 300) -> str:
+    """Fold runs into the summary as one clipped question/answer line each, without a model call."""
+    lines = [previous] if previous else []
+    for run in runs:
+        question = next(
+            (message_text(m) for m in run.messages or [] if m.role == "user" and not m.from_history), ""
+        )
+        answer = next(
+            (message_text(m) for m in reversed(run.messages or []) if m.role == "assistant" and m.content), ""
+        )
+        lines.append(f"- User: {_clip(question, max_chars)}\n  Assistant: {_clip(answer, max_chars)}")
+    return "\n".join(lines)
+
+
+def split_volatile_context(content: str) -> Tuple[str, List[str]]:
+    """Split a system prompt into its stable part and the `VOLATILE_SECTIONS` found in it."""
+    volatile: List[str] = []
+
+    def take(match: "re.Match[str]") -> str:
+        volatile.append(match.group(0).strip())
+        return ""
+
+    for pattern in VOLATILE_SECTIONS:
+        content = pattern.sub(take, content)
+    if volatile:
+        content = EMPTY_ADDITIONAL_INFORMATION.sub("", content)
+    return content.strip(), volatile
+
+
+def move_volatile_context(run_messages: RunMessages, role: str = "system") -> None:
+    """
+    Move the volatile sections of the system message into a message of their own right
+    before the user message, after the history, so the system prompt stays byte-identical
+    across turns and users and the provider can serve it from its prompt cache. History
+    never replays system messages, so the moved context is not repeated in later turns.
+    """
+    system_message = run_messages.system_message
+    if system_message is None or not isinstance(system_message.content, str):
+        return
+    stable, volatile = split_volatile_context(system_message.content)
+    if not volatile:
+        return
+    system_message.content = stable
+    context = Message(role=role, content="<current_context>\n" + "\n\n".join(volatile) + "\n</current_context>")
+    messages = run_messages.messages
+    position = next((i for i, m in enumerate(messages) if m is run_messages.user_message), len(messages))
+    messages.insert(position, context)
+
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[: max_chars - 3] + "..."
+
+
+def _clip_summary(summary: str, max_tokens: int) -> str:
+    if count_tokens(summary) <= max_tokens:
+        return summary
+    # Older entries come first, so keep the end of the summary.
+    return "..." + summary[-max_tokens * 4:]
+
+
+@dataclass(init=False)
+class BudgetedAgent(Agent):
+    """
+    Agent that keeps the history sent to the model within a `ContextBudget`.
+
+    Runs older than `num_history_runs` are folded into a rolling summary stored in the
+    session data, so each run is summarized once and the summary is reused afterwards.
+    History tool results are truncated, and when the history is still over budget the
+    oldest turns are dropped and summarized for this run only.
+
+    With `stable_prefix` the prompt is assembled for provider prefix caching: tool
+    definitions are sent sorted by name, and the datetime, location, memories, session
+    summary and session state move out of the system prompt to just before the user
+    message. Without a budget or a stable prefix the agent behaves exactly like `Agent`.
+    """
+
+    context_budget: Optional[ContextBudget] = None
+    summarizer: Optional[Summarizer] = None
+    stable_prefix: bool = False
+
+    def __init__(
+            self,
+            *args: Any,
+            context_budget: Optional[ContextBudget] = None,
+            summarizer: Optional[Summarizer] = None,
+            stable_prefix: bool = False,
+            **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.context_budget = context_budget
+        self.summarizer = summarizer
+        self.stable_prefix = stable_prefix
+
+    def _determine_tools_for_model(self, *args: Any, **kwargs: Any) -> None:
+        super()._determine_tools_for_model(*args, **kwargs)
+        if self.stable_prefix:
+            # Toolkit order depends on how the agent was built; the provider's cache key does not
+            if self._tools_for_model:
+                self._tools_for_model.sort(key=lambda tool: tool.get("function", {}).get("name", ""))
+            if self._tool_instructions:
+                self._tool_instructions.sort()
+
+    def _get_run_messages(self, *, run_response: RunOutput, session: AgentSession, **kwargs: Any) -> RunMessages:
+        run_messages = super()._get_run_messages(run_response=run_response, session=session, **kwargs)
+        if self.context_budget is not None and kwargs.get("add_history_to_context"):
+            self._compact_history(run_messages, session, run_response)
+        if self.stable_prefix:
+            move_volatile_context(run_messages, self.system_message_role)
+        return run_messages
+
+    def _compact_history(self, run_messages: RunMessages, session: AgentSession, run_response: RunOutput) -> None:
+        budget = self.context_budget
+        messages = run_messages.messages
+        history_positions = [i for i, m in enumerate(messages) if m.from_history]
+        if history_positions:
+            start, end = history_positions[0], history_positions[-1] + 1
+        else:
+            start = end = 1 if messages and messages[0].role == self.system_message_role else 0
+
+        history = messages[start:end]
+        for message in history:
+            if message.role == "tool" and isinstance(message.content, str):
+                message.content = truncate_text(message.content, budget.max_tool_result_tokens)
+
+        summary = self._rolling_summary(session, run_response)
+        summary_tokens = count_tokens(summary)
+
+        # Drop whole turns (a user message and everything after it) so tool calls stay paired.
+        turns: List[List[Message]] = []
+        for message in history:
+            if message.role == "user" or not turns:
+                turns.append([])
+            turns[-1].append(message)
+        history_tokens = sum(count_message_tokens(m) for m in history)
+        dropped: List[Message] = []
+        while turns and history_tokens + summary_tokens > budget.max_history_tokens:
+            turn = turns.pop(0)
+            dropped.extend(turn)
+            history_tokens -= sum(count_message_tokens(m) for m in turn)
+        if dropped:
+            log_debug(f"Dropped {len(dropped)} history messages to fit the context budget")
+            summary = extractive_summary(summary, [RunOutput(messages=dropped)])
+            summary = _clip_summary(summary, budget.max_summary_tokens)
+
+        compacted = [message for turn in turns for message in turn]
+        if summary:
+            compacted.insert(
+                0,
+                Message(
+                    role=self.system_message_role,
+                    content=f"Summary of the earlier conversation:\n<earlier_conversation>\n{summary}\n</earlier_conversation>",
+                    from_history=True,
+                ),
+            )
+        messages[start:end] = compacted
+
+    def _rolling_summary(self, session: AgentSession, run_response: RunOutput) -> Optional[str]:
+        runs = [
+            run for run in session.runs or []
+            if isinstance(run, RunOutput)
+            and run.status not in SKIPPED_RUN_STATUSES
+            and run.run_id != run_response.run_id
+        ]
+        older_runs = runs[: -self.num_history_runs] if self.num_history_runs > 0 else runs
+        session_data = session.session_data or {}
+        state = session_data.get(HISTORY_SUMMARY_KEY) or {}
+        covered = set(state.get("run_ids", []))
+        new_runs = [run for run in older_runs if run.run_id not in covered]
+        if new_runs:
+            summarizer = self.summarizer or extractive_summary
+            summary = _clip_summary(summarizer(state.get("summary"), new_runs), self.context_budget.max_summary_tokens)
+            state = {"summary": summary, "run_ids": [run.run_id for run in older_runs]}
+            session_data[HISTORY_SUMMARY_KEY] = state
+            session.session_data = session_data
+            log_debug(f"Folded {len(new_runs)} run(s) into the history summary")
+        return state.get("summary")
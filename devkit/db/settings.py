@@ -1,14 +1,11 @@
 from os import getenv
+from pathlib import Path
 from typing import Optional
 
-from agno.storage.sqlite import SqliteStorage
 from pydantic_settings import BaseSettings
 
-def get_local_storage():
-    return SqliteStorage(
-        table_name="agent_sessions",
-        db_file="db/data.db"
-    )
+from ..utils.log import logger
+
 
 class DbSettings(BaseSettings):
     """Database settings that can be set using environment variables.
@@ -23,6 +20,17 @@ class DbSettings(BaseSettings):
     db_pass: Optional[str] = None
     db_database: Optional[str] = None
     db_driver: str = "postgresql+psycopg"
+    # Local SQLite file used when no database server is configured
+    db_file: str = "data.db"
+    # Directory of local cache files (e.g. market data), defaults to the directory of db_file
+    cache_dir: Optional[str] = None
+    # Connection pool tuning for database servers
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    # Milliseconds a SQLite writer waits for the lock before failing
+    sqlite_busy_timeout: int = 5000
     # Create/Upgrade database on a startup using alembic
     migrate_db: bool = False
 
@@ -39,13 +47,19 @@ class DbSettings(BaseSettings):
         # Use a local database if RUNTIME_ENV is not set
         if "None" in db_url and getenv("RUNTIME_ENV") is None:
             logger.debug("Using local database")
-            db_url = "sqlite:///./agendev.db"
+            db_url = f"sqlite:///{self.db_file}"
 
-        logger.debug(f"Access to the database: {self.db_host} on ENV: {getenv("RUNTIME_ENV")}")
+        logger.debug(f"Access to the database: {self.db_host} on ENV: {getenv('RUNTIME_ENV')}")
         if "None" in db_url or db_url is None:
             raise ValueError("Could not build database connection")
         return db_url
 
+    def cache_file(self, name: str) -> str:
+        """Path of the local cache file `name` in `cache_dir`, created if missing."""
+        directory = Path(self.cache_dir) if self.cache_dir else Path(self.db_file).parent
+        directory.mkdir(parents=True, exist_ok=True)
+        return str(directory / name)
+
 
 # Create DbSettings object
 db_settings = DbSettings()
@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, Optional
+
+from agno.db.base import BaseDb
+from agno.db.sqlite import SqliteDb
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from ..utils.log import logger
+from .settings import DbSettings, db_settings
+
+_engines: Dict[str, Engine] = {}
+_storages: Dict[str, BaseDb] = {}
+_lock = threading.Lock()
+
+
+def get_engine(settings: Optional[DbSettings] = None) -> Engine:
+    """Return the process-wide SQLAlchemy engine for the configured database."""
+    settings = settings or db_settings
+    with _lock:
+        return _get_engine(settings.get_db_url(), settings)
+
+
+def get_storage(settings: Optional[DbSettings] = None) -> BaseDb:
+    """Return the process-wide agno storage (SQLite or Postgres) selected by `DbSettings`."""
+    settings = settings or db_settings
+    db_url = settings.get_db_url()
+    with _lock:
+        storage = _storages.get(db_url)
+        if storage is None:
+            engine = _get_engine(db_url, settings)
+            if engine.dialect.name == "sqlite":
+                storage = SqliteDb(db_engine=engine, memory_table="memories")
+            else:
+                from agno.db.postgres import PostgresDb
+
+                storage = PostgresDb(db_engine=engine, memory_table="memories")
+            _storages[db_url] = storage
+        return storage
+
+
+def dispose_engines(close: bool = True) -> None:
+    """
+    Drop pooled connections, e.g. after a fork or on shutdown. In a forked child pass
+    `close=False` so the parent's connections are left alone and fresh ones are opened.
+    """
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose(close=close)
+
+
+def _get_engine(db_url: str, settings: DbSettings) -> Engine:
+    engine = _engines.get(db_url)
+    if engine is None:
+        engine = _create_engine(db_url, settings)
+        _engines[db_url] = engine
+    return engine
+
+
+def _create_engine(db_url: str, settings: DbSettings) -> Engine:
+    if db_url.startswith("sqlite"):
+        engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout / 1000},
+        )
+        _enable_sqlite_wal(engine, settings.sqlite_busy_timeout)
+    else:
+        engine = create_engine(
+            db_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+        )
+    logger.debug(f"Created database engine for {engine.url.render_as_string(hide_password=True)}")
+    return engine
+
+
+def _enable_sqlite_wal(engine: Engine, busy_timeout: int) -> None:
+    # WAL lets readers proceed while a session is being written, and NORMAL sync is
+    # durable in WAL mode except for the last transactions on power loss.
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
@@ -1,9 +1,12 @@
-from typing import List
+import threading
+from typing import Any, List, Optional
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+from agno.models.base import Model
 from pydantic import BaseModel, Field
 
+from .clients import SharedOpenAIChat
+
 
 class MovieScript(BaseModel):
     setting: str = Field(..., description="Provide a nice setting for a blockbuster movie.")
@@ -15,20 +18,44 @@ class MovieScript(BaseModel):
     characters: List[str] = Field(..., description="Name of characters for this movie.")
     storyline: str = Field(..., description="3 sentence storyline for the movie. Make it exciting!")
 
-# Agent that uses JSON mode
-json_mode_agent = Agent(
-    model=OpenAIChat(id="gpt-4.1-mini"),
-    description="You write movie scripts.",
-    response_model=MovieScript,
-    use_json_mode=True,
-)
-json_mode_agent.print_response("New York")
-
-# Agent that uses structured outputs
-structured_output_agent = Agent(
-    model=OpenAIChat(id="gpt-4.1-mini"),
-    description="You write movie scripts.",
-    response_model=MovieScript,
-)
-
-structured_output_agent.print_response("New York")
\ No newline at end of file
+
+def build_json_mode_agent(model: Optional[Model] = None) -> Agent:
+    """Agent that uses JSON mode"""
+    return Agent(
+        model=model or SharedOpenAIChat(id="gpt-4.1-mini"),
+        description="You write movie scripts.",
+        output_schema=MovieScript,
+        use_json_mode=True,
+    )
+
+
+def build_structured_output_agent(model: Optional[Model] = None) -> Agent:
+    """Agent that uses structured outputs"""
+    return Agent(
+        model=model or SharedOpenAIChat(id="gpt-4.1-mini"),
+        description="You write movie scripts.",
+        output_schema=MovieScript,
+    )
+
+
+# The module-level instances of earlier versions, now built on first access and cached
+_ALIASES = {
+    "json_mode_agent": build_json_mode_agent,
+    "structured_output_agent": build_structured_output_agent,
+}
+_aliases_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Any:
+    factory = _ALIASES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _aliases_lock:
+        if name not in globals():
+            globals()[name] = factory()
+        return globals()[name]
+
+
+if __name__ == "__main__":
+    build_json_mode_agent().print_response("New York")
+    build_structured_output_agent().print_response("New York")
@@ -0,0 +1,324 @@
+"""
+Batch MovieScript generation.
+
+    python -m devkit.movie_batch prompts.jsonl scripts.jsonl --concurrency 16
+
+Reads prompts from a JSONL file (a string, or an object with `prompt` and optional `id`, per
+line) or a CSV file (`prompt` and optional `id` columns), generates one validated MovieScript
+per prompt with bounded concurrency and appends each one to the output JSONL as it completes.
+The output file is the checkpoint: running the same command again skips the prompts it already
+holds. Prompts that fail every attempt are written to `<output>.errors.jsonl`.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+from agno.agent import Agent
+from agno.exceptions import ModelProviderError
+from agno.models.base import Model
+from agno.run.base import RunStatus
+from agno.utils.log import log_debug, logger
+
+from .clients import SharedOpenAIChat
+from .movie_agent import MovieScript, build_json_mode_agent, build_structured_output_agent
+
+STRUCTURED = "structured"
+JSON_MODE = "json"
+
+
+@dataclass
+class PromptRecord:
+    id: str
+    prompt: str
+
+
+@dataclass
+class BatchReport:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    attempts: int = 0
+    fallbacks: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    elapsed: float = 0.0
+    failed_ids: List[str] = field(default_factory=list)
+
+    @property
+    def scripts_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.completed} scripts in {self.elapsed:.1f}s ({self.scripts_per_second:.2f}/s), "
+            f"{self.failed} failed, {self.skipped} skipped from checkpoint, "
+            f"{self.attempts} model runs ({self.fallbacks} in JSON mode), "
+            f"{self.input_tokens} input / {self.output_tokens} output tokens"
+        )
+
+
+class ScriptGenerationError(Exception):
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+def read_prompts(path: Union[str, Path]) -> Iterator[PromptRecord]:
+    """
+    Yield the prompts of a `.csv` or JSONL file one at a time. Records without an `id`
+    get their line (JSONL) or row (CSV) number, which stays stable across resumed runs.
+    JSONL values that are neither a string nor an object are skipped with a warning.
+    """
+    path = Path(path)
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                if row.get("prompt"):
+                    yield PromptRecord(id=row.get("id") or str(number), prompt=row["prompt"])
+            return
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if isinstance(data, str):
+                yield PromptRecord(id=str(number), prompt=data)
+            elif not isinstance(data, dict):
+                logger.warning(f"Skipping line {number} of {path}: expected a string or an object, got {type(data).__name__}")
+            elif data.get("prompt"):
+                yield PromptRecord(id=str(data.get("id") or number), prompt=data["prompt"])
+
+
+def read_checkpoint(path: Union[str, Path]) -> Set[str]:
+    """Ids already in an output file. A line cut short by an interrupted run is ignored."""
+    done: Set[str] = set()
+    path = Path(path)
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+class MovieBatchRunner:
+    """
+    Generates MovieScripts for a stream of prompts with `concurrency` runs in flight.
+
+    Each worker owns a structured-output agent and a JSON mode agent built on one shared
+    model. A reply that does not validate as a MovieScript is retried, and the last of the
+    `max_attempts` uses JSON mode; when the provider rejects structured outputs altogether
+    the whole batch switches to JSON mode. Provider errors are retried after an exponential
+    backoff starting at `retry_delay` seconds. Prompts are read lazily, so at most twice
+    `concurrency` of them are held in memory. An error outside a single prompt's generation,
+    such as a failing agent factory or output file, cancels the batch and is raised.
+    """
+
+    def __init__(
+            self,
+            model_id: str = "gpt-4.1-mini",
+            concurrency: int = 8,
+            max_attempts: int = 3,
+            retry_delay: float = 1.0,
+            progress_interval: float = 10.0,
+            model: Optional[Model] = None,
+            structured_factory: Callable[[Model], Agent] = build_structured_output_agent,
+            json_factory: Callable[[Model], Agent] = build_json_mode_agent,
+    ):
+        self.model = model or SharedOpenAIChat(id=model_id)
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.progress_interval = progress_interval
+        self.structured_factory = structured_factory
+        self.json_factory = json_factory
+        self.structured_supported = True
+
+    async def run(
+            self,
+            prompts: Iterable[PromptRecord],
+            output_path: Union[str, Path],
+            errors_path: Optional[Union[str, Path]] = None,
+            resume: bool = True,
+    ) -> BatchReport:
+        """Generate a script for every prompt not yet in `output_path` and append it there."""
+        report = BatchReport()
+        done = read_checkpoint(output_path) if resume else set()
+        queue: "asyncio.Queue[Optional[PromptRecord]]" = asyncio.Queue(maxsize=2 * self.concurrency)
+        start = time.perf_counter()
+        output = _open_append(output_path, resume)
+        errors = _open_append(errors_path, resume) if errors_path else None
+        progress = asyncio.create_task(self._report_progress(report, start)) if self.progress_interval > 0 else None
+        workers = [asyncio.create_task(self._worker(queue, output, errors, report)) for _ in range(self.concurrency)]
+        feeder = asyncio.create_task(self._feed(prompts, queue, done, report))
+        tasks = [feeder, *workers]
+        try:
+            # A worker or the feeder failing (e.g. the output disk is full) stops the whole
+            # batch, instead of leaving the feeder waiting on a queue nobody reads
+            finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in finished:
+                if not task.cancelled() and task.exception() is not None:
+                    logger.error(f"Batch stopped: {task.exception()}")
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if progress is not None:
+                progress.cancel()
+            output.close()
+            if errors is not None:
+                errors.close()
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    async def _feed(
+            self,
+            prompts: Iterable[PromptRecord],
+            queue: "asyncio.Queue[Optional[PromptRecord]]",
+            done: Set[str],
+            report: BatchReport,
+    ) -> None:
+        for record in prompts:
+            if record.id in done:
+                report.skipped += 1
+                continue
+            done.add(record.id)
+            await queue.put(record)
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def generate(self, agents: Dict[str, Agent], prompt: str, report: BatchReport) -> Tuple[MovieScript, str, int]:
+        """The validated script for `prompt`, the mode that produced it and the attempts it took."""
+        error = "no attempt made"
+        for attempt in range(1, self.max_attempts + 1):
+            last = attempt == self.max_attempts
+            mode = STRUCTURED if self.structured_supported and not (last and attempt > 1) else JSON_MODE
+            report.attempts += 1
+            report.fallbacks += mode == JSON_MODE
+            try:
+                output = await agents[mode].arun(prompt)
+            except ModelProviderError as e:
+                if mode == STRUCTURED and e.status_code == 400:
+                    logger.warning(f"Structured outputs rejected, using JSON mode for the rest of the batch: {e}")
+                    self.structured_supported = False
+                elif not last:
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                error = f"{type(e).__name__}: {e}"
+                continue
+            if output.metrics is not None:
+                report.input_tokens += output.metrics.input_tokens
+                report.output_tokens += output.metrics.output_tokens
+            if output.status == RunStatus.error:
+                error = f"run failed: {output.content}"
+                continue
+            if isinstance(output.content, MovieScript):
+                return output.content, mode, attempt
+            error = f"reply is not a valid MovieScript: {str(output.content)[:200]!r}"
+            log_debug(f"Attempt {attempt} in {mode} mode: {error}")
+        raise ScriptGenerationError(error, self.max_attempts)
+
+    async def _worker(
+            self,
+            queue: "asyncio.Queue[Optional[PromptRecord]]",
+            output: TextIO,
+            errors: Optional[TextIO],
+            report: BatchReport,
+    ) -> None:
+        agents = {STRUCTURED: self.structured_factory(self.model), JSON_MODE: self.json_factory(self.model)}
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            start = time.perf_counter()
+            try:
+                script, mode, attempts = await self.generate(agents, record.prompt, report)
+            except Exception as e:
+                report.failed += 1
+                report.failed_ids.append(record.id)
+                logger.warning(f"Prompt {record.id} failed: {e}")
+                if errors is not None:
+                    _write_line(errors, {"id": record.id, "prompt": record.prompt, "error": str(e)})
+                continue
+            report.completed += 1
+            _write_line(output, {
+                "id": record.id,
+                "prompt": record.prompt,
+                "mode": mode,
+                "attempts": attempts,
+                "seconds": round(time.perf_counter() - start, 3),
+                "script": script.model_dump(),
+            })
+
+    async def _report_progress(self, report: BatchReport, start: float) -> None:
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            report.elapsed = time.perf_counter() - start
+            logger.info(f"Progress: {report.summary()}")
+
+
+def run_batch(
+        prompts_path: Union[str, Path],
+        output_path: Union[str, Path],
+        errors_path: Optional[Union[str, Path]] = None,
+        resume: bool = True,
+        **runner_kwargs: Any,
+) -> BatchReport:
+    """Synchronous entry point: read `prompts_path` and run a `MovieBatchRunner` over it."""
+    runner = MovieBatchRunner(**runner_kwargs)
+    return asyncio.run(runner.run(read_prompts(prompts_path), output_path, errors_path=errors_path, resume=resume))
+
+
+def _open_append(path: Union[str, Path], resume: bool) -> TextIO:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = path.open("a" if resume else "w", encoding="utf-8")
+    # An interrupted run can leave half a line behind, start the next record on a fresh line
+    if resume and f.tell() > 0:
+        with path.open("rb") as existing:
+            existing.seek(-1, 2)
+            if existing.read(1) != b"\n":
+                f.write("\n")
+    return f
+
+
+def _write_line(f: TextIO, data: Dict[str, Any]) -> None:
+    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    f.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("prompts", help="JSONL or CSV file of prompts")
+    parser.add_argument("output", help="JSONL file the scripts are appended to")
+    parser.add_argument("--errors", help="JSONL file for failed prompts, default <output>.errors.jsonl")
+    parser.add_argument("--model", default="gpt-4.1-mini", help="Model id, default gpt-4.1-mini")
+    parser.add_argument("--concurrency", type=int, default=8, help="Runs in flight")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per prompt")
+    parser.add_argument("--restart", action="store_true", help="Overwrite the output instead of resuming")
+    args = parser.parse_args(argv)
+    output = Path(args.output)
+    report = run_batch(
+        args.prompts,
+        output,
+        errors_path=args.errors or output.with_suffix(".errors.jsonl"),
+        resume=not args.restart,
+        model_id=args.model,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
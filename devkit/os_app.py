@@ -0,0 +1,211 @@
+import asyncio
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+from agno.utils.log import logger
+
+from .registry import AgentRegistry
+
+HEALTH_PATH = "/healthz"
+READY_PATH = "/readyz"
+
+if TYPE_CHECKING:
+    from .telemetry import Telemetry
+
+
+class LazyAgentOS:
+    """
+    ASGI app that builds an `AgentOS` from an `AgentRegistry` on the first request.
+
+    Importing the module that declares the app only records factories, so `reload=True`
+    restarts and new workers come up without importing toolkits or building agents.
+    The first HTTP request builds every registered agent and team plus the AgentOS app
+    (off the event loop); with `prewarm=True` that starts on a background thread as soon
+    as the server signals startup, and requests arriving meanwhile wait for it. Extra
+    keyword arguments are passed to `AgentOS`. The wrapped app's own lifespan hooks are
+    not run, so registered components must not rely on them (e.g. MCP tools).
+    With `telemetry` (True for the process-wide `get_telemetry()`) every component is
+    instrumented when built and the metrics are served in Prometheus format on `/metrics`.
+    Runs turned away by the model admission control are answered with 503 and `Retry-After`.
+
+    Each server process answers `/healthz` (alive) and `/readyz` (built and not draining,
+    503 otherwise) itself, without waiting for the build, with its pid and the requests it
+    has in flight. `drain` marks the process as going away so load balancers stop sending
+    it work while in-flight runs finish. At shutdown the toolkits of the built components
+    are closed, releasing their pooled clients and caches.
+    """
+
+    def __init__(
+            self,
+            registry: AgentRegistry,
+            prewarm: bool = False,
+            telemetry: Union[bool, "Telemetry"] = False,
+            **os_kwargs: Any,
+    ):
+        self.registry = registry
+        self.prewarm_on_startup = prewarm
+        self.telemetry = telemetry
+        self.os_kwargs = os_kwargs
+        self.agent_os = None
+        self.build_seconds: Optional[float] = None
+        self.build_error: Optional[str] = None
+        self.worker_id: Optional[int] = None
+        self.draining = False
+        self.in_flight = 0
+        self._app: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    def get_app(self) -> "LazyAgentOS":
+        return self
+
+    @property
+    def is_built(self) -> bool:
+        return self._app is not None
+
+    def build(self) -> Callable:
+        """Build the registered components and the AgentOS app, once."""
+        if self._app is not None:
+            return self._app
+        with self._lock:
+            if self._app is None:
+                from agno.os import AgentOS
+
+                start = time.perf_counter()
+                agents = self.registry.agents()
+                teams = self.registry.teams()
+                self.agent_os = AgentOS(agents=agents or None, teams=teams or None, **self.os_kwargs)
+                app = self.agent_os.get_app()
+                add_admission_handler(app)
+                if self.telemetry:
+                    from .telemetry import add_metrics_route, get_telemetry
+
+                    if self.telemetry is True:
+                        self.telemetry = get_telemetry()
+                    for component in (*agents, *teams):
+                        self.telemetry.instrument(component)
+                    add_metrics_route(app, self.telemetry)
+                self.build_seconds = time.perf_counter() - start
+                self.build_error = None
+                self._app = app
+                logger.info(f"AgentOS built in {self.build_seconds:.2f}s: {self.registry.build_times()}")
+        return self._app
+
+    def preload(self) -> None:
+        """Import AgentOS and the registered factories without building anything, e.g. before forking workers."""
+        import agno.os  # noqa: F401
+
+        self.registry.preload()
+        if self.telemetry:
+            from . import telemetry  # noqa: F401
+
+    def prewarm(self) -> threading.Thread:
+        """Build the app on a background thread."""
+        def build() -> None:
+            try:
+                self.build()
+            except Exception as e:
+                self.build_error = f"{type(e).__name__}: {e}"
+                logger.warning(f"Prewarming AgentOS failed: {e}")
+
+        thread = threading.Thread(target=build, name="agent-os-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def drain(self) -> None:
+        """Fail readiness from now on; requests keep being served."""
+        if not self.draining:
+            self.draining = True
+            logger.info(f"Worker {os.getpid()} draining with {self.in_flight} request(s) in flight")
+
+    def status(self) -> Dict[str, Any]:
+        if self.draining:
+            state = "draining"
+        elif self.is_built:
+            state = "ready"
+        else:
+            state = "starting"
+        return {
+            "status": state,
+            "pid": os.getpid(),
+            "worker": self.worker_id,
+            "in_flight": self.in_flight,
+            "build_seconds": self.build_seconds,
+            "error": self.build_error,
+        }
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["path"] in (HEALTH_PATH, READY_PATH):
+            await self._probe(scope, receive, send)
+            return
+        self.in_flight += 1
+        try:
+            app = self._app or await asyncio.to_thread(self.build)
+            await app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _probe(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        from starlette.responses import JSONResponse
+
+        status = self.status()
+        ok = scope["path"] == HEALTH_PATH or status["status"] == "ready"
+        await JSONResponse(status, status_code=200 if ok else 503)(scope, receive, send)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.prewarm_on_startup and self._app is None:
+                    self.prewarm()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.in_flight:
+                    logger.warning(f"Worker {os.getpid()} shutting down with {self.in_flight} request(s) unfinished")
+                await self.registry.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def serve(
+            self,
+            app: str,
+            *,
+            host: str = "localhost",
+            port: int = 7777,
+            reload: bool = False,
+            workers: Optional[int] = None,
+            **kwargs: Any,
+    ) -> None:
+        """
+        Run `app` (an import string such as "agent_os:app") with uvicorn, or with several
+        `workers` on the pre-forking `PreforkServer` (keyword arguments go to either).
+        """
+        if workers is not None and workers > 1 and not reload:
+            from .serve import PreforkServer
+
+            PreforkServer(app, host=host, port=port, workers=workers, **kwargs).run()
+            return
+
+        import uvicorn
+
+        uvicorn.run(app=app, host=host, port=port, reload=reload, workers=workers, **kwargs)
+
+
+def add_admission_handler(app: Any) -> None:
+    """Answer requests whose model calls were not admitted with 503 instead of a server error."""
+    from starlette.responses import JSONResponse
+
+    from .admission import AdmissionRejected
+
+    async def not_admitted(request: Any, exc: AdmissionRejected) -> JSONResponse:
+        return JSONResponse(
+            {"detail": str(exc)},
+            status_code=503,
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        )
+
+    app.add_exception_handler(AdmissionRejected, not_admitted)
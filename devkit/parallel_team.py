@@ -0,0 +1,266 @@
+import asyncio
+import time
+from copy import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from agno.agent import Agent
+from agno.exceptions import RunCancelledException
+from agno.models.message import Message
+from agno.run.agent import RunContentEvent, RunOutput
+from agno.run.base import RunStatus
+from agno.run.messages import RunMessages
+from agno.run.team import RunContentEvent as TeamRunContentEvent
+from agno.run.team import TeamRunOutput
+from agno.session import TeamSession
+from agno.team.team import Team
+from agno.tools.function import Function
+from agno.utils.log import log_debug, log_warning, use_agent_logger, use_team_logger
+from agno.utils.merge_dict import merge_dictionaries
+from agno.utils.response import check_if_run_cancelled
+from agno.utils.team import format_member_agent_task
+
+from .context import move_volatile_context
+
+MEMBER_TIMINGS_KEY = "member_timings"
+PARALLEL_INSTRUCTION = (
+    "Member tasks run in parallel: when a request needs several members, delegate all independent "
+    "tasks in the same turn with one delegate_task_to_member call per member, then consolidate the results."
+)
+
+
+@dataclass(init=False)
+class ParallelTeam(Team):
+    """
+    Team whose leader fans member tasks out concurrently when run with `arun`.
+
+    The stock async delegation tool is an async generator, and the model drains those
+    one after another, so parallel tool calls still run the members in sequence. Here
+    `delegate_task_to_member` is a plain coroutine, so the delegations of one turn are
+    gathered together. Each member run is bounded by `member_timeout` (or its entry in
+    `member_timeouts`, keyed by member name or id); a member that times out or fails
+    returns the content it streamed so far instead of failing the team run. Wall time
+    and outcome of each member run are recorded under `metadata["member_timings"]` of
+    the team run output. Synchronous `run` keeps the default sequential delegation.
+    With `stable_prefix` the leader's datetime, memories, session summary and session
+    state move out of its system prompt to just before the user message, as for
+    `BudgetedAgent`, so the system prompt can be served from the provider's prompt cache.
+    """
+
+    member_timeout: Optional[float] = 60.0
+    member_timeouts: Optional[Dict[str, float]] = None
+    stable_prefix: bool = False
+
+    def __init__(
+            self,
+            *args: Any,
+            member_timeout: Optional[float] = 60.0,
+            member_timeouts: Optional[Dict[str, float]] = None,
+            stable_prefix: bool = False,
+            **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.member_timeout = member_timeout
+        self.member_timeouts = member_timeouts
+        self.stable_prefix = stable_prefix
+        if isinstance(self.instructions, list):
+            self.instructions = [*self.instructions, PARALLEL_INSTRUCTION]
+        elif isinstance(self.instructions, str):
+            self.instructions = [self.instructions, PARALLEL_INSTRUCTION]
+        elif self.instructions is None:
+            self.instructions = [PARALLEL_INSTRUCTION]
+
+    def timeout_for(self, member: Union[Agent, Team]) -> Optional[float]:
+        timeouts = self.member_timeouts or {}
+        for key in (member.name, member.id):
+            if key is not None and key in timeouts:
+                return timeouts[key]
+        return self.member_timeout
+
+    def _get_run_messages(self, **kwargs: Any) -> RunMessages:
+        run_messages = super()._get_run_messages(**kwargs)
+        if self.stable_prefix:
+            move_volatile_context(run_messages, self.system_message_role)
+        return run_messages
+
+    def _get_delegate_task_function(
+            self,
+            run_response: TeamRunOutput,
+            session: TeamSession,
+            session_state: Dict[str, Any],
+            team_run_context: Dict[str, Any],
+            user_id: Optional[str] = None,
+            stream: bool = False,
+            stream_intermediate_steps: bool = False,
+            async_mode: bool = False,
+            input: Optional[Message] = None,
+            images: Optional[List] = None,
+            videos: Optional[List] = None,
+            audio: Optional[List] = None,
+            files: Optional[List] = None,
+            knowledge_filters: Optional[Dict[str, Any]] = None,
+            workflow_context: Optional[Dict] = None,
+            debug_mode: Optional[bool] = None,
+            add_history_to_context: Optional[bool] = None,
+    ) -> Function:
+        if not async_mode or self.delegate_task_to_all_members or self.respond_directly:
+            return super()._get_delegate_task_function(
+                run_response=run_response,
+                session=session,
+                session_state=session_state,
+                team_run_context=team_run_context,
+                user_id=user_id,
+                stream=stream,
+                stream_intermediate_steps=stream_intermediate_steps,
+                async_mode=async_mode,
+                input=input,
+                images=images,
+                videos=videos,
+                audio=audio,
+                files=files,
+                knowledge_filters=knowledge_filters,
+                workflow_context=workflow_context,
+                debug_mode=debug_mode,
+                add_history_to_context=add_history_to_context,
+            )
+
+        async def delegate_task_to_member(member_id: str, task_description: str, expected_output: Optional[str] = None) -> str:
+            """Use this function to delegate a task to the selected team member.
+            You must provide a clear and concise description of the task the member should achieve AND the expected output.
+            Calls for different members made in the same turn run in parallel.
+
+            Args:
+                member_id (str): The ID of the member to delegate the task to. Use only the ID of the member, not the ID of the team followed by the ID of the member.
+                task_description (str): A clear and concise description of the task the member should achieve.
+                expected_output (str, optional): The expected output from the member (optional).
+            Returns:
+                str: The result of the delegated task.
+            """
+            found = self._find_member_by_id(member_id)
+            if found is None:
+                return (
+                    f"Member with ID {member_id} not found in the team or any subteams. Please choose the correct "
+                    f"member from the list of members:\n\n{self.get_members_system_message_content(indent=0)}"
+                )
+            _, member = found
+            self._initialize_member(member)
+
+            if self.determine_input_for_members is False:
+                task: Union[str, Message] = input  # type: ignore
+            else:
+                interactions = self._determine_team_member_interactions(team_run_context, images, videos, audio)
+                task = format_member_agent_task(
+                    task_description, None if member.expected_output is not None else expected_output, interactions
+                )
+            history = None
+            if member.add_history_to_context:
+                history = self._get_history_for_member_agent(session, member)
+                if history:
+                    history.append(Message(role="user", content=task) if isinstance(task, str) else task)
+
+            member_state = copy(session_state)
+            timeout = self.timeout_for(member)
+            member_name = member.name or member.id or "Unknown"
+            use_agent_logger()
+            start = time.perf_counter()
+            member_output, partial, status = await self._run_member(
+                member,
+                timeout,
+                input=history or task,
+                user_id=user_id,
+                session_id=session.session_id,
+                session_state=member_state,
+                images=images,
+                videos=videos,
+                audio=audio,
+                files=files,
+                stream=True,
+                debug_mode=debug_mode,
+                workflow_context=workflow_context,
+                add_history_to_context=add_history_to_context,
+                knowledge_filters=knowledge_filters if not member.knowledge_filters and member.knowledge else None,
+                yield_run_response=True,
+            )
+            elapsed = time.perf_counter() - start
+            use_team_logger()
+            self._record_member_timing(run_response, member_name, elapsed, status)
+
+            if member_output is not None:
+                member_output.parent_run_id = run_response.run_id
+                self._add_interaction_to_team_run_context(
+                    team_run_context=team_run_context,
+                    member_name=member_name,
+                    task=task if isinstance(task, str) else str(task.content or ""),
+                    run_response=member_output,
+                )
+                run_response.add_member_run(member_output)
+                session.upsert_run(member_output)
+                merge_dictionaries(session_state, member_state)
+                self._update_team_media(member_output)
+                return _member_result(member_output)
+
+            if status == "timeout":
+                reason = f"did not finish within {timeout:g}s"
+            else:
+                reason = f"failed ({status})"
+            if partial:
+                return f"Agent {member_name} {reason}. Partial result:\n{partial}"
+            return f"Agent {member_name} {reason} and returned no result. Continue with the other members' results."
+
+        return Function.from_callable(delegate_task_to_member, name="delegate_task_to_member")
+
+    @staticmethod
+    async def _run_member(member: Union[Agent, Team], timeout: Optional[float], **run_kwargs: Any) -> Tuple[Optional[Union[RunOutput, TeamRunOutput]], str, str]:
+        """Run a member to completion or timeout. Returns its output, the content streamed so far and a status."""
+        chunks: List[str] = []
+        output: Optional[Union[RunOutput, TeamRunOutput]] = None
+        events = member.arun(**run_kwargs)
+
+        async def consume() -> None:
+            nonlocal output
+            async for event in events:
+                if isinstance(event, (RunOutput, TeamRunOutput)):
+                    output = event
+                    return
+                check_if_run_cancelled(event)
+                if isinstance(event, (RunContentEvent, TeamRunContentEvent)) and isinstance(event.content, str):
+                    chunks.append(event.content)
+
+        try:
+            await asyncio.wait_for(consume(), timeout)
+            status = "completed"
+        except asyncio.TimeoutError:
+            log_warning(f"Member {member.name} timed out after {timeout}s")
+            status = "timeout"
+        except RunCancelledException:
+            raise
+        except Exception as e:
+            log_warning(f"Member {member.name} failed: {e}")
+            status = f"error: {e}"
+        finally:
+            await events.aclose()
+        if output is not None and output.status == RunStatus.error:
+            status = "error"
+        return output, "".join(chunks), status
+
+    @staticmethod
+    def _record_member_timing(run_response: TeamRunOutput, member_name: str, seconds: float, status: str) -> None:
+        if run_response.metadata is None:
+            run_response.metadata = {}
+        run_response.metadata.setdefault(MEMBER_TIMINGS_KEY, []).append(
+            {"member": member_name, "seconds": round(seconds, 3), "status": status}
+        )
+        log_debug(f"Member {member_name} {status} in {seconds:.2f}s")
+
+
+def _member_result(output: Union[RunOutput, TeamRunOutput]) -> str:
+    name = output.agent_name if isinstance(output, RunOutput) else output.team_name
+    content = output.content
+    if isinstance(content, str) and content.strip():
+        return f"Agent {name}: {content}"
+    if content is not None and not isinstance(content, str):
+        return f"Agent {name}: {output.get_content_as_string()}"
+    results = [str(tool.result) for tool in output.tools or [] if tool.result]
+    if results:
+        return f"Agent {name}: {','.join(results)}"
+    return f"Agent {name}: No response from the member agent."
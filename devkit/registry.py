@@ -0,0 +1,166 @@
+import importlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from agno.utils.log import log_debug, logger
+
+Factory = Union[str, Callable[[], Any]]
+AGENT = "agent"
+TEAM = "team"
+
+
+@dataclass
+class ComponentSpec:
+    id: str
+    kind: str
+    factory: Factory
+    instance: Any = None
+    build_seconds: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class AgentRegistry:
+    """
+    Agents and teams declared as factories and built on first use.
+
+    A factory is a callable or a `"module:attribute"` string; strings are imported only
+    when the component is first requested, so declaring a component costs nothing at
+    import time. Each component is built once, even when several threads ask for it at
+    the same time, and gets the registered id unless its factory already set one.
+    `prewarm` builds components on a background thread ahead of the first request, and
+    `preload` imports the factories without building anything.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, ComponentSpec] = {}
+        self._lock = threading.Lock()
+
+    def register(self, id: str, factory: Factory, kind: str = AGENT) -> None:
+        if kind not in (AGENT, TEAM):
+            raise ValueError(f"Unknown component kind: {kind}")
+        with self._lock:
+            if id in self._specs:
+                raise ValueError(f"Component {id} is already registered")
+            self._specs[id] = ComponentSpec(id=id, kind=kind, factory=factory)
+
+    def agent(self, id: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """Decorator registering an agent factory under `id`."""
+        def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+            self.register(id, factory, AGENT)
+            return factory
+
+        return decorator
+
+    def team(self, id: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """Decorator registering a team factory under `id`."""
+        def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+            self.register(id, factory, TEAM)
+            return factory
+
+        return decorator
+
+    def ids(self, kind: Optional[str] = None) -> List[str]:
+        with self._lock:
+            return [spec.id for spec in self._specs.values() if kind is None or spec.kind == kind]
+
+    def is_built(self, id: str) -> bool:
+        return self._spec(id).instance is not None
+
+    def get(self, id: str) -> Any:
+        """Return the component registered as `id`, building it on first use."""
+        spec = self._spec(id)
+        if spec.instance is not None:
+            return spec.instance
+        with spec.lock:
+            if spec.instance is None:
+                start = time.perf_counter()
+                instance = _resolve(spec.factory)()
+                if getattr(instance, "id", None) is None:
+                    instance.id = spec.id
+                spec.build_seconds = time.perf_counter() - start
+                spec.instance = instance
+                log_debug(f"Built {spec.kind} {spec.id} in {spec.build_seconds:.3f}s")
+        return spec.instance
+
+    def agents(self) -> List[Any]:
+        return [self.get(id) for id in self.ids(AGENT)]
+
+    def teams(self) -> List[Any]:
+        return [self.get(id) for id in self.ids(TEAM)]
+
+    def prewarm(self, ids: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Build `ids` (all components by default) on a background thread."""
+        targets = list(ids) if ids is not None else self.ids()
+
+        def build() -> None:
+            for id in targets:
+                try:
+                    self.get(id)
+                except Exception as e:
+                    logger.warning(f"Prewarming {id} failed: {e}")
+
+        thread = threading.Thread(target=build, name="registry-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def preload(self) -> None:
+        """Import the modules of the string factories, e.g. in a server process before it forks workers."""
+        with self._lock:
+            factories = [spec.factory for spec in self._specs.values()]
+        for factory in factories:
+            if isinstance(factory, str):
+                _resolve(factory)
+
+    async def aclose(self) -> None:
+        """Close the toolkits of the built components (pooled clients, caches), e.g. at server shutdown."""
+        with self._lock:
+            instances = [spec.instance for spec in self._specs.values() if spec.instance is not None]
+        await aclose_tools(tool for instance in instances for tool in _component_tools(instance))
+
+    def build_times(self) -> Dict[str, float]:
+        """Seconds each built component took to construct, including the imports of its factory."""
+        with self._lock:
+            specs = list(self._specs.values())
+        return {spec.id: round(spec.build_seconds, 4) for spec in specs if spec.build_seconds is not None}
+
+    def _spec(self, id: str) -> ComponentSpec:
+        with self._lock:
+            spec = self._specs.get(id)
+        if spec is None:
+            raise KeyError(f"No agent or team registered as {id}")
+        return spec
+
+
+async def aclose_tools(tools: Iterable[Any]) -> None:
+    """Close each toolkit once with its `aclose` or `close` method, logging failures."""
+    seen = set()
+    for tool in tools:
+        if id(tool) in seen:
+            continue
+        seen.add(id(tool))
+        try:
+            if callable(getattr(tool, "aclose", None)):
+                await tool.aclose()
+            elif callable(getattr(tool, "close", None)):
+                tool.close()
+        except Exception as e:
+            logger.warning(f"Closing {type(tool).__name__} failed: {e}")
+
+
+def _component_tools(component: Any) -> List[Any]:
+    """Tools of an agent, or of a team and all of its members."""
+    tools = list(getattr(component, "tools", None) or [])
+    for member in getattr(component, "members", None) or []:
+        tools.extend(_component_tools(member))
+    return tools
+
+
+def _resolve(factory: Factory) -> Callable[[], Any]:
+    if callable(factory):
+        return factory
+    module_name, _, attribute = factory.partition(":")
+    if not attribute:
+        raise ValueError(f"Factory must be a callable or 'module:attribute', got {factory}")
+    return getattr(importlib.import_module(module_name), attribute)
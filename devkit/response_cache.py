@@ -0,0 +1,304 @@
+import hashlib
+from uuid import uuid4
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set
+
+from agno.models.message import Message
+from agno.run.agent import RunCompletedEvent, RunContentEvent, RunOutput, RunStartedEvent
+from agno.run.base import RunStatus
+from agno.tools.function import Function
+from agno.tools.toolkit import Toolkit
+from agno.utils.log import log_debug
+
+from .context import BudgetedAgent
+from .utils.cache import TTLCache
+
+# Tools are marked with `devkit.utils.cache.cacheable`; these names and prefixes cover
+# third-party tools (agno's memory and file tools) that change state outside the conversation.
+SIDE_EFFECT_TOOLS = frozenset({
+    "run_shell_command",
+    "save_file",
+    "update_user_memory",
+})
+SIDE_EFFECT_PREFIXES = ("save_", "write_", "delete_", "remove_", "update_", "create_")
+MEDIA_ARGUMENTS = ("audio", "images", "videos", "files")
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of final agent answers.
+
+    Answers are keyed on the model id, a hash of the system prompt, the tool set and the
+    whitespace-normalized user input, scoped to the user (whose memories are part of the
+    prompt) and, when the agent sends history or other session context, to the session,
+    so an answer is never served to another user or conversation. Short inputs
+    (`min_input_chars`) are not cached because follow-ups like "yes" or "do it" depend on
+    the conversation around them.
+
+    The cache is opt-in: no entry point passes one. For agents with history, such as
+    DEV-PET, it only answers a question repeated within the same session; it pays off
+    for agents without session context, where every session of a user shares the answers.
+    """
+
+    def __init__(
+            self,
+            db_file: Optional[str] = "response_cache.db",
+            ttl: float = 24 * 3600,
+            max_entries: int = 1000,
+            memory_size: int = 128,
+            min_input_chars: int = 16,
+            side_effect_tools: Iterable[str] = SIDE_EFFECT_TOOLS,
+    ):
+        self.min_input_chars = min_input_chars
+        self.side_effect_tools: Set[str] = set(side_effect_tools)
+        self.store = TTLCache(
+            maxsize=memory_size,
+            ttl=ttl,
+            db_file=db_file,
+            table="response_cache",
+            max_disk_entries=max_entries,
+        )
+
+    def key_for(
+            self,
+            agent: "CachedAgent",
+            input: Any,
+            user_id: Optional[str] = None,
+            session_id: Optional[str] = None,
+    ) -> Optional[str]:
+        if not isinstance(input, str):
+            return None
+        normalized = " ".join(input.split())
+        if len(normalized) < self.min_input_chars:
+            return None
+        model_id = agent.model.id if agent.model is not None else ""
+        prompt_hash = hashlib.sha256(f"{agent.description}\n{agent.instructions}".encode()).hexdigest()
+        input_hash = hashlib.sha256(normalized.encode()).hexdigest()
+        scope = [user_id or ""]
+        if uses_session_context(agent):
+            scope.append(session_id or "")
+        return TTLCache.make_key(model_id, prompt_hash, tool_names(agent.tools), scope, input_hash)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.store.get(key)
+
+    def set(self, key: str, content: str) -> None:
+        self.store.set(key, content)
+
+    def has_side_effects(self, tool_names_called: Iterable[str]) -> bool:
+        return any(
+            name in self.side_effect_tools or name.startswith(SIDE_EFFECT_PREFIXES)
+            for name in tool_names_called
+        )
+
+
+def uses_session_context(agent: Any) -> bool:
+    """Whether the agent's prompt depends on the session: history, its summary or state."""
+    return any(
+        getattr(agent, name, False)
+        for name in (
+            "add_history_to_context",
+            "read_chat_history",
+            "search_session_history",
+            "add_session_summary_to_context",
+            "add_session_state_to_context",
+        )
+    )
+
+
+def tool_names(tools: Optional[List[Any]]) -> List[str]:
+    names = []
+    for tool in tools or []:
+        if isinstance(tool, Toolkit):
+            names.extend(tool.functions.keys())
+        elif isinstance(tool, Function):
+            names.append(tool.name)
+        elif callable(tool):
+            names.append(tool.__name__)
+    return sorted(names)
+
+
+def tool_entrypoints(tools: Optional[List[Any]]) -> Dict[str, Any]:
+    """The callable behind each tool name, to read its `cacheable` marker."""
+    entrypoints: Dict[str, Any] = {}
+    for tool in tools or []:
+        if isinstance(tool, Toolkit):
+            entrypoints.update({name: function.entrypoint for name, function in tool.functions.items()})
+        elif isinstance(tool, Function):
+            entrypoints[tool.name] = tool.entrypoint
+        elif callable(tool):
+            entrypoints[tool.__name__] = tool
+    return entrypoints
+
+
+def is_cacheable_call(entrypoint: Any, arguments: Dict[str, Any]) -> bool:
+    """Whether a call of the tool with `arguments` allows caching the answer, per its `cacheable` marker."""
+    marker = getattr(entrypoint, "cacheable", True)
+    if not callable(marker):
+        return bool(marker)
+    try:
+        return bool(marker(**arguments))
+    except TypeError:
+        return False
+
+
+@dataclass(init=False)
+class CachedAgent(BudgetedAgent):
+    """
+    Agent that answers repeated questions from a `ResponseCache`.
+
+    A hit is replayed through the same run/arun interfaces, streamed as content events
+    when `stream=True`, so callers cannot tell it apart from a model answer, and is saved
+    to the session like a model run, so the stored conversation keeps the turn. Runs that
+    fail or call a tool marked `cacheable(False)` (or a known side-effecting one) are not
+    stored. Without a cache the agent behaves exactly like `BudgetedAgent`.
+    """
+
+    response_cache: Optional[ResponseCache] = None
+
+    def __init__(self, *args: Any, response_cache: Optional[ResponseCache] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+
+    def run(self, input: Any, *, stream: Optional[bool] = None, **kwargs: Any):
+        key = self._cache_key(input, kwargs)
+        if key is None:
+            return super().run(input, stream=stream, **kwargs)
+        stream = self._resolve_stream(stream)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            log_debug("Response cache hit")
+            if stream:
+                return self._replay(input, cached, kwargs)
+            return self._save_cached_run(input, self._cached_output(cached, kwargs))
+        if stream:
+            wants_output = bool(kwargs.pop("yield_run_response", False))
+            events = super().run(input, stream=True, yield_run_response=True, **kwargs)
+            return self._record_stream(key, events, wants_output)
+        run_output = super().run(input, stream=False, **kwargs)
+        self._store_output(key, run_output)
+        return run_output
+
+    def arun(self, input: Any, *, stream: Optional[bool] = None, **kwargs: Any):
+        key = self._cache_key(input, kwargs)
+        if key is None:
+            return super().arun(input, stream=stream, **kwargs)
+        stream = self._resolve_stream(stream)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            log_debug("Response cache hit")
+            if stream:
+                return self._areplay(input, cached, kwargs)
+            return self._acached_output(input, cached, kwargs)
+        if stream:
+            wants_output = bool(kwargs.pop("yield_run_response", False))
+            events = super().arun(input, stream=True, yield_run_response=True, **kwargs)
+            return self._arecord_stream(key, events, wants_output)
+        return self._arun_and_store(key, super().arun(input, stream=False, **kwargs))
+
+    def _resolve_stream(self, stream: Optional[bool]) -> bool:
+        if stream is None:
+            stream = False if self.stream is None else self.stream
+        return stream
+
+    def _cache_key(self, input: Any, kwargs: dict) -> Optional[str]:
+        if self.response_cache is None or self.output_schema is not None:
+            return None
+        if any(kwargs.get(name) for name in MEDIA_ARGUMENTS):
+            return None
+        return self.response_cache.key_for(
+            self,
+            input,
+            user_id=kwargs.get("user_id") or self.user_id,
+            session_id=kwargs.get("session_id") or self.session_id,
+        )
+
+    def _cached_output(self, content: str, kwargs: dict) -> RunOutput:
+        return RunOutput(
+            run_id=str(uuid4()),
+            agent_id=self.id,
+            agent_name=self.name,
+            session_id=kwargs.get("session_id") or self.session_id or str(uuid4()),
+            user_id=kwargs.get("user_id") or self.user_id,
+            content=content,
+            model=self.model.id if self.model is not None else None,
+            status=RunStatus.completed,
+            metadata={"cached": True},
+        )
+
+    async def _acached_output(self, input: str, content: str, kwargs: dict) -> RunOutput:
+        return self._save_cached_run(input, self._cached_output(content, kwargs))
+
+    def _save_cached_run(self, input: str, run_output: RunOutput) -> RunOutput:
+        """Add a replayed answer to the session as a completed turn, as a model run would be."""
+        run_output.messages = [
+            Message(role="user", content=input),
+            Message(role="assistant", content=run_output.content),
+        ]
+        if self.db is not None:
+            session = self._read_or_create_session(session_id=run_output.session_id, user_id=run_output.user_id)
+            session.upsert_run(run=run_output)
+            self.save_session(session=session)
+        return run_output
+
+    def _replay(self, input: str, content: str, kwargs: dict) -> Iterator[Any]:
+        run_output = self._cached_output(content, kwargs)
+        common = dict(
+            agent_id=self.id,
+            agent_name=self.name,
+            run_id=run_output.run_id,
+            session_id=run_output.session_id,
+        )
+        yield RunStartedEvent(model=run_output.model or "", **common)
+        for chunk in _chunks(content):
+            yield RunContentEvent(content=chunk, **common)
+        self._save_cached_run(input, run_output)
+        yield RunCompletedEvent(content=content, **common)
+        if kwargs.get("yield_run_response"):
+            yield run_output
+
+    async def _areplay(self, input: str, content: str, kwargs: dict) -> AsyncIterator[Any]:
+        for event in self._replay(input, content, kwargs):
+            yield event
+
+    # Streams are run with yield_run_response so the final RunOutput, which carries the
+    # status and the executed tools, can be inspected before the answer is stored.
+    def _record_stream(self, key: str, events: Iterator[Any], wants_output: bool) -> Iterator[Any]:
+        for event in events:
+            if isinstance(event, RunOutput):
+                self._store_output(key, event)
+                if not wants_output:
+                    continue
+            yield event
+
+    async def _arecord_stream(self, key: str, events: AsyncIterator[Any], wants_output: bool) -> AsyncIterator[Any]:
+        async for event in events:
+            if isinstance(event, RunOutput):
+                self._store_output(key, event)
+                if not wants_output:
+                    continue
+            yield event
+
+    async def _arun_and_store(self, key: str, pending: Any) -> RunOutput:
+        run_output = await pending
+        self._store_output(key, run_output)
+        return run_output
+
+    def _store_output(self, key: str, run_output: RunOutput) -> None:
+        if run_output.status != RunStatus.completed or not isinstance(run_output.content, str) or not run_output.content:
+            return
+        executions = run_output.tools or []
+        if self.response_cache.has_side_effects(tool.tool_name or "" for tool in executions):
+            log_debug("Response not cached, the run called a side-effecting tool")
+            return
+        entrypoints = tool_entrypoints(self.tools)
+        for tool in executions:
+            if not is_cacheable_call(entrypoints.get(tool.tool_name or ""), tool.tool_args or {}):
+                log_debug(f"Response not cached, {tool.tool_name} is not cacheable")
+                return
+        self.response_cache.set(key, run_output.content)
+
+
+def _chunks(content: str, size: int = 64) -> Iterator[str]:
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from agno.models.message import Message
+from agno.models.openai import OpenAIChat
+from agno.utils.log import log_debug
+
+from .clients import SharedOpenAIChat
+from .utils.tokens import message_text
+
+FAST = "fast"
+STRONG = "strong"
+
+# Words that signal multi-step reasoning, synthesis or code work, as regular expressions
+# matched on word boundaries (so "plan" does not match "airplane")
+STRONG_KEYWORDS = (
+    r"analy[sz]\w*", r"compar\w*", "versus", "vs", r"recommend\w*", "should i", "why", r"explain\w*",
+    r"evaluat\w*", r"assess\w*", r"forecast\w*", r"predict\w*", r"strateg\w*", r"plan(s|ned|ning)?",
+    "pros and cons", r"trade-?offs?", "step by step", r"design\w*", r"architect\w*", r"debug\w*",
+    r"refactor\w*", r"optimi[sz]\w*", r"implement\w*", r"review\w*", r"investigat\w*", r"research\w*",
+    r"reports?", r"summari[sz]\w*", "comprehensive", "in depth",
+)
+TICKER_PATTERN = re.compile(r"\b[A-Z]{2,5}\b")
+
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_latency": round(self.total_latency / self.calls, 3) if self.calls else 0.0,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+@dataclass
+class RoutingOpenAIChat(SharedOpenAIChat):
+    """
+    OpenAI chat model that sends each request to a fast or a strong model.
+
+    The latest user message is classified with local heuristics only: its length, code
+    blocks, several questions or tickers (which fan out into several tool calls) and
+    reasoning keywords pick the strong tier, everything else goes to the fast tier.
+    Set `force_tier` to pin every request to one tier. Both tiers share this model's
+    client settings, pooled clients and admission control; `id` is the strong model, so callers reading the model id see the
+    most capable one. Per-tier calls, latency and token usage are available from `stats`.
+    """
+
+    id: str = "gpt-4.1"
+    name: str = "RoutingOpenAIChat"
+    fast_id: str = "gpt-4.1-mini"
+    force_tier: Optional[str] = None
+    # Requests longer than this always go to the strong tier
+    max_fast_chars: int = 300
+    max_fast_tickers: int = 2
+    strong_keywords: Tuple[str, ...] = STRONG_KEYWORDS
+
+    tiers: Dict[str, OpenAIChat] = field(default_factory=dict, repr=False)
+    tier_stats: Dict[str, TierStats] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        settings = {
+            f.name: getattr(self, f.name)
+            for f in fields(SharedOpenAIChat)
+            if f.init and f.name not in ("id", "name")
+        }
+        if not self.tiers:
+            self.tiers = {
+                FAST: SharedOpenAIChat(**{**settings, "id": self.fast_id}),
+                STRONG: SharedOpenAIChat(**{**settings, "id": self.id}),
+            }
+        self.tier_stats = {tier: TierStats() for tier in self.tiers}
+        self._keyword_pattern = re.compile(rf"\b(?:{'|'.join(self.strong_keywords)})\b", re.IGNORECASE)
+        self._stats_lock = threading.Lock()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "RoutingOpenAIChat":
+        # Reasoning agents deep copy their model; the copy gets its own tiers and stats.
+        return replace(self, tiers={})
+
+    def classify(self, messages: List[Message]) -> Tuple[str, str]:
+        """Return the tier for the request in `messages` and the reason it was chosen."""
+        if self.force_tier is not None:
+            return self.force_tier, "forced"
+        text = next(
+            (message_text(m) for m in reversed(messages) if m.role == "user" and not m.from_history), ""
+        )
+        if len(text) > self.max_fast_chars:
+            return STRONG, "long request"
+        if "```" in text:
+            return STRONG, "code block"
+        if text.count("?") > 1:
+            return STRONG, "several questions"
+        if len(set(TICKER_PATTERN.findall(text))) > self.max_fast_tickers:
+            return STRONG, "several tickers"
+        match = self._keyword_pattern.search(text)
+        if match is not None:
+            return STRONG, f"keyword '{match.group(0).lower()}'"
+        return FAST, "simple request"
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._stats_lock:
+            return {tier: stats.summary() for tier, stats in self.tier_stats.items()}
+
+    def response(self, messages: List[Message], *args: Any, **kwargs: Any):
+        tier = self._route(messages)
+        start, first = time.perf_counter(), len(messages)
+        try:
+            return self.tiers[tier].response(messages, *args, **kwargs)
+        except Exception:
+            self._record_error(tier)
+            raise
+        finally:
+            self._record(tier, messages[first:], time.perf_counter() - start)
+
+    async def aresponse(self, messages: List[Message], *args: Any, **kwargs: Any):
+        tier = self._route(messages)
+        start, first = time.perf_counter(), len(messages)
+        try:
+            return await self.tiers[tier].aresponse(messages, *args, **kwargs)
+        except Exception:
+            self._record_error(tier)
+            raise
+        finally:
+            self._record(tier, messages[first:], time.perf_counter() - start)
+
+    def response_stream(self, messages: List[Message], *args: Any, **kwargs: Any) -> Iterator[Any]:
+        tier = self._route(messages)
+        start, first = time.perf_counter(), len(messages)
+        try:
+            yield from self.tiers[tier].response_stream(messages, *args, **kwargs)
+        except Exception:
+            self._record_error(tier)
+            raise
+        finally:
+            self._record(tier, messages[first:], time.perf_counter() - start)
+
+    async def aresponse_stream(self, messages: List[Message], *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        tier = self._route(messages)
+        start, first = time.perf_counter(), len(messages)
+        try:
+            async for event in self.tiers[tier].aresponse_stream(messages, *args, **kwargs):
+                yield event
+        except Exception:
+            self._record_error(tier)
+            raise
+        finally:
+            self._record(tier, messages[first:], time.perf_counter() - start)
+
+    def _route(self, messages: List[Message]) -> str:
+        tier, reason = self.classify(messages)
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown model tier '{tier}', expected one of {sorted(self.tiers)}")
+        log_debug(f"Routing to {tier} model {self.tiers[tier].id} ({reason})")
+        return tier
+
+    # The tier appends its assistant and tool messages to `messages`; their metrics carry the usage.
+    def _record(self, tier: str, new_messages: List[Message], latency: float) -> None:
+        with self._stats_lock:
+            stats = self.tier_stats[tier]
+            stats.calls += 1
+            stats.total_latency += latency
+            for message in new_messages:
+                if message.role == "assistant" and message.metrics is not None:
+                    stats.input_tokens += message.metrics.input_tokens or 0
+                    stats.output_tokens += message.metrics.output_tokens or 0
+
+    def _record_error(self, tier: str) -> None:
+        with self._stats_lock:
+            self.tier_stats[tier].errors += 1
@@ -0,0 +1,272 @@
+"""
+Production server for AgentOS: pre-forked uvicorn workers on one shared socket.
+
+    python -m devkit.serve agent_os:app --workers 4 --port 7777
+    python -m devkit.serve agent_os:app --workers 4 --graceful-timeout 120 --drain-delay 10
+
+The master process imports the app, and with it AgentOS and the agent factories, once and
+then forks the workers, so they share those modules and start in a fraction of the import
+time; agents, clients and database connections are only built inside each worker. Workers
+that die are restarted with a backoff. On SIGTERM or SIGINT every worker first fails its
+`/readyz` probe for `--drain-delay` seconds while still serving, then stops accepting
+connections and gives in-flight requests, streamed runs included, up to
+`--graceful-timeout` seconds to finish. Sessions live in the shared database (the SQLite
+file or the server configured by `DbSettings`), so any worker can serve any session. The
+model admission limits (`LLM_MAX_CONCURRENCY` and friends) apply per worker.
+"""
+import argparse
+import importlib
+import os
+import signal
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from agno.utils.log import logger
+
+# Seconds after the graceful timeout before workers still running are killed
+KILL_GRACE = 5.0
+# Workers exiting sooner than this after their start count as crashing on startup
+MIN_UPTIME = 5.0
+MAX_RESTART_DELAY = 30.0
+
+
+class PreforkServer:
+    """
+    Runs `app` (an import string) on `workers` forked uvicorn processes and supervises them.
+
+    With `preload` the app is imported in the master before forking, together with
+    `preload_modules`, and when it has a `preload` method (`LazyAgentOS`) that is called
+    too. Each worker gets its index as `app.worker_id` when the app has that attribute and
+    `app.drain()` is called when it starts draining. Extra keyword arguments go to
+    `uvicorn.Config`. Needs `os.fork`; elsewhere it falls back to uvicorn's own workers.
+    """
+
+    def __init__(
+            self,
+            app: str,
+            host: str = "0.0.0.0",
+            port: int = 7777,
+            workers: Optional[int] = None,
+            graceful_timeout: float = 60.0,
+            drain_delay: float = 0.0,
+            preload: bool = True,
+            preload_modules: Optional[List[str]] = None,
+            **config_kwargs: Any,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers or int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+        self.graceful_timeout = graceful_timeout
+        self.drain_delay = drain_delay
+        self.preload = preload
+        self.preload_modules = preload_modules or []
+        self.config_kwargs = config_kwargs
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._started_at: Dict[int, float] = {}  # worker index -> spawn time
+        self._restart_delay: Dict[int, float] = {}
+        self._pending: Dict[int, float] = {}  # worker index -> when to respawn it
+        self._stopping_since: Optional[float] = None
+        self._app_object: Any = None
+        self._socket: Any = None
+
+    def run(self) -> int:
+        if not hasattr(os, "fork"):
+            logger.warning("os.fork is not available, running uvicorn's own workers without preloading")
+            uvicorn.run(
+                self.app,
+                host=self.host,
+                port=self.port,
+                workers=self.workers,
+                timeout_graceful_shutdown=int(self.graceful_timeout) if self.graceful_timeout else None,
+                **self.config_kwargs,
+            )
+            return 0
+
+        if self.workers > 1:
+            check_shared_storage()
+        if self.preload:
+            start = time.perf_counter()
+            self._app_object = self._load_app()
+            logger.info(f"Preloaded {self.app} in {time.perf_counter() - start:.2f}s")
+        self._socket = uvicorn.Config(self.app, host=self.host, port=self.port).bind_socket()
+        previous_handlers = {sig: signal.signal(sig, self._handle_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            for index in range(self.workers):
+                self._spawn(index)
+            self._supervise()
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            self._socket.close()
+        logger.info("All workers stopped")
+        return 0
+
+    def _load_app(self) -> Any:
+        from uvicorn.importer import import_from_string
+
+        for module in self.preload_modules:
+            importlib.import_module(module)
+        app = import_from_string(self.app)
+        if callable(getattr(app, "preload", None)):
+            app.preload()
+        return app
+
+    def _handle_stop(self, sig: int, frame: Any) -> None:
+        if self._stopping_since is None:
+            self._stopping_since = time.monotonic()
+            logger.info(f"Stopping {len(self._children)} worker(s) gracefully")
+            self._signal_workers(signal.SIGTERM)
+        else:
+            logger.warning("Stopping workers now")
+            self._signal_workers(signal.SIGKILL)
+
+    def _signal_workers(self, sig: int) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._run_worker(index)
+            except BaseException as e:
+                logger.error(f"Worker {index} failed: {e}")
+            finally:
+                os._exit(code)
+        self._children[pid] = index
+        self._started_at[index] = time.monotonic()
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def _run_worker(self, index: int) -> int:
+        # Uvicorn installs its own handlers while serving and re-raises the signal afterwards
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_IGN)
+        from .db.storage import dispose_engines
+
+        dispose_engines(close=False)
+        app = self._app_object if self._app_object is not None else self._load_app()
+        if hasattr(app, "worker_id"):
+            app.worker_id = index
+        config = uvicorn.Config(
+            app,
+            timeout_graceful_shutdown=int(self.graceful_timeout) if self.graceful_timeout else None,
+            **self.config_kwargs,
+        )
+        server = _WorkerServer(config, app, self.drain_delay)
+        server.run(sockets=[self._socket])
+        return 0 if server.started else 3
+
+    def _supervise(self) -> None:
+        while self._children or (self._pending and self._stopping_since is None):
+            now = time.monotonic()
+            if self._stopping_since is not None:
+                self._pending.clear()
+                if now - self._stopping_since > self.drain_delay + self.graceful_timeout + KILL_GRACE:
+                    logger.warning(f"Killing {len(self._children)} worker(s) still running")
+                    self._signal_workers(signal.SIGKILL)
+                    self._stopping_since = now
+            for index, due in list(self._pending.items()):
+                if due <= now:
+                    del self._pending[index]
+                    self._spawn(index)
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            index = self._children.pop(pid, None)
+            if index is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if self._stopping_since is not None:
+                logger.info(f"Worker {index} (pid {pid}) exited with {code}")
+                continue
+            self._schedule_restart(index, pid, code)
+
+    def _schedule_restart(self, index: int, pid: int, code: int) -> None:
+        uptime = time.monotonic() - self._started_at.get(index, 0.0)
+        if uptime < MIN_UPTIME:
+            delay = min(MAX_RESTART_DELAY, max(0.5, self._restart_delay.get(index, 0.25) * 2))
+        else:
+            delay = 0.0
+        self._restart_delay[index] = delay
+        self._pending[index] = time.monotonic() + delay
+        logger.warning(f"Worker {index} (pid {pid}) exited with {code} after {uptime:.1f}s, restarting in {delay:.1f}s")
+
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that drains (readiness failing, still serving) before it shuts down."""
+
+    def __init__(self, config: uvicorn.Config, app: Any, drain_delay: float):
+        super().__init__(config)
+        self.app = app
+        self.drain_delay = drain_delay
+        self.drain_started: Optional[float] = None
+
+    def handle_exit(self, sig: int, frame: Any) -> None:
+        if self.drain_started is None:
+            self.drain_started = time.monotonic()
+            if callable(getattr(self.app, "drain", None)):
+                self.app.drain()
+            if self.drain_delay > 0:
+                return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self.drain_started is not None and time.monotonic() - self.drain_started >= self.drain_delay:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def check_shared_storage() -> None:
+    """Fail when the configured session storage cannot be shared between worker processes."""
+    from sqlalchemy.engine import make_url
+
+    from .db.settings import db_settings
+
+    url = make_url(db_settings.get_db_url())
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        raise ValueError("An in-memory SQLite database cannot be shared between workers, set DB_FILE or a database server")
+    logger.info(f"Workers share sessions through {url.render_as_string(hide_password=True)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("app", nargs="?", default="agent_os:app", help="ASGI app import string, default agent_os:app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--workers", type=int, help="Worker processes, default $WEB_CONCURRENCY or the CPU count")
+    parser.add_argument("--graceful-timeout", type=float, default=60.0, help="Seconds in-flight requests get on shutdown")
+    parser.add_argument("--drain-delay", type=float, default=0.0, help="Seconds readiness fails before shutting down")
+    parser.add_argument("--no-preload", action="store_true", help="Import the app in each worker instead of before forking")
+    parser.add_argument("--preload-module", action="append", default=[], help="Extra module to import before forking")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args(argv)
+    sys.path.insert(0, os.getcwd())
+    server = PreforkServer(
+        args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        graceful_timeout=args.graceful_timeout,
+        drain_delay=args.drain_delay,
+        preload=not args.no_preload,
+        preload_modules=args.preload_module,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+    )
+    return server.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
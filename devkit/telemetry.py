@@ -0,0 +1,535 @@
+import inspect
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from os import getenv
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+from agno.models.message import Message
+from agno.models.response import ModelResponseEvent
+from agno.run.agent import BaseAgentRunEvent, RunEvent, RunOutput
+from agno.run.base import RunStatus
+from agno.run.team import BaseTeamRunEvent, TeamRunEvent, TeamRunOutput
+from agno.team.team import Team
+from agno.utils.log import log_debug, logger
+
+from .utils.metrics import MetricsRegistry
+
+DB_METHOD_PREFIXES = ("get_", "upsert_", "delete_", "rename_", "clear_")
+CONTENT_EVENTS = {RunEvent.run_content.value, TeamRunEvent.run_content.value}
+COMPLETED_EVENTS = {RunEvent.run_completed.value, TeamRunEvent.run_completed.value}
+ERROR_EVENTS = {
+    RunEvent.run_error.value, TeamRunEvent.run_error.value,
+    RunEvent.run_cancelled.value, TeamRunEvent.run_cancelled.value,
+}
+RATIO_BUCKETS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0)
+
+
+@dataclass
+class TelemetryRecord:
+    """One observation, as written to the SQLite sink."""
+
+    kind: str  # run, model, tool or db
+    name: str
+    status: str
+    duration: float
+    ttft: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    run_id: Optional[str] = None
+    session_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+
+class SqliteTelemetrySink:
+    """
+    Appends telemetry records to a SQLite table for offline analysis.
+
+    Records are queued and written in batches by a background thread, so recording
+    never waits for the disk; when the queue is full new records are dropped.
+    """
+
+    def __init__(self, db_file: str, table: str = "telemetry", flush_interval: float = 1.0, max_queue: int = 10000):
+        self.db_file = db_file
+        self.table = table
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[TelemetryRecord]]" = queue.Queue(maxsize=max_queue)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "created_at REAL NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL, status TEXT NOT NULL, "
+            "duration REAL NOT NULL, ttft REAL, input_tokens INTEGER, output_tokens INTEGER, "
+            "cached_tokens INTEGER, run_id TEXT, session_id TEXT)"
+        )
+        self._conn.commit()
+        self._thread = threading.Thread(target=self._write_loop, name="telemetry-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, record: TelemetryRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._conn.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch: List[TelemetryRecord] = []
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            closing = record is None
+            if record is not None:
+                batch.append(record)
+            while not closing:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    closing = True
+                else:
+                    batch.append(record)
+            if batch:
+                self._flush(batch)
+            if closing:
+                return
+
+    def _flush(self, batch: List[TelemetryRecord]) -> None:
+        try:
+            self._conn.executemany(
+                f"INSERT INTO {self.table} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (r.created_at, r.kind, r.name, r.status, r.duration, r.ttft, r.input_tokens,
+                     r.output_tokens, r.cached_tokens, r.run_id, r.session_id)
+                    for r in batch
+                ],
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write {len(batch)} telemetry records: {e}")
+
+
+class _RunObservation:
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.start = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.status = "completed"
+        self.metrics = None
+        self.run_id: Optional[str] = None
+        self.session_id: Optional[str] = None
+
+
+class Telemetry:
+    """
+    Per-run performance telemetry for agents, teams, their models, tools and storage.
+
+    `instrument` wraps a component's `run`/`arun` (and those of team members), its model's
+    response methods and its database's read and write methods on the instance, so no
+    class is patched and uninstrumented components pay nothing. Observations feed the
+    histograms and counters of `metrics`, rendered for Prometheus by `render`, and are
+    appended to `sink` when one is configured. Model request and tool call timings are
+    read from the message metrics agno records while the model runs its tool loop.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None, sink: Optional[SqliteTelemetrySink] = None):
+        self.metrics = metrics or MetricsRegistry()
+        self.sink = sink
+        self.run_duration = self.metrics.histogram(
+            "devkit_run_duration_seconds", "Wall time of agent and team runs.", ("kind", "name", "status")
+        )
+        self.run_ttft = self.metrics.histogram(
+            "devkit_run_time_to_first_token_seconds", "Time from run start to the first content.", ("kind", "name")
+        )
+        self.model_duration = self.metrics.histogram(
+            "devkit_model_request_duration_seconds", "Latency of model requests.", ("model", "status")
+        )
+        self.model_ttft = self.metrics.histogram(
+            "devkit_model_time_to_first_token_seconds", "Time to the first streamed model chunk.", ("model",)
+        )
+        self.run_cached_ratio = self.metrics.histogram(
+            "devkit_run_cached_token_ratio",
+            "Share of a run's input tokens served from the provider's prompt cache.",
+            ("kind", "name"),
+            buckets=RATIO_BUCKETS,
+        )
+        self.model_tokens = self.metrics.counter(
+            "devkit_model_tokens_total", "Tokens used by model requests, by type.", ("model", "type")
+        )
+        self.tool_duration = self.metrics.histogram(
+            "devkit_tool_call_duration_seconds", "Duration of tool calls.", ("tool", "status")
+        )
+        self.db_duration = self.metrics.histogram(
+            "devkit_db_operation_duration_seconds", "Latency of storage reads and writes.", ("operation", "status")
+        )
+        self.errors = self.metrics.counter(
+            "devkit_errors_total", "Failed runs, model requests, tool calls and storage operations.", ("kind", "name")
+        )
+
+    def render(self) -> str:
+        return self.metrics.render()
+
+    def instrument(self, component: Any) -> Any:
+        """Instrument an agent or team, its members, model and database. Idempotent."""
+        if getattr(component, "_telemetry", None) is self:
+            return component
+        kind = "team" if isinstance(component, Team) else "agent"
+        name = component.name or component.id or kind
+        component.run = self._wrap_run(component.run, kind, name)
+        component.arun = self._wrap_arun(component.arun, kind, name)
+        component._telemetry = self
+        if component.model is not None:
+            self.instrument_model(component.model)
+        if component.db is not None:
+            self.instrument_db(component.db)
+        if isinstance(component, Team):
+            for member in component.members:
+                self.instrument(member)
+        return component
+
+    def instrument_model(self, model: Any) -> Any:
+        # A routing model delegates to its tiers, time those so requests are labelled with the model used
+        for target in (getattr(model, "tiers", None) or {}).values() or [model]:
+            if getattr(target, "_telemetry", None) is self:
+                continue
+            target.response = self._wrap_model_call(target.response, target.id)
+            target.aresponse = self._wrap_model_call(target.aresponse, target.id)
+            target.response_stream = self._wrap_model_stream(target.response_stream, target.id)
+            target.aresponse_stream = self._wrap_model_astream(target.aresponse_stream, target.id)
+            target._telemetry = self
+        return model
+
+    def instrument_db(self, db: Any) -> Any:
+        if getattr(db, "_telemetry", None) is self:
+            return db
+        for attribute in dir(type(db)):
+            if attribute.startswith(DB_METHOD_PREFIXES) and callable(getattr(type(db), attribute, None)):
+                setattr(db, attribute, self._wrap_db_call(getattr(db, attribute), attribute))
+        db._telemetry = self
+        return db
+
+    # Runs
+
+    def _wrap_run(self, run: Callable, kind: str, name: str) -> Callable:
+        def instrumented_run(*args: Any, **kwargs: Any) -> Any:
+            observation = _RunObservation(kind, name)
+            try:
+                result = run(*args, **kwargs)
+            except Exception:
+                observation.status = "error"
+                self._finish_run(observation)
+                raise
+            if isinstance(result, (RunOutput, TeamRunOutput)):
+                self._observe_output(observation, result)
+                self._finish_run(observation)
+                return result
+            return self._watch(result, observation)
+
+        return instrumented_run
+
+    def _wrap_arun(self, arun: Callable, kind: str, name: str) -> Callable:
+        def instrumented_arun(*args: Any, **kwargs: Any) -> Any:
+            observation = _RunObservation(kind, name)
+            result = arun(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._await_output(result, observation)
+            return self._awatch(result, observation)
+
+        return instrumented_arun
+
+    async def _await_output(self, pending: Any, observation: _RunObservation) -> Any:
+        try:
+            output = await pending
+        except Exception:
+            observation.status = "error"
+            raise
+        else:
+            self._observe_output(observation, output)
+            return output
+        finally:
+            self._finish_run(observation)
+
+    def _watch(self, events: Iterator[Any], observation: _RunObservation) -> Iterator[Any]:
+        try:
+            for event in events:
+                self._observe_event(observation, event)
+                yield event
+        except Exception:
+            observation.status = "error"
+            raise
+        finally:
+            self._finish_run(observation)
+
+    async def _awatch(self, events: AsyncIterator[Any], observation: _RunObservation) -> AsyncIterator[Any]:
+        try:
+            async for event in events:
+                self._observe_event(observation, event)
+                yield event
+        except Exception:
+            observation.status = "error"
+            raise
+        finally:
+            self._finish_run(observation)
+
+    def _observe_event(self, observation: _RunObservation, event: Any) -> None:
+        if isinstance(event, (RunOutput, TeamRunOutput)):
+            self._observe_output(observation, event)
+            return
+        # Team streams can carry member events; those are observed by the member's own instrumentation
+        own_event = BaseTeamRunEvent if observation.kind == "team" else BaseAgentRunEvent
+        if not isinstance(event, own_event):
+            return
+        observation.run_id = observation.run_id or event.run_id
+        observation.session_id = observation.session_id or event.session_id
+        if event.event in CONTENT_EVENTS:
+            if observation.first_token_at is None and getattr(event, "content", None):
+                observation.first_token_at = time.perf_counter()
+        elif event.event in COMPLETED_EVENTS:
+            observation.metrics = event.metrics
+        elif event.event in ERROR_EVENTS:
+            observation.status = "error" if "Error" in type(event).__name__ else "cancelled"
+
+    def _observe_output(self, observation: _RunObservation, output: Any) -> None:
+        observation.run_id = output.run_id
+        observation.session_id = output.session_id
+        observation.metrics = output.metrics or observation.metrics
+        if output.status == RunStatus.error:
+            observation.status = "error"
+        elif output.status == RunStatus.cancelled:
+            observation.status = "cancelled"
+
+    def _finish_run(self, observation: _RunObservation) -> None:
+        duration = time.perf_counter() - observation.start
+        metrics = observation.metrics
+        ttft = None
+        if observation.first_token_at is not None:
+            ttft = observation.first_token_at - observation.start
+        elif metrics is not None and metrics.time_to_first_token is not None:
+            ttft = metrics.time_to_first_token
+        self.run_duration.observe(duration, kind=observation.kind, name=observation.name, status=observation.status)
+        if ttft is not None:
+            self.run_ttft.observe(ttft, kind=observation.kind, name=observation.name)
+        if metrics is not None and metrics.input_tokens:
+            cached_ratio = metrics.cache_read_tokens / metrics.input_tokens
+            self.run_cached_ratio.observe(cached_ratio, kind=observation.kind, name=observation.name)
+            log_debug(
+                f"{observation.name} run: {metrics.cache_read_tokens}/{metrics.input_tokens} input tokens "
+                f"from the prompt cache ({cached_ratio:.0%})"
+            )
+        if observation.status == "error":
+            self.errors.inc(kind=observation.kind, name=observation.name)
+        self._write(TelemetryRecord(
+            kind=observation.kind,
+            name=observation.name,
+            status=observation.status,
+            duration=duration,
+            ttft=ttft,
+            input_tokens=metrics.input_tokens if metrics else 0,
+            output_tokens=metrics.output_tokens if metrics else 0,
+            cached_tokens=metrics.cache_read_tokens if metrics else 0,
+            run_id=observation.run_id,
+            session_id=observation.session_id,
+        ))
+
+    # Models and tools
+
+    def _wrap_model_call(self, call: Callable, model_id: str) -> Callable:
+        if inspect.iscoroutinefunction(call):
+            async def instrumented_acall(*args: Any, **kwargs: Any) -> Any:
+                messages, first, start = _messages(args, kwargs)
+                status = "completed"
+                try:
+                    return await call(*args, **kwargs)
+                except Exception:
+                    status = "error"
+                    raise
+                finally:
+                    self._finish_model_call(model_id, start, status, messages, first)
+
+            return instrumented_acall
+
+        def instrumented_call(*args: Any, **kwargs: Any) -> Any:
+            messages, first, start = _messages(args, kwargs)
+            status = "completed"
+            try:
+                return call(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                self._finish_model_call(model_id, start, status, messages, first)
+
+        return instrumented_call
+
+    def _wrap_model_stream(self, call: Callable, model_id: str) -> Callable:
+        def instrumented_stream(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            messages, first, start = _messages(args, kwargs)
+            first_chunk_at, status = None, "completed"
+            try:
+                for chunk in call(*args, **kwargs):
+                    if first_chunk_at is None and _is_text(chunk):
+                        first_chunk_at = time.perf_counter()
+                    yield chunk
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                self._finish_model_call(model_id, start, status, messages, first, first_chunk_at)
+
+        return instrumented_stream
+
+    def _wrap_model_astream(self, call: Callable, model_id: str) -> Callable:
+        async def instrumented_astream(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            messages, first, start = _messages(args, kwargs)
+            first_chunk_at, status = None, "completed"
+            try:
+                async for chunk in call(*args, **kwargs):
+                    if first_chunk_at is None and _is_text(chunk):
+                        first_chunk_at = time.perf_counter()
+                    yield chunk
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                self._finish_model_call(model_id, start, status, messages, first, first_chunk_at)
+
+        return instrumented_astream
+
+    # One call runs the whole tool loop and appends an assistant message per model request and a
+    # tool message per tool call to `messages`; agno times each of them in the message metrics.
+    def _finish_model_call(
+            self,
+            model_id: str,
+            start: float,
+            status: str,
+            messages: Optional[List[Message]],
+            first: int,
+            first_chunk_at: Optional[float] = None,
+    ) -> None:
+        requests = ttfts = 0
+        for message in (messages or [])[first:]:
+            metrics = message.metrics
+            if metrics is None or metrics.duration is None:
+                continue
+            if message.role == "assistant":
+                requests += 1
+                ttfts += metrics.time_to_first_token is not None
+                self._observe_model_request(model_id, "completed", metrics.duration, metrics)
+            elif message.role == "tool":
+                self._observe_tool(message.tool_name or "unknown", bool(message.tool_call_error), metrics.duration)
+        if status == "error" or not requests:
+            # The failed request left no message behind, fall back to the wall time of the call
+            self._observe_model_request(model_id, status, time.perf_counter() - start, None)
+        if not ttfts and first_chunk_at is not None:
+            self.model_ttft.observe(first_chunk_at - start, model=model_id)
+
+    def _observe_model_request(self, model_id: str, status: str, duration: float, metrics: Any) -> None:
+        self.model_duration.observe(duration, model=model_id, status=status)
+        if status == "error":
+            self.errors.inc(kind="model", name=model_id)
+        ttft = metrics.time_to_first_token if metrics is not None else None
+        if ttft is not None:
+            self.model_ttft.observe(ttft, model=model_id)
+        tokens = (
+            ("prompt", metrics.input_tokens if metrics else 0),
+            ("completion", metrics.output_tokens if metrics else 0),
+            ("cached", metrics.cache_read_tokens if metrics else 0),
+        )
+        for kind, count in tokens:
+            if count:
+                self.model_tokens.inc(count, model=model_id, type=kind)
+        self._write(TelemetryRecord(
+            kind="model", name=model_id, status=status, duration=duration, ttft=ttft,
+            input_tokens=tokens[0][1], output_tokens=tokens[1][1], cached_tokens=tokens[2][1],
+        ))
+
+    def _observe_tool(self, name: str, error: bool, duration: float) -> None:
+        status = "error" if error else "completed"
+        self.tool_duration.observe(duration, tool=name, status=status)
+        if error:
+            self.errors.inc(kind="tool", name=name)
+        self._write(TelemetryRecord(kind="tool", name=name, status=status, duration=duration))
+
+    # Storage
+
+    def _wrap_db_call(self, call: Callable, operation: str) -> Callable:
+        def instrumented_db_call(*args: Any, **kwargs: Any) -> Any:
+            start, status = time.perf_counter(), "completed"
+            try:
+                return call(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                self.db_duration.observe(duration, operation=operation, status=status)
+                if status == "error":
+                    self.errors.inc(kind="db", name=operation)
+                self._write(TelemetryRecord(kind="db", name=operation, status=status, duration=duration))
+
+        return instrumented_db_call
+
+    def _write(self, record: TelemetryRecord) -> None:
+        if self.sink is not None:
+            self.sink.write(record)
+
+
+def _is_text(chunk: Any) -> bool:
+    # Tool results are streamed as chunks too, only assistant text counts as the first token
+    return bool(getattr(chunk, "content", None)) and getattr(chunk, "event", None) == ModelResponseEvent.assistant_response.value
+
+
+def _messages(args: Tuple[Any, ...], kwargs: dict) -> Tuple[Optional[List[Message]], int, float]:
+    messages = kwargs.get("messages", args[0] if args else None)
+    return messages, len(messages) if isinstance(messages, list) else 0, time.perf_counter()
+
+
+def add_metrics_route(app: Any, telemetry: Telemetry, path: str = "/metrics") -> None:
+    """
+    Serve `telemetry` in the Prometheus text format on `GET path` of a FastAPI app.
+
+    AgentOS has its own JSON usage metrics route on `/metrics`; requests that accept
+    `application/json` still reach it, scrapers and plain clients get the text format.
+    """
+    from starlette.responses import PlainTextResponse
+
+    async def prometheus_metrics(request: Any, call_next: Callable) -> Any:
+        if (
+                request.method == "GET"
+                and request.url.path == path
+                and "application/json" not in request.headers.get("accept", "")
+        ):
+            return PlainTextResponse(telemetry.render(), media_type="text/plain; version=0.0.4")
+        return await call_next(request)
+
+    app.middleware("http")(prometheus_metrics)
+    log_debug(f"Serving Prometheus metrics on {path}")
+
+
+_default_telemetry: Optional[Telemetry] = None
+_default_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """
+    Return the process-wide telemetry. Records are also written to the SQLite file named
+    by the `TELEMETRY_DB` environment variable when it is set.
+    """
+    global _default_telemetry
+    with _default_telemetry_lock:
+        if _default_telemetry is None:
+            db_file = getenv("TELEMETRY_DB")
+            _default_telemetry = Telemetry(sink=SqliteTelemetrySink(db_file) if db_file else None)
+        return _default_telemetry
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+from agno.agent import Agent
+from fastapi import FastAPI
+
+from benchmarks.stub_server import StubModelServer
+from devkit import admission
+from devkit.admission import AdmissionController, AdmissionRejected, admission_user
+from devkit.clients import ClientProvider, SharedOpenAIChat, get_client_provider
+from devkit.os_app import add_admission_handler
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test suite for the AdmissionController class."""
+
+    def test_global_limit(self):
+        """Test that requests beyond the global limit wait for a released slot."""
+        controller = AdmissionController(max_concurrent=2, max_per_user=None)
+        controller.acquire_sync("a")
+        controller.acquire_sync("b")
+        admitted = threading.Event()
+        thread = threading.Thread(target=lambda: (controller.acquire_sync("c"), admitted.set()))
+        thread.start()
+
+        self.assertFalse(admitted.wait(0.05))
+        self.assertEqual(controller.stats()["queued"], 1)
+        controller.release("a")
+        self.assertTrue(admitted.wait(1))
+        thread.join()
+        self.assertEqual(controller.in_flight, 2)
+
+    def test_per_user_limit_lets_others_through(self):
+        """Test that a user at their limit queues while other users are admitted."""
+        controller = AdmissionController(max_concurrent=4, max_per_user=1, timeout=0.05)
+        controller.acquire_sync("a")
+        controller.acquire_sync("b")
+        with self.assertRaises(AdmissionRejected):
+            controller.acquire_sync("a")
+        self.assertEqual(controller.stats()["in_flight_by_user"], {"a": 1, "b": 1})
+        self.assertEqual(controller.rejected.value(reason="timeout"), 1)
+
+    def test_requests_without_user_only_count_globally(self):
+        """Test that anonymous requests are not held to the per-user limit."""
+        controller = AdmissionController(max_concurrent=3, max_per_user=1, timeout=0)
+        for _ in range(3):
+            controller.acquire_sync(None)
+        self.assertEqual(controller.in_flight, 3)
+
+    def test_fair_queue(self):
+        """Test that freed slots go round-robin across users rather than first come first served."""
+        controller = AdmissionController(max_concurrent=1, max_per_user=None)
+        order = []
+
+        async def request(user):
+            async with controller.slot(user):
+                order.append(user)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await controller.acquire("holder")
+            # The heavy user queues three requests before the light user's one
+            tasks = [asyncio.create_task(request(user)) for user in ("heavy", "heavy", "heavy", "light")]
+            await asyncio.sleep(0.01)
+            controller.release("holder")
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        self.assertEqual(order, ["heavy", "light", "heavy", "heavy"])
+
+    def test_queue_full(self):
+        """Test that a request is rejected at once when the queue is full."""
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        controller.acquire_sync("a")
+        with self.assertRaises(AdmissionRejected):
+            controller.acquire_sync("b")
+        self.assertEqual(controller.rejected.value(reason="queue_full"), 1)
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled request leaves the queue and does not leak a slot."""
+        controller = AdmissionController(max_concurrent=1)
+
+        async def run():
+            await controller.acquire("a")
+            waiter = asyncio.create_task(controller.acquire("b"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            controller.release("a")
+
+        asyncio.run(run())
+        self.assertEqual(controller.stats(), {"in_flight": 0, "queued": 0, "in_flight_by_user": {}, "queued_by_user": {}})
+
+    def test_metrics(self):
+        """Test that in-flight requests, queue depth and wait times are exported."""
+        controller = AdmissionController(max_concurrent=1)
+        with controller.slot_sync("a"):
+            self.assertIn("devkit_admission_in_flight 1", controller.metrics.render())
+        self.assertIn("devkit_admission_in_flight 0", controller.metrics.render())
+        self.assertEqual(controller.wait_time.count(outcome="admitted"), 1)
+
+
+class TestClientProvider(unittest.TestCase):
+    """Test suite for the shared OpenAI client provider."""
+
+    def setUp(self):
+        self.provider = ClientProvider()
+
+    def tearDown(self):
+        self.provider.close()
+
+    def test_one_client_per_configuration(self):
+        """Test that models with the same settings share a client and different settings do not."""
+        client = self.provider.client(api_key="sk-test", base_url="http://a/v1")
+        self.assertIs(client, self.provider.client(api_key="sk-test", base_url="http://a/v1"))
+        self.assertIsNot(client, self.provider.client(api_key="sk-test", base_url="http://b/v1"))
+
+    def test_async_client_per_event_loop(self):
+        """Test that async clients are shared within an event loop and not across loops."""
+        async def get_twice():
+            first = self.provider.async_client(api_key="sk-test")
+            return first, self.provider.async_client(api_key="sk-test")
+
+        first, second = asyncio.run(get_twice())
+        third, _ = asyncio.run(get_twice())
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+
+class TestSharedOpenAIChat(unittest.TestCase):
+    """Test suite for the SharedOpenAIChat model against the stub model server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubModelServer(reply_tokens=5, latency=0.05).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.controller = AdmissionController(max_concurrent=2, max_per_user=1)
+        patcher = patch.object(admission, "_default_controller", self.controller)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build_agent(self):
+        model = SharedOpenAIChat(id="gpt-4.1-mini", base_url=self.server.base_url, api_key="sk-test")
+        return Agent(model=model, telemetry=False)
+
+    def test_agents_share_client(self):
+        """Test that separately built agents reuse one pooled client."""
+        first, second = self.build_agent(), self.build_agent()
+        first.run("hello")
+        second.run("hello")
+        self.assertIs(first.model.get_client(), second.model.get_client())
+        self.assertIs(first.model.get_client(), get_client_provider().client(**second.model._get_client_params()))
+
+    def test_runs_are_admitted(self):
+        """Test that concurrent runs beyond the limits wait their turn, per user and globally."""
+        agent = self.build_agent()
+
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(
+                agent.arun("hello", user_id="a"),
+                agent.arun("hello", user_id="a"),
+                agent.arun("hello", user_id="b"),
+            )
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(run())
+        self.assertEqual(self.controller.wait_time.count(outcome="admitted"), 3)
+        # User a's second request waited for the first: two stub latencies back to back
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertEqual(self.controller.in_flight, 0)
+
+    def test_admission_user_overrides_run_user(self):
+        """Test that admission_user scopes the model calls to the given user."""
+        agent = self.build_agent()
+        self.controller.acquire_sync("chat-session")
+        self.controller.timeout = 0.05
+        with admission_user("chat-session"), self.assertRaises(AdmissionRejected):
+            agent.run("hello", user_id="someone-else")
+        self.controller.release("chat-session")
+
+    def test_rejected_run_is_503(self):
+        """Test that AgentOS routes answer a rejected run with 503 and Retry-After."""
+        app = FastAPI()
+
+        @app.post("/runs")
+        async def run():
+            raise AdmissionRejected("No model capacity within 60s", retry_after=60)
+
+        add_admission_handler(app)
+
+        async def post():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await client.post("/runs")
+
+        response = asyncio.run(post())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "60")
+
+
+if __name__ == "__main__":
+    unittest.main()
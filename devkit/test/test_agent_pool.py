@@ -0,0 +1,54 @@
+import time
+import unittest
+
+from devkit.agent_pool import AgentPool
+
+
+class TestAgentPool(unittest.TestCase):
+    """Test suite for the AgentPool class."""
+
+    def setUp(self):
+        self.pool = AgentPool(idle_timeout=60, debug_mode=False)
+
+    def test_same_session_reuses_agent(self):
+        """Test that a session keeps its agent, and therefore its history, across turns."""
+        agent = self.pool.get("session-1")
+        self.assertIs(agent, self.pool.get("session-1"))
+        self.assertEqual(agent.session_id, "session-1")
+
+    def test_sessions_share_model_tools_and_db(self):
+        """Test that agents of different sessions are built on the shared instances."""
+        first = self.pool.get("session-1")
+        second = self.pool.get("session-2")
+        self.assertIsNot(first, second)
+        self.assertIs(first.model, second.model)
+        for first_toolkit, second_toolkit in zip(first.tools[:-1], second.tools[:-1]):
+            self.assertIs(first_toolkit, second_toolkit)
+        self.assertIs(first.db, second.db)
+
+    def test_sessions_get_their_own_shell(self):
+        """Test that the shell toolkit, unlike the shared ones, is bound to the session."""
+        first = self.pool.get("session-1")
+        second = self.pool.get("session-2")
+        self.assertEqual(first.tools[-1].session_id, "session-1")
+        self.assertEqual(second.tools[-1].session_id, "session-2")
+
+    def test_evict(self):
+        """Test that an evicted session gets a fresh agent."""
+        agent = self.pool.get("session-1")
+        self.pool.evict("session-1")
+        self.assertEqual(len(self.pool), 0)
+        self.assertIsNot(agent, self.pool.get("session-1"))
+
+    def test_evict_idle(self):
+        """Test that idle sessions are dropped while active ones are kept."""
+        self.pool.idle_timeout = 0.05
+        self.pool.get("idle")
+        time.sleep(0.1)
+        self.pool.get("active")
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual(self.pool.evict_idle(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
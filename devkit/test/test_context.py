@@ -0,0 +1,181 @@
+import unittest
+
+from agno.models.message import Message
+from agno.models.openai import OpenAIChat
+from agno.run.agent import RunOutput
+from agno.run.base import RunStatus
+from agno.run.messages import RunMessages
+from agno.session import AgentSession
+
+from benchmarks.stub_server import StubModelServer
+from devkit.context import BudgetedAgent, ContextBudget, HISTORY_SUMMARY_KEY, move_volatile_context, truncate_text
+
+SYSTEM_PROMPT = (
+    "You are DEV-PET\n\n"
+    "<additional_information>\n- The current time is 2026-10-18 09:30:00.\n</additional_information>\n\n"
+    "You have access to memories from previous interactions with the user that you can use:\n\n"
+    "<memories_from_previous_interactions>\n- Prefers Linux\n</memories_from_previous_interactions>\n\n"
+    "Note: this information is from previous interactions and may be updated in this conversation. "
+    "You should always prefer information from this conversation over the past memories.\n"
+    "\n<updating_user_memories>\n- Use the tool\n</updating_user_memories>\n\n"
+    "<session_state>\n{'turn': 3}\n</session_state>"
+)
+
+
+def zeta_tool() -> str:
+    """Return z."""
+    return "z"
+
+
+def alpha_tool() -> str:
+    """Return a."""
+    return "a"
+
+
+class RecordingStubServer(StubModelServer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen = []
+
+    def reply(self, request):
+        self.seen.append(request)
+        return super().reply(request)
+
+
+def make_run(run_id: str, question: str, answer: str) -> RunOutput:
+    return RunOutput(
+        run_id=run_id,
+        status=RunStatus.completed,
+        messages=[Message(role="user", content=question), Message(role="assistant", content=answer)],
+    )
+
+
+def history_of(*runs: RunOutput) -> list:
+    return [Message(role=m.role, content=m.content, from_history=True) for run in runs for m in run.messages]
+
+
+class TestBudgetedAgent(unittest.TestCase):
+    """Test suite for the BudgetedAgent history compaction."""
+
+    def setUp(self):
+        self.agent = BudgetedAgent(
+            name="test", num_history_runs=2, context_budget=ContextBudget(max_history_tokens=200, max_tool_result_tokens=20)
+        )
+        self.runs = [make_run(f"run-{i}", f"question {i}", f"answer {i}") for i in range(4)]
+        self.session = AgentSession(session_id="session", runs=list(self.runs))
+
+    def run_messages(self, history: list) -> RunMessages:
+        system = Message(role="system", content="You are DEV-PET")
+        user = Message(role="user", content="new question")
+        return RunMessages(messages=[system, *history, user], system_message=system, user_message=user)
+
+    def test_older_runs_are_summarized_once(self):
+        """Test that runs outside the history window are folded into a stored summary."""
+        run_messages = self.run_messages(history_of(*self.runs[-2:]))
+        self.agent._compact_history(run_messages, self.session, RunOutput(run_id="current"))
+
+        state = self.session.session_data[HISTORY_SUMMARY_KEY]
+        self.assertEqual(state["run_ids"], ["run-0", "run-1"])
+        self.assertIn("question 0", state["summary"])
+        self.assertIn("answer 1", state["summary"])
+        summary_message = run_messages.messages[1]
+        self.assertEqual(summary_message.role, "system")
+        self.assertTrue(summary_message.from_history)
+        self.assertIn("question 1", summary_message.content)
+        self.assertEqual(run_messages.messages[-1].content, "new question")
+
+        # A second compaction reuses the stored summary instead of rebuilding it.
+        self.agent.summarizer = lambda previous, runs: self.fail("summary should be reused")
+        self.agent._compact_history(self.run_messages(history_of(*self.runs[-2:])), self.session, RunOutput(run_id="current"))
+
+    def test_oversized_tool_results_are_truncated(self):
+        """Test that large tool outputs in history are cut to head and tail."""
+        history = [
+            Message(role="user", content="list files", from_history=True),
+            Message(role="tool", content="x" * 10_000, from_history=True),
+        ]
+        run_messages = self.run_messages(history)
+        self.agent._compact_history(run_messages, AgentSession(session_id="empty"), RunOutput(run_id="current"))
+
+        tool_message = next(m for m in run_messages.messages if m.role == "tool")
+        self.assertLess(len(tool_message.content), 200)
+        self.assertIn("characters truncated", tool_message.content)
+
+    def test_oldest_turns_are_dropped_over_budget(self):
+        """Test that whole turns are dropped, oldest first, when history exceeds the budget."""
+        history = [
+            Message(role="user", content="old " * 300, from_history=True),
+            Message(role="assistant", content="old answer", from_history=True),
+            Message(role="user", content="recent question", from_history=True),
+            Message(role="assistant", content="recent answer", from_history=True),
+        ]
+        run_messages = self.run_messages(history)
+        self.agent._compact_history(run_messages, AgentSession(session_id="empty"), RunOutput(run_id="current"))
+
+        contents = [m.content for m in run_messages.messages]
+        self.assertNotIn("old answer", contents)
+        self.assertIn("recent answer", contents)
+        self.assertIn("old answer", run_messages.messages[1].content)
+
+    def test_truncate_text_keeps_short_text(self):
+        self.assertEqual(truncate_text("short", 10), "short")
+
+
+class TestStablePrefix(unittest.TestCase):
+    """Test suite for the prefix-cache friendly prompt assembly."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = RecordingStubServer(reply_tokens=5, prompt_cache=True, prompt_cache_block=32).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.seen.clear()
+
+    def test_volatile_context_moves_after_history(self):
+        """Test that datetime, memories and session state leave the system prompt for a message before the user's."""
+        system = Message(role="system", content=SYSTEM_PROMPT)
+        user = Message(role="user", content="new question")
+        history = history_of(make_run("run-0", "question", "answer"))
+        run_messages = RunMessages(messages=[system, *history, user], system_message=system, user_message=user)
+
+        move_volatile_context(run_messages)
+
+        self.assertEqual(
+            system.content,
+            "You are DEV-PET\n\n<updating_user_memories>\n- Use the tool\n</updating_user_memories>",
+        )
+        self.assertEqual(run_messages.messages[1:3], history)
+        context = run_messages.messages[3]
+        self.assertEqual(context.role, "system")
+        for part in ("The current time is", "- Prefers Linux", "Note: this information", "{'turn': 3}"):
+            self.assertIn(part, context.content)
+        self.assertIs(run_messages.messages[4], user)
+
+    def test_system_prompt_is_stable_across_runs(self):
+        """Test that the system prompt and tools are sent byte-identical and served from the prompt cache."""
+        agent = BudgetedAgent(
+            model=OpenAIChat(id="gpt-4.1-mini", base_url=self.server.base_url, api_key="sk-test"),
+            description="You are DEV-PET, an assistant for agent developers. " * 4,
+            tools=[zeta_tool, alpha_tool],
+            add_datetime_to_context=True,
+            add_session_state_to_context=True,
+            stable_prefix=True,
+            telemetry=False,
+        )
+        agent.run("first question", session_state={"turn": 1})
+        output = agent.run("second question", session_state={"turn": 2})
+
+        first, second = self.server.seen
+        self.assertEqual(first["messages"][0], second["messages"][0])
+        self.assertNotIn("current time", first["messages"][0]["content"])
+        self.assertEqual([t["function"]["name"] for t in second["tools"]], ["alpha_tool", "zeta_tool"])
+        self.assertIn("'turn': 2", second["messages"][-2]["content"])
+        self.assertGreater(output.metrics.cache_read_tokens, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
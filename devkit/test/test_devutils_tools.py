@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import unittest
+
+from devkit.tools.devutils import DevUtilsTools
+
+
+def make_jwt(payload: dict, secret: str) -> str:
+    def encode(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    signing_input = f"{encode(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())}.{encode(json.dumps(payload).encode())}"
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{encode(signature)}"
+
+
+class TestDevUtilsTools(unittest.TestCase):
+    """Test suite for the DevUtilsTools class."""
+
+    def setUp(self):
+        self.tools = DevUtilsTools()
+
+    def test_registers_tools(self):
+        self.assertEqual(self.tools.name, "devutils_tools")
+        self.assertIn("decode_jwt", self.tools.functions)
+        self.assertIn("fix_json", self.tools.functions)
+
+    def test_generate_random_strings(self):
+        values = json.loads(self.tools.generate_random_strings(length=12, count=5, charset="hex"))
+        self.assertEqual(len(values), 5)
+        self.assertTrue(all(len(v) == 12 and set(v) <= set("0123456789abcdef") for v in values))
+        self.assertIn("Unknown charset", self.tools.generate_random_strings(charset="emoji"))
+
+    def test_decode_jwt_and_verify(self):
+        token = make_jwt({"sub": "42", "exp": 1}, "secret")
+
+        result = json.loads(self.tools.decode_jwt(token, secret="secret"))
+        self.assertEqual(result["payload"]["sub"], "42")
+        self.assertTrue(result["expired"])
+        self.assertEqual(result["signature"], "valid")
+        self.assertEqual(json.loads(self.tools.decode_jwt(token, secret="wrong"))["signature"], "invalid")
+        self.assertIn("Invalid JWT", self.tools.decode_jwt("not-a-token"))
+
+    def test_base64_round_trip(self):
+        self.assertEqual(self.tools.base64_encode("Hello"), "SGVsbG8=")
+        self.assertEqual(self.tools.base64_decode("SGVsbG8"), "Hello")
+        self.assertIn("Invalid base64", self.tools.base64_decode("!!!"))
+
+    def test_base64_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, "data.bin")
+            data = os.urandom(500_000)
+            with open(source, "wb") as f:
+                f.write(data)
+
+            self.assertIn("Encoded 500000 bytes", self.tools.base64_encode_file(source))
+            decoded = os.path.join(tmp_dir, "decoded.bin")
+            self.assertIn("into 500000 bytes", self.tools.base64_decode_file(source + ".b64", decoded))
+            with open(decoded, "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_parse_cron(self):
+        result = json.loads(self.tools.parse_cron("*/15 9-17 * * mon-fri", count=3, start="2026-10-17T08:00:00"))
+        # 2026-10-17 is a Saturday, so the first run is on Monday morning.
+        self.assertEqual(result["next"], ["2026-10-19T09:00:00", "2026-10-19T09:15:00", "2026-10-19T09:30:00"])
+        self.assertEqual(result["fields"]["minute"], "0,15,30,45")
+        self.assertIn("Invalid cron expression", self.tools.parse_cron("* * *"))
+        self.assertIn("Invalid cron expression", self.tools.parse_cron("61 * * * *"))
+
+    def test_fix_json(self):
+        fixed = self.tools.fix_json("// config\n{'name': 'dev', debug: True, 'tags': ['a' 'b',], 'port': 80,")
+        self.assertEqual(json.loads(fixed), {"name": "dev", "debug": True, "tags": ["a", "b"], "port": 80})
+        self.assertEqual(json.loads(self.tools.fix_json('```json\n{"a": [1, 2}\n```')), {"a": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
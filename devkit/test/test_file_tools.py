@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from devkit.tools.files import LargeFileTools
+
+
+class TestLargeFileTools(unittest.TestCase):
+    """Test suite for the LargeFileTools class."""
+
+    def setUp(self):
+        self.base_dir = Path(tempfile.mkdtemp())
+        self.tools = LargeFileTools(base_dir=self.base_dir, index_step=10, max_read_bytes=1000)
+        lines = [f"line {i} INFO ok" if i % 100 else f"line {i} ERROR failed" for i in range(1, 1001)]
+        (self.base_dir / "app.log").write_text("\n".join(lines) + "\n")
+
+    def test_read_lines(self):
+        """Test that a range of lines is returned with line numbers."""
+        self.assertEqual(self.tools.read_lines("app.log", start=25, count=2), "25: line 25 INFO ok\n26: line 26 INFO ok")
+        self.assertEqual(self.tools.read_lines("app.log", start=1000, count=5), "1000: line 1000 ERROR failed")
+        self.assertIn("past the end", self.tools.read_lines("app.log", start=1001))
+
+    def test_read_lines_without_index(self):
+        """Test that ranges are the same when scanning without an index."""
+        tools = LargeFileTools(base_dir=self.base_dir, enable_line_index=False)
+        self.assertEqual(tools.read_lines("app.log", start=537, count=3), self.tools.read_lines("app.log", start=537, count=3))
+
+    def test_head_and_tail(self):
+        """Test head and tail numbering."""
+        self.assertEqual(self.tools.head_file("app.log", lines=1), "1: line 1 INFO ok")
+        self.assertEqual(self.tools.tail_file("app.log", lines=2), "999: line 999 INFO ok\n1000: line 1000 ERROR failed")
+
+    def test_search_returns_windows(self):
+        """Test that only matching lines and their context are returned."""
+        result = self.tools.search_in_file("app.log", "ERROR", context=1)
+        windows = result.split("\n--\n")
+        self.assertEqual(len(windows), 10)
+        self.assertEqual(windows[0], "99: line 99 INFO ok\n100: line 100 ERROR failed\n101: line 101 INFO ok")
+        self.assertEqual(windows[-1], "999: line 999 INFO ok\n1000: line 1000 ERROR failed")
+
+    def test_search_limits_matches(self):
+        """Test that the number of matches is capped."""
+        self.tools.max_matches = 3
+        result = self.tools.search_in_file("app.log", "error", context=0, ignore_case=True)
+        self.assertEqual(result.count("ERROR"), 3)
+        self.assertIn("stopped after 3 matches", result)
+        self.assertIn("invalid regular expression", self.tools.search_in_file("app.log", "("))
+
+    def test_stats_and_large_read(self):
+        """Test that stats are reported and large files are not read whole."""
+        stats = json.loads(self.tools.file_stats("app.log"))
+        self.assertEqual(stats["lines"], 1000)
+        self.assertFalse(stats["binary"])
+        result = self.tools.read_file("app.log")
+        self.assertIn("too large to read whole", result)
+        self.assertNotIn("line 1000", result)
+
+    def test_index_invalidated_on_change(self):
+        """Test that the cached index is rebuilt when the file changes."""
+        self.tools.read_lines("app.log", start=5)
+        path = self.base_dir / "app.log"
+        path.write_text("first\nsecond\n")
+        os.utime(path, ns=(0, 1))
+        self.assertEqual(self.tools.read_lines("app.log", start=2), "2: second")
+        self.assertEqual(json.loads(self.tools.file_stats("app.log"))["lines"], 2)
+
+    def test_empty_file(self):
+        """Test that empty files are handled."""
+        (self.base_dir / "empty.txt").write_text("")
+        self.assertEqual(self.tools.read_lines("empty.txt"), "(empty file)")
+        self.assertEqual(self.tools.search_in_file("empty.txt", "x"), "No matches")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from devkit.tools.finance import MarketDataTools, price_metrics
+
+
+def download_frame(symbols, period, interval):
+    days = pd.date_range("2024-01-01", periods=260, freq="B", tz="UTC")
+    columns = pd.MultiIndex.from_product([["Close", "Volume"], symbols], names=["Price", "Ticker"])
+    frame = pd.DataFrame(index=days, columns=columns, dtype=float)
+    for i, symbol in enumerate(symbols):
+        frame[("Close", symbol)] = np.linspace(100, 200 + i * 100, len(days))
+        frame[("Volume", symbol)] = 1_000_000.0
+    return frame
+
+
+INFO = {
+    "AAPL": {"shortName": "Apple", "marketCap": 3e12, "trailingPE": 30.0, "profitMargins": 0.25},
+    "MSFT": {"shortName": "Microsoft", "marketCap": 2.5e12, "trailingPE": 20.0, "profitMargins": 0.35},
+    "NFLX": {"shortName": "Netflix", "marketCap": 2e11, "trailingPE": 40.0},
+}
+
+
+class TestMarketDataTools(unittest.TestCase):
+    """Test suite for the MarketDataTools class."""
+
+    def setUp(self):
+        self.tools = MarketDataTools(cache_file=None)
+        download = patch.object(MarketDataTools, "_download", side_effect=download_frame)
+        info = patch.object(MarketDataTools, "_fetch_info", side_effect=lambda s: INFO[s])
+        self.download = download.start()
+        self.info = info.start()
+        self.addCleanup(download.stop)
+        self.addCleanup(info.stop)
+
+    def test_quotes_are_fetched_in_one_request(self):
+        """Test that several tickers are downloaded together and rendered as one table."""
+        result = self.tools.get_quotes(["aapl", "MSFT", "AAPL"])
+        self.download.assert_called_once()
+        self.assertEqual(self.download.call_args[0][0], ["AAPL", "MSFT"])
+        lines = result.splitlines()
+        self.assertEqual(lines[0], "| Symbol | Price | Change | Change % | Volume |")
+        self.assertTrue(lines[2].startswith("| AAPL | 200.00 |"))
+        self.assertTrue(lines[3].startswith("| MSFT | 300.00 |"))
+
+    def test_only_uncached_tickers_are_downloaded(self):
+        """Test that cached tickers are served from the cache."""
+        self.tools.get_quotes(["AAPL"])
+        self.tools.get_quotes(["AAPL", "MSFT"])
+        self.assertEqual(self.download.call_args_list[1][0][0], ["MSFT"])
+        self.tools.get_quotes(["MSFT", "AAPL"])
+        self.assertEqual(self.download.call_count, 2)
+
+    def test_fundamentals_compare_pe_to_median(self):
+        """Test the fundamentals table and the P/E comparison to the group median."""
+        result = self.tools.get_fundamentals(["AAPL", "MSFT", "NFLX"])
+        rows = {line.split(" | ")[0].strip("| "): line for line in result.splitlines()[2:]}
+        self.assertIn("| 3.00T |", rows["AAPL"])
+        self.assertTrue(rows["AAPL"].endswith("| +0.0% |"))
+        self.assertTrue(rows["MSFT"].endswith("| -33.3% |"))
+        self.assertIn("n/a", rows["NFLX"])
+        self.tools.get_fundamentals(["AAPL"])
+        self.assertEqual(self.info.call_count, 3)
+
+    def test_price_metrics(self):
+        """Test the vectorized metrics on a known series."""
+        days = pd.date_range("2024-01-01", periods=3, freq="B")
+        close = pd.DataFrame({"UP": [100.0, 110.0, 121.0], "DIP": [100.0, 50.0, 75.0]}, index=days)
+        metrics = price_metrics(close)
+        self.assertAlmostEqual(metrics.loc["UP", "Return"], 0.21)
+        self.assertAlmostEqual(metrics.loc["DIP", "Max Drawdown"], -0.5)
+        self.assertTrue(np.isnan(metrics.loc["UP", "SMA50"]))
+        table = self.tools.get_price_metrics(["AAPL"])
+        self.assertIn("+100.0%", table)
+
+    def test_errors_are_returned(self):
+        self.assertEqual(self.tools.get_quotes([]), "Error getting quotes: no ticker symbols given")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import tempfile
+import time
+import unittest
+
+import httpx
+
+from devkit.utils.image_cache import ImageCache, ImageTooLarge
+
+IMAGES = {
+    "/a.jpg": b"a" * 100,
+    "/b.jpg": b"b" * 100,
+    "/c.jpg": b"c" * 100,
+    "/copy-of-a.jpg": b"a" * 100,
+    "/huge.jpg": b"h" * 1000,
+}
+
+
+class TestImageCache(unittest.TestCase):
+    """Test suite for the content-addressed ImageCache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.requests = []
+        self.cache = ImageCache(self.tmp_dir.name, max_bytes=250, max_file_bytes=500)
+        self.cache._client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        self.cache._async_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+    def tearDown(self):
+        asyncio.run(self.cache.aclose())
+        self.tmp_dir.cleanup()
+
+    def handler(self, request):
+        self.requests.append(request.url.path)
+        content = IMAGES.get(request.url.path)
+        if content is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=content, headers={"content-type": "image/jpeg"})
+
+    def test_fetch_downloads_once(self):
+        """Test that a cached URL is served from disk without a second download."""
+        path = self.cache.fetch("https://images.test/a.jpg")
+
+        self.assertEqual(path.read_bytes(), IMAGES["/a.jpg"])
+        self.assertEqual(path.name, hashlib.sha256(IMAGES["/a.jpg"]).hexdigest() + ".jpg")
+        self.assertEqual(self.cache.fetch("https://images.test/a.jpg"), path)
+        self.assertEqual(self.requests, ["/a.jpg"])
+
+    def test_same_content_is_stored_once(self):
+        """Test that two URLs with identical bytes share one file."""
+        first = self.cache.fetch("https://images.test/a.jpg")
+        second = self.cache.fetch("https://images.test/copy-of-a.jpg")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.size(), 100)
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused file is evicted once the size cap is exceeded."""
+        a = self.cache.fetch("https://images.test/a.jpg")
+        self.cache.fetch("https://images.test/b.jpg")
+        time.sleep(0.01)
+        self.cache.fetch("https://images.test/a.jpg")
+        self.cache.fetch("https://images.test/c.jpg")
+
+        self.assertLessEqual(self.cache.size(), 250)
+        self.assertTrue(a.exists())
+        self.assertIsNone(self.cache.get("https://images.test/b.jpg"))
+
+    def test_rejects_large_file(self):
+        """Test that a download above the file size cap is aborted and leaves nothing behind."""
+        with self.assertRaises(ImageTooLarge):
+            self.cache.fetch("https://images.test/huge.jpg")
+        self.assertEqual(self.cache.size(), 0)
+        self.assertEqual([p.name for p in self.cache.directory.glob("*.part")], [])
+
+    def test_http_error(self):
+        """Test that a failed download raises and is not cached."""
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.cache.fetch("https://images.test/missing.jpg")
+        self.assertIsNone(self.cache.get("https://images.test/missing.jpg"))
+
+    def test_afetch_shares_concurrent_downloads(self):
+        """Test that concurrent async fetches of one URL download it once."""
+        async def run():
+            return await asyncio.gather(*(self.cache.afetch("https://images.test/b.jpg") for _ in range(5)))
+
+        paths = asyncio.run(run())
+
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(self.requests, ["/b.jpg"])
+
+    def test_concurrent_fetches_share_one_download(self):
+        """Test that threads fetching one URL download it once and leave no per-URL lock behind."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            paths = list(pool.map(self.cache.fetch, ["https://images.test/a.jpg"] * 16))
+
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(self.requests, ["/a.jpg"])
+        self.assertEqual(self.cache._url_locks, {})
+
+    def test_survives_restart(self):
+        """Test that the index is persisted next to the files."""
+        path = self.cache.fetch("https://images.test/a.jpg")
+        self.cache.close()
+        cache = ImageCache(self.tmp_dir.name)
+        try:
+            self.assertEqual(cache.get("https://images.test/a.jpg"), path)
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
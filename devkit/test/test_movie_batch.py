@@ -0,0 +1,155 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from agno.models.openai import OpenAIChat
+
+from benchmarks.stub_server import StubModelServer
+from devkit.movie_batch import JSON_MODE, STRUCTURED, MovieBatchRunner, PromptRecord, read_checkpoint, read_prompts
+
+SCRIPT = {
+    "setting": "A rooftop in New York",
+    "ending": "They dance at dawn.",
+    "genre": "romantic comedy",
+    "name": "Skyline",
+    "characters": ["Ana", "Ben"],
+    "storyline": "Two rivals share a roof. They fall in love. The city cheers.",
+}
+
+
+class MovieStubServer(StubModelServer):
+    """Replies with a MovieScript; `[invalid]` prompts only get one in JSON mode, `[broken]` never."""
+
+    def reply(self, request):
+        super().reply(request)
+        prompt = request["messages"][-1]["content"]
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        if "[broken]" in prompt or ("[invalid]" in prompt and not json_mode):
+            return "Once upon a time", []
+        return json.dumps(SCRIPT), []
+
+
+class TestReadPrompts(unittest.TestCase):
+    """Test suite for reading prompt and checkpoint files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_jsonl(self):
+        """Test that JSONL strings and objects are read, with line numbers as default ids."""
+        path = self.dir / "prompts.jsonl"
+        path.write_text('"New York"\n\n{"id": "p2", "prompt": "Paris"}\n{"prompt": "Tokyo"}\n')
+        self.assertEqual(list(read_prompts(path)), [
+            PromptRecord(id="1", prompt="New York"),
+            PromptRecord(id="p2", prompt="Paris"),
+            PromptRecord(id="4", prompt="Tokyo"),
+        ])
+
+    def test_jsonl_skips_other_values(self):
+        """Test that JSONL values that are neither strings nor objects are skipped."""
+        path = self.dir / "prompts.jsonl"
+        path.write_text('42\n["Paris"]\nnull\n"Tokyo"\n')
+        self.assertEqual(list(read_prompts(path)), [PromptRecord(id="4", prompt="Tokyo")])
+
+    def test_csv(self):
+        """Test that CSV rows are read by column name."""
+        path = self.dir / "prompts.csv"
+        path.write_text("id,prompt\na,New York\n,Paris\n")
+        self.assertEqual(list(read_prompts(path)), [PromptRecord(id="a", prompt="New York"), PromptRecord(id="2", prompt="Paris")])
+
+    def test_checkpoint_ignores_truncated_line(self):
+        """Test that a half written last line does not count as done."""
+        path = self.dir / "scripts.jsonl"
+        path.write_text('{"id": "1", "script": {}}\n{"id": "2", "scr')
+        self.assertEqual(read_checkpoint(path), {"1"})
+
+
+class TestMovieBatchRunner(unittest.TestCase):
+    """Test suite for the MovieBatchRunner class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MovieStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = Path(self.tmp.name) / "out" / "scripts.jsonl"
+        self.errors = Path(self.tmp.name) / "out" / "scripts.errors.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_batch(self, prompts, **kwargs):
+        runner = MovieBatchRunner(
+            model=OpenAIChat(id="gpt-4.1-mini", base_url=self.server.base_url, api_key="sk-test"),
+            concurrency=4,
+            retry_delay=0,
+            progress_interval=0,
+            **kwargs,
+        )
+        records = [PromptRecord(id=str(i), prompt=p) for i, p in enumerate(prompts)]
+        return asyncio.run(runner.run(records, self.output, errors_path=self.errors))
+
+    def read(self, path):
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_generates_scripts(self):
+        """Test that every prompt gets a validated script written as it completes."""
+        report = self.run_batch([f"City {i}" for i in range(10)])
+
+        self.assertEqual(report.completed, 10)
+        self.assertEqual(report.failed, 0)
+        self.assertGreater(report.scripts_per_second, 0)
+        rows = self.read(self.output)
+        self.assertEqual(sorted(int(row["id"]) for row in rows), list(range(10)))
+        self.assertEqual(rows[0]["script"], SCRIPT)
+        self.assertEqual(rows[0]["mode"], STRUCTURED)
+
+    def test_falls_back_to_json_mode(self):
+        """Test that an invalid structured reply is retried and the last attempt uses JSON mode."""
+        report = self.run_batch(["[invalid] New York"], max_attempts=2)
+
+        self.assertEqual(report.completed, 1)
+        self.assertEqual(report.attempts, 2)
+        row = self.read(self.output)[0]
+        self.assertEqual((row["mode"], row["attempts"]), (JSON_MODE, 2))
+
+    def test_records_failures(self):
+        """Test that a prompt failing every attempt goes to the errors file."""
+        report = self.run_batch(["[broken] New York", "Paris"], max_attempts=2)
+
+        self.assertEqual((report.completed, report.failed), (1, 1))
+        self.assertEqual(report.failed_ids, ["0"])
+        self.assertEqual(self.read(self.errors)[0]["id"], "0")
+
+    def test_worker_failure_stops_batch(self):
+        """Test that a worker dying outside generation fails the batch instead of hanging it."""
+        def broken_factory(model):
+            raise RuntimeError("cannot build agent")
+
+        with self.assertRaises(RuntimeError):
+            self.run_batch([f"City {i}" for i in range(20)], structured_factory=broken_factory)
+
+    def test_resume(self):
+        """Test that a second run skips the prompts already in the output."""
+        self.run_batch(["New York", "Paris"])
+        requests = self.server.requests
+        report = self.run_batch(["New York", "Paris", "Tokyo"])
+
+        self.assertEqual((report.completed, report.skipped), (1, 2))
+        self.assertEqual(self.server.requests - requests, 1)
+        self.assertEqual(len(self.read(self.output)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import unittest
+
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from agno.run.agent import RunContentEvent, RunOutput
+from agno.run.base import RunStatus
+from agno.run.team import TeamRunOutput
+from agno.session import TeamSession
+
+from devkit.parallel_team import MEMBER_TIMINGS_KEY, ParallelTeam
+
+
+def stub_member(name, delay):
+    agent = Agent(name=name, model=OpenAIChat(id="gpt-4.1-mini"))
+
+    async def arun(**kwargs):
+        yield RunContentEvent(content=f"{name} partial")
+        await asyncio.sleep(delay)
+        yield RunOutput(agent_name=name, content=f"{name} done", status=RunStatus.completed)
+
+    agent.arun = arun
+    return agent
+
+
+class TestParallelTeam(unittest.TestCase):
+    """Test suite for the ParallelTeam class."""
+
+    def setUp(self):
+        self.fast = stub_member("Fast Agent", 0.2)
+        self.slow = stub_member("Slow Agent", 0.2)
+        self.team = ParallelTeam(
+            name="team",
+            model=OpenAIChat(id="gpt-4.1-mini"),
+            members=[self.fast, self.slow],
+            member_timeout=5,
+        )
+        self.run_response = TeamRunOutput(run_id="run-1")
+        self.session = TeamSession(session_id="session-1")
+
+    def delegate(self, async_mode=True):
+        return self.team._get_delegate_task_function(
+            run_response=self.run_response,
+            session=self.session,
+            session_state={},
+            team_run_context={},
+            async_mode=async_mode,
+        )
+
+    def test_members_run_concurrently(self):
+        """Test that delegations of one turn overlap instead of running back to back."""
+        delegate = self.delegate().entrypoint
+
+        async def fan_out():
+            return await asyncio.gather(
+                delegate(member_id="fast-agent", task_description="a"),
+                delegate(member_id="slow-agent", task_description="b"),
+            )
+
+        start = time.perf_counter()
+        results = asyncio.run(fan_out())
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(results, ["Agent Fast Agent: Fast Agent done", "Agent Slow Agent: Slow Agent done"])
+        self.assertEqual(len(self.run_response.member_responses), 2)
+        timings = self.run_response.metadata[MEMBER_TIMINGS_KEY]
+        self.assertEqual([t["status"] for t in timings], ["completed", "completed"])
+
+    def test_timeout_returns_partial_result(self):
+        """Test that a member over its timeout returns what it produced so far."""
+        self.team.member_timeouts = {"Slow Agent": 0.05}
+        delegate = self.delegate().entrypoint
+        result = asyncio.run(delegate(member_id="slow-agent", task_description="b"))
+        self.assertEqual(result, "Agent Slow Agent did not finish within 0.05s. Partial result:\nSlow Agent partial")
+        self.assertEqual(self.run_response.metadata[MEMBER_TIMINGS_KEY][0]["status"], "timeout")
+        self.assertEqual(self.run_response.member_responses, [])
+
+    def test_sync_mode_keeps_default_delegation(self):
+        """Test that synchronous runs use the stock delegation tool."""
+        self.assertFalse(asyncio.iscoroutinefunction(self.delegate(async_mode=False).entrypoint))
+        self.assertTrue(asyncio.iscoroutinefunction(self.delegate().entrypoint))
+
+    def test_instructions_mention_parallel_delegation(self):
+        self.assertIn("parallel", self.team.instructions[-1])
+
+    def test_stable_prefix_moves_datetime_out_of_system_prompt(self):
+        """Test that with a stable prefix the leader's current time follows the system prompt."""
+        self.team.add_datetime_to_context = True
+        self.team.stable_prefix = True
+        run_messages = self.team._get_run_messages(
+            run_response=self.run_response, session=self.session, input_message="compare AAPL and MSFT"
+        )
+        self.assertNotIn("The current time is", run_messages.system_message.content)
+        self.assertIn("The current time is", run_messages.messages[-2].content)
+        self.assertIs(run_messages.messages[-1], run_messages.user_message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,52 @@
 #%%
+import asyncio
 import os
+import tempfile
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 import httpx
 
 from agno.agent import Agent
-from agno.media import ImageArtifact
-from pexels import PexelsTools
+from agno.media import Image
+from agno.tools.function import ToolResult
+from devkit.tools.pexels import PexelsTools, PEXELS_SEARCH_URL, select_variant
+
+PHOTOS_RESPONSE = {
+    "photos": [
+        {
+            "id": "photo1",
+            "src": {
+                "original": "https://example.com/photo1.jpg"
+            },
+            "alt": "Photo 1 description"
+        },
+        {
+            "id": "photo2",
+            "src": {
+                "original": "https://example.com/photo2.jpg"
+            },
+            "alt": "Photo 2 description"
+        }
+    ]
+}
+
+
+SIZED_PHOTO = {
+    "id": "photo3",
+    "width": 6000,
+    "height": 4000,
+    "src": {
+        "original": "https://example.com/photo3.jpg",
+        "large2x": "https://example.com/photo3.jpg?w=940&h=650&dpr=2",
+        "large": "https://example.com/photo3.jpg?w=940&h=650",
+        "medium": "https://example.com/photo3.jpg?h=350",
+        "small": "https://example.com/photo3.jpg?h=130",
+        "tiny": "https://example.com/photo3.jpg?w=280&h=200&fit=crop",
+    },
+    "alt": "Photo 3 description",
+}
 
 
 class TestPexelsTools(unittest.TestCase):
@@ -18,87 +57,83 @@ class TestPexelsTools(unittest.TestCase):
         # Create a mock API key for testing
         self.test_api_key = "test_api_key"
         # Create an instance of the toolkit with the test API key
-        self.pexels_tools = PexelsTools(api_key=self.test_api_key, limit=2)
+        self.pexels_tools = PexelsTools(api_key=self.test_api_key, http2=False)
         # Create a mock agent for testing
         self.mock_agent = MagicMock(spec=Agent)
 
+    def tearDown(self):
+        self.pexels_tools.close()
+
     def test_init_with_api_key(self):
         """Test that the toolkit initializes correctly with an API key."""
         self.assertEqual(self.pexels_tools.api_key, self.test_api_key)
-        self.assertEqual(self.pexels_tools.limit, 2)
         self.assertEqual(self.pexels_tools.name, "pexels_tools")
+        self.assertIn("search_photos", self.pexels_tools.functions)
 
     @patch.dict(os.environ, {"PEXELS_API_KEY": "env_api_key"})
     def test_init_with_env_variable(self):
         """Test that the toolkit initializes correctly with an environment variable."""
         pexels_tools = PexelsTools()
         self.assertEqual(pexels_tools.api_key, "env_api_key")
-        self.assertEqual(pexels_tools.limit, 3)  # Default value
 
-    @patch("httpx.get")
+    def test_async_mode_registers_coroutine(self):
+        """Test that async mode exposes asearch_photos under the search_photos tool name."""
+        pexels_tools = PexelsTools(api_key=self.test_api_key, async_mode=True, http2=False)
+        function = pexels_tools.functions["search_photos"]
+        self.assertTrue(asyncio.iscoroutinefunction(function.entrypoint))
+
+    def test_client_is_reused(self):
+        """Test that the pooled client is created once and recreated after close."""
+        client = self.pexels_tools.client
+        self.assertIs(client, self.pexels_tools.client)
+        self.assertEqual(client.headers["Authorization"], self.test_api_key)
+        self.pexels_tools.close()
+        self.assertIsNot(client, self.pexels_tools.client)
+
+    def test_concurrent_first_use_creates_one_client(self):
+        """Test that threads racing on the first request share a single pooled client."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: self.pexels_tools.client, range(32)))
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+    @patch.object(httpx.Client, "get")
     def test_search_photos_success(self, mock_get):
         """Test the search_photos method with a successful API response."""
         # Mock the response from the Pexels API
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
-            "photos": [
-                {
-                    "id": "photo1",
-                    "src": {
-                        "original": "https://example.com/photo1.jpg"
-                    },
-                    "alt": "Photo 1 description"
-                },
-                {
-                    "id": "photo2",
-                    "src": {
-                        "original": "https://example.com/photo2.jpg"
-                    },
-                    "alt": "Photo 2 description"
-                }
-            ]
-        }
+        mock_response.json.return_value = PHOTOS_RESPONSE
         mock_get.return_value = mock_response
 
         # Call the method
-        result = self.pexels_tools.search_photos(self.mock_agent, "nature")
+        result = self.pexels_tools.search_photos(self.mock_agent, "nature", max_results=2)
 
         # Verify the API was called with the correct parameters
         mock_get.assert_called_once_with(
-            "https://api.pexels.com/v1/search",
-            params={"q": "nature", "per_page": 2},
-            headers={"Authorization": self.test_api_key}
+            PEXELS_SEARCH_URL,
+            params={"query": "nature", "orientation": "landscape", "per_page": 2},
         )
 
-        # Verify the agent's add_image method was called with the correct parameters
-        self.assertEqual(self.mock_agent.add_image.call_count, 2)
-
-        # Get the first call arguments
-        args1, kwargs1 = self.mock_agent.add_image.call_args_list[0]
-        # Verify the first image was added correctly
-        self.assertIsInstance(args1[0], ImageArtifact)
-        self.assertEqual(args1[0].url, "https://example.com/photo1.jpg")
-        self.assertEqual(args1[0].alt_text, "Photo 1 description")
-        self.assertEqual(args1[0].revised_prompt, "nature")
-
-        # Get the second call arguments
-        args2, kwargs2 = self.mock_agent.add_image.call_args_list[1]
-        # Verify the second image was added correctly
-        self.assertIsInstance(args2[0], ImageArtifact)
-        self.assertEqual(args2[0].url, "https://example.com/photo2.jpg")
-        self.assertEqual(args2[0].alt_text, "Photo 2 description")
-        self.assertEqual(args2[0].revised_prompt, "nature")
+        # Verify the images were returned as artifacts
+        self.assertIsInstance(result, ToolResult)
+        self.assertEqual(len(result.images), 2)
+        self.assertIsInstance(result.images[0], Image)
+        self.assertEqual(result.images[0].url, "https://example.com/photo1.jpg")
+        self.assertEqual(result.images[0].alt_text, "Photo 1 description")
+        self.assertEqual(result.images[0].revised_prompt, "nature")
+        self.assertEqual(result.images[1].url, "https://example.com/photo2.jpg")
 
         # Verify the result contains the expected URLs
-        self.assertIn("https://example.com/photo1.jpg", result)
-        self.assertIn("https://example.com/photo2.jpg", result)
+        self.assertIn("https://example.com/photo1.jpg", result.content)
+        self.assertIn("https://example.com/photo2.jpg", result.content)
 
-    @patch("httpx.get")
+    @patch.object(httpx.Client, "get")
     def test_search_photos_http_error(self, mock_get):
         """Test the search_photos method with an HTTP error from the API."""
         # Mock an HTTP error response
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             "Error", request=MagicMock(), response=MagicMock(status_code=401, text="Unauthorized")
         )
@@ -107,13 +142,11 @@ class TestPexelsTools(unittest.TestCase):
         # Call the method
         result = self.pexels_tools.search_photos(self.mock_agent, "nature")
 
-        # Verify the result is the default error message
-        self.assertEqual(result, "No photo found")
-
-        # Verify add_image was never called
-        self.mock_agent.add_image.assert_not_called()
+        # Verify the status code is reported
+        self.assertEqual(result.content, "HTTP error occurred: 401")
+        self.assertIsNone(result.images)
 
-    @patch("httpx.get")
+    @patch.object(httpx.Client, "get")
     def test_search_photos_general_exception(self, mock_get):
         """Test the search_photos method with a general exception."""
         # Mock a general exception
@@ -122,17 +155,15 @@ class TestPexelsTools(unittest.TestCase):
         # Call the method
         result = self.pexels_tools.search_photos(self.mock_agent, "nature")
 
-        # Verify the result is the default error message
-        self.assertEqual(result, "No photo found")
+        # Verify the error is reported
+        self.assertEqual(result.content, "An error occurred: General error")
+        self.assertIsNone(result.images)
 
-        # Verify add_image was never called
-        self.mock_agent.add_image.assert_not_called()
-
-    @patch("httpx.get")
+    @patch.object(httpx.Client, "get")
     def test_search_photos_empty_response(self, mock_get):
         """Test the search_photos method with an empty response."""
         # Mock an empty response
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {"photos": []}
         mock_get.return_value = mock_response
@@ -140,12 +171,186 @@ class TestPexelsTools(unittest.TestCase):
         # Call the method
         result = self.pexels_tools.search_photos(self.mock_agent, "nonexistent_query")
 
-        # Verify the result contains the empty list
-        self.assertEqual(result, "These are the found photos []")
+        # Verify the result is the default message
+        self.assertEqual(result.content, "No photo found")
+        self.assertIsNone(result.images)
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_cache_hit(self, mock_get):
+        """Test that a normalized repeat search is served from the cache."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = PHOTOS_RESPONSE
+        mock_get.return_value = mock_response
+
+        first = self.pexels_tools.search_photos(self.mock_agent, "Nature", max_results=2)
+        second = self.pexels_tools.search_photos(self.mock_agent, "  nature ", max_results=2, orientation="LANDSCAPE")
+
+        mock_get.assert_called_once()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual([image.url for image in second.images], [image.url for image in first.images])
+        self.assertEqual(second.images[0].revised_prompt, "  nature ")
+        self.assertEqual(self.pexels_tools.search_cache.stats()["hits"], 1)
+        self.assertEqual(self.pexels_tools.search_cache.stats()["misses"], 1)
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_errors_are_not_cached(self, mock_get):
+        """Test that failed searches are retried instead of being cached."""
+        mock_get.side_effect = Exception("General error")
+
+        self.pexels_tools.search_photos(self.mock_agent, "nature")
+        self.pexels_tools.search_photos(self.mock_agent, "nature")
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(httpx.Client, "get")
+    def test_search_cache_survives_restart(self, mock_get):
+        """Test that the SQLite backing store serves a fresh toolkit instance."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = PHOTOS_RESPONSE
+        mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, "pexels.db")
+            first = PexelsTools(api_key=self.test_api_key, http2=False, search_cache_file=cache_file)
+            first.search_photos(self.mock_agent, "nature")
+            first.close()
+
+            second = PexelsTools(api_key=self.test_api_key, http2=False, search_cache_file=cache_file)
+            result = second.search_photos(self.mock_agent, "nature")
+            second.close()
+
+        mock_get.assert_called_once()
+        self.assertEqual(len(result.images), 2)
+
+    @patch("devkit.tools.pexels.time.sleep")
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_retries_rate_limited_request(self, mock_get, mock_sleep):
+        """Test that a 429 is retried with backoff before the photos are returned."""
+        request = httpx.Request("GET", PEXELS_SEARCH_URL)
+        mock_get.side_effect = [
+            httpx.Response(429, request=request),
+            httpx.Response(200, json=PHOTOS_RESPONSE, request=request, headers={"X-Ratelimit-Remaining": "150"}),
+        ]
+
+        result = self.pexels_tools.search_photos(self.mock_agent, "nature")
+
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_called_once()
+        self.assertEqual(len(result.images), 2)
+        self.assertLessEqual(self.pexels_tools.rate_limiter.tokens, 150)
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_fails_fast_when_quota_exhausted(self, mock_get):
+        """Test that an exhausted quota is reported instead of being retried."""
+        request = httpx.Request("GET", PEXELS_SEARCH_URL)
+        reset_at = str(int(time.time()) + 3600)
+        mock_get.return_value = httpx.Response(
+            200, json={"photos": []}, request=request,
+            headers={"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": reset_at},
+        )
+
+        self.pexels_tools.search_photos(self.mock_agent, "nature")
+        result = self.pexels_tools.search_photos(self.mock_agent, "city")
+
+        mock_get.assert_called_once()
+        self.assertIn("Rate limit exhausted", result.content)
+        self.assertIn("Do not retry", result.content)
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_batch_merges_results(self, mock_get):
+        """Test that a batch search returns one result covering every unique query."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = PHOTOS_RESPONSE
+        mock_get.return_value = mock_response
+
+        result = self.pexels_tools.search_photos_batch(self.mock_agent, ["sunset", "office team", "Sunset "])
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn("sunset: Found 2 Photo(s)", result.content)
+        self.assertIn("office team: Found 2 Photo(s)", result.content)
+        # Both queries return the same photos, which are deduplicated by id.
+        self.assertEqual(len(result.images), 2)
+
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_asearch_photos_success(self, mock_get):
+        """Test the asearch_photos method with a successful API response."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = PHOTOS_RESPONSE
+        mock_get.return_value = mock_response
+
+        async def run():
+            try:
+                return await self.pexels_tools.asearch_photos(self.mock_agent, "nature", color="blue")
+            finally:
+                await self.pexels_tools.aclose()
+
+        result = asyncio.run(run())
+
+        mock_get.assert_awaited_once_with(
+            PEXELS_SEARCH_URL,
+            params={"query": "nature", "orientation": "landscape", "per_page": 3, "color": "blue"},
+        )
+        self.assertEqual(len(result.images), 2)
+
+    def test_select_variant(self):
+        """Test that the smallest variant covering the requested dimension is chosen."""
+        src = SIZED_PHOTO["src"]
+        self.assertEqual(select_variant(SIZED_PHOTO, None), src["original"])
+        self.assertEqual(select_variant(SIZED_PHOTO, 200), src["tiny"])
+        self.assertEqual(select_variant(SIZED_PHOTO, 500), src["medium"])  # 525x350
+        self.assertEqual(select_variant(SIZED_PHOTO, 900), src["large"])  # 940x627
+        self.assertEqual(select_variant(SIZED_PHOTO, 1280), src["large2x"])
+        self.assertEqual(select_variant(SIZED_PHOTO, 4000), src["original"])
+        self.assertEqual(select_variant({"src": {"original": "o", "medium": "m"}}, 300), "m")
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_uses_max_dimension(self, mock_get):
+        """Test that search results link the variant sized for the requested dimension."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"photos": [SIZED_PHOTO]}
+        mock_get.return_value = mock_response
+
+        result = self.pexels_tools.search_photos(self.mock_agent, "nature", max_dimension=300)
+        self.assertEqual(result.images[0].url, SIZED_PHOTO["src"]["medium"])
+        # The cached search keeps every variant, so another size needs no new request
+        result = self.pexels_tools.search_photos(self.mock_agent, "nature")
+        self.assertEqual(result.images[0].url, SIZED_PHOTO["src"]["large2x"])
+        mock_get.assert_called_once()
+
+    @patch.object(httpx.Client, "get")
+    def test_search_photos_caches_images_locally(self, mock_get):
+        """Test that with an image cache the artifacts point at downloaded local files."""
+        mock_response = MagicMock(headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = PHOTOS_RESPONSE
+        mock_get.return_value = mock_response
+
+        def image_handler(request):
+            if request.url.path == "/photo2.jpg":
+                return httpx.Response(404)
+            return httpx.Response(200, content=b"jpeg bytes")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pexels_tools = PexelsTools(api_key=self.test_api_key, http2=False, image_cache_dir=tmp_dir)
+            pexels_tools.image_cache._client = httpx.Client(transport=httpx.MockTransport(image_handler))
+            try:
+                result = pexels_tools.search_photos(self.mock_agent, "nature", max_results=2)
+            finally:
+                pexels_tools.close()
 
-        # Verify add_image was never called
-        self.mock_agent.add_image.assert_not_called()
+            self.assertIsNone(result.images[0].url)
+            self.assertTrue(str(result.images[0].filepath).startswith(tmp_dir))
+            self.assertEqual(result.images[0].get_content_bytes(), b"jpeg bytes")
+            self.assertEqual(result.images[0].alt_text, "Photo 1 description")
+            # A failed download keeps the remote URL
+            self.assertEqual(result.images[1].url, "https://example.com/photo2.jpg")
+            self.assertIn("https://example.com/photo1.jpg", result.content)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
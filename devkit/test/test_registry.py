@@ -0,0 +1,212 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import httpx
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+
+from devkit.os_app import LazyAgentOS
+from devkit.registry import TEAM, AgentRegistry
+from devkit.utils.startup import parse_importtime
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def build_agent() -> Agent:
+    return Agent(name="Echo", model=OpenAIChat(id="gpt-4.1-mini", api_key="sk-test"), telemetry=False)
+
+
+class TestAgentRegistry(unittest.TestCase):
+    """Test suite for the AgentRegistry class."""
+
+    def test_builds_on_first_get(self):
+        """Test that a factory runs on the first get only and the id is assigned."""
+        calls = []
+        registry = AgentRegistry()
+
+        @registry.agent("echo")
+        def factory():
+            calls.append(1)
+            return build_agent()
+
+        self.assertEqual(calls, [])
+        self.assertFalse(registry.is_built("echo"))
+        agent = registry.get("echo")
+        self.assertIs(registry.get("echo"), agent)
+        self.assertEqual(calls, [1])
+        self.assertEqual(agent.id, "echo")
+        self.assertIn("echo", registry.build_times())
+
+    def test_concurrent_get_builds_once(self):
+        """Test that threads asking for the same component at once share one build."""
+        calls = []
+        registry = AgentRegistry()
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return build_agent()
+
+        registry.register("echo", factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("echo"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+    def test_import_string_factory_and_kinds(self):
+        """Test that 'module:attribute' factories resolve lazily and kinds are listed apart."""
+        registry = AgentRegistry()
+        registry.register("echo", f"{__name__}:build_agent")
+        registry.register("team", build_agent, kind=TEAM)
+
+        self.assertEqual(registry.ids(TEAM), ["team"])
+        self.assertEqual([a.id for a in registry.agents()], ["echo"])
+        with self.assertRaises(ValueError):
+            registry.register("echo", build_agent)
+        with self.assertRaises(KeyError):
+            registry.get("missing")
+
+    def test_preload_imports_without_building(self):
+        """Test that preload resolves string factories but builds nothing."""
+        registry = AgentRegistry()
+        registry.register("echo", f"{__name__}:build_agent")
+        registry.preload()
+        self.assertFalse(registry.is_built("echo"))
+
+    def test_prewarm(self):
+        """Test that prewarm builds components on a background thread."""
+        registry = AgentRegistry()
+        registry.register("echo", build_agent)
+
+        registry.prewarm().join(timeout=10)
+        self.assertTrue(registry.is_built("echo"))
+
+
+class TestLazyAgentOS(unittest.TestCase):
+    """Test suite for the LazyAgentOS app."""
+
+    def test_builds_on_first_request(self):
+        """Test that the AgentOS app is built by the first request and then reused."""
+        registry = AgentRegistry()
+        registry.register("echo", build_agent)
+        lazy_os = LazyAgentOS(registry, telemetry=False)
+        self.assertFalse(lazy_os.is_built)
+
+        async def request():
+            transport = httpx.ASGITransport(app=lazy_os.get_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/agents/echo")
+
+        response = asyncio.run(request())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], "echo")
+        self.assertTrue(lazy_os.is_built)
+        self.assertTrue(registry.is_built("echo"))
+
+    def test_shutdown_closes_toolkits(self):
+        """Test that the lifespan shutdown closes the toolkits of the built agents."""
+        closed = []
+
+        class ClosingTools:
+            async def aclose(self):
+                closed.append(self)
+
+        tools = ClosingTools()
+        registry = AgentRegistry()
+        registry.register("echo", lambda: Agent(name="Echo", tools=[tools], telemetry=False))
+        registry.get("echo")
+        lazy_os = LazyAgentOS(registry, telemetry=False)
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(lazy_os({"type": "lifespan"}, receive, send))
+        self.assertEqual(closed, [tools])
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+
+    def test_health_and_readiness(self):
+        """Test that probes answer before the build, and readiness follows the build and the drain."""
+        registry = AgentRegistry()
+        registry.register("echo", build_agent)
+        lazy_os = LazyAgentOS(registry, telemetry=False)
+
+        async def probe(path):
+            transport = httpx.ASGITransport(app=lazy_os)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(path)
+
+        self.assertEqual(asyncio.run(probe("/healthz")).json()["status"], "starting")
+        self.assertEqual(asyncio.run(probe("/readyz")).status_code, 503)
+        self.assertFalse(lazy_os.is_built)
+
+        lazy_os.build()
+        ready = asyncio.run(probe("/readyz"))
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(ready.json()["in_flight"], 0)
+
+        lazy_os.drain()
+        self.assertEqual(asyncio.run(probe("/readyz")).status_code, 503)
+        self.assertEqual(asyncio.run(probe("/healthz")).json()["status"], "draining")
+
+    def test_agent_os_import_is_lazy(self):
+        """Test that importing agent_os builds nothing and imports no toolkit dependencies."""
+        code = (
+            "import sys, agent_os\n"
+            "heavy = ['yfinance', 'pandas', 'fastapi', 'devkit.agent_dev', 'devkit.agent_team']\n"
+            "print([m for m in heavy if m in sys.modules], agent_os.registry.build_times())"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "[] {}")
+
+    def test_module_aliases_are_built_lazily(self):
+        """Test that the module-level agents of agent_team are built on first access and cached."""
+        code = (
+            "import sys\n"
+            "from devkit import agent_team\n"
+            "before = 'yfinance' in sys.modules\n"
+            "agent = agent_team.web_agent\n"
+            "print(before, agent is agent_team.web_agent, agent.name)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False True Web Search Agent")
+
+
+class TestStartupReport(unittest.TestCase):
+    """Test suite for the import time report."""
+
+    def test_parse_importtime(self):
+        """Test that -X importtime lines are parsed with their nesting depth."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     json.decoder\n"
+            "import time:       300 |        420 |   json\n"
+            "import time:        80 |        500 | agent_os\n"
+        )
+        modules = parse_importtime(output)
+
+        self.assertEqual([m.name for m in modules], ["json.decoder", "json", "agent_os"])
+        self.assertEqual([m.depth for m in modules], [2, 1, 0])
+        self.assertAlmostEqual(modules[2].cumulative_seconds, 0.0005)
+
+
+if __name__ == "__main__":
+    unittest.main()
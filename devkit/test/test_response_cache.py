@@ -0,0 +1,154 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agno.db.sqlite import SqliteDb
+from agno.models.openai import OpenAIChat
+from agno.models.response import ToolExecution
+from agno.run.agent import RunContentEvent, RunOutput
+from agno.run.base import RunStatus
+
+from devkit.context import BudgetedAgent
+from devkit.response_cache import CachedAgent, ResponseCache
+from devkit.tools.devutils import DevUtilsTools
+
+QUESTION = "Explain the cron expression */5 * * * *"
+ANSWER = "It runs every five minutes."
+
+
+def model_stream(*args, **kwargs):
+    yield RunContentEvent(content="It runs ")
+    yield RunContentEvent(content="every five minutes.")
+    yield RunOutput(content=ANSWER, status=RunStatus.completed)
+
+
+class TestCachedAgent(unittest.TestCase):
+    """Test suite for the CachedAgent response cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(db_file=os.path.join(self.tmp_dir.name, "responses.db"))
+        self.agent = CachedAgent(
+            name="test", model=OpenAIChat(id="gpt-4.1-mini"), description="desc", response_cache=self.cache
+        )
+
+    def tearDown(self):
+        self.cache.store.close()
+        self.tmp_dir.cleanup()
+
+    @patch.object(BudgetedAgent, "run")
+    def test_repeated_question_is_replayed_as_stream(self, mock_run):
+        """Test that the second identical question streams the cached answer without a model call."""
+        mock_run.side_effect = model_stream
+
+        first = [event.content for event in self.agent.run(QUESTION, stream=True)]
+        second = list(self.agent.run("  Explain the cron   expression */5 * * * * ", stream=True))
+
+        mock_run.assert_called_once()
+        self.assertEqual(first, ["It runs ", "every five minutes."])
+        streamed = "".join(e.content for e in second if isinstance(e, RunContentEvent))
+        self.assertEqual(streamed, ANSWER)
+
+    @patch.object(BudgetedAgent, "run")
+    def test_side_effecting_runs_are_not_cached(self, mock_run):
+        """Test that a run calling a shell command is not replayed."""
+        mock_run.return_value = RunOutput(
+            content=ANSWER, status=RunStatus.completed, tools=[ToolExecution(tool_name="run_shell_command")]
+        )
+
+        self.agent.run(QUESTION, stream=False)
+        self.agent.run(QUESTION, stream=False)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch.object(BudgetedAgent, "run")
+    def test_runs_calling_uncacheable_tools_are_not_cached(self, mock_run):
+        """Test that tools marked not cacheable, or not cacheable for their arguments, prevent storing the answer."""
+        self.agent.tools = [DevUtilsTools()]
+        calls = [
+            ("base64_decode_file", {"path": "in.b64", "output_path": "out.bin"}),
+            ("generate_random_strings", {"length": 8}),
+            ("parse_cron", {"expression": "*/5 * * * *"}),
+        ]
+        for name, args in calls:
+            mock_run.return_value = RunOutput(
+                content=ANSWER, status=RunStatus.completed, tools=[ToolExecution(tool_name=name, tool_args=args)]
+            )
+            self.agent.run(f"{QUESTION} ({name})", stream=False)
+            self.agent.run(f"{QUESTION} ({name})", stream=False)
+        self.assertEqual(mock_run.call_count, 6)
+
+        mock_run.return_value = RunOutput(
+            content=ANSWER,
+            status=RunStatus.completed,
+            tools=[ToolExecution(tool_name="parse_cron", tool_args={"expression": "@daily", "start": "2026-01-01T00:00"})],
+        )
+        self.agent.run(QUESTION, stream=False)
+        self.agent.run(QUESTION, stream=False)
+        self.assertEqual(mock_run.call_count, 7)
+
+    @patch.object(BudgetedAgent, "run")
+    def test_short_and_non_text_inputs_bypass_cache(self, mock_run):
+        """Test that context dependent follow-ups always reach the model."""
+        mock_run.return_value = RunOutput(content=ANSWER, status=RunStatus.completed)
+
+        self.agent.run("yes", stream=False)
+        self.agent.run("yes", stream=False)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch.object(BudgetedAgent, "arun")
+    def test_arun_returns_cached_output(self, mock_arun):
+        """Test that async non-streaming runs are served from the cache as well."""
+
+        async def model_run(*args, **kwargs):
+            return RunOutput(content=ANSWER, status=RunStatus.completed)
+
+        mock_arun.side_effect = model_run
+
+        async def run():
+            await self.agent.arun(QUESTION)
+            return await self.agent.arun(QUESTION)
+
+        result = asyncio.run(run())
+
+        mock_arun.assert_called_once()
+        self.assertEqual(result.content, ANSWER)
+        self.assertTrue(result.metadata["cached"])
+
+    @patch.object(BudgetedAgent, "run")
+    def test_answers_are_scoped_to_user_and_session(self, mock_run):
+        """Test that a cached answer is not served to another user, or another session with history."""
+        mock_run.return_value = RunOutput(content=ANSWER, status=RunStatus.completed)
+
+        self.agent.run(QUESTION, user_id="alice", stream=False)
+        self.agent.run(QUESTION, user_id="bob", stream=False)
+        self.assertEqual(mock_run.call_count, 2)
+
+        self.agent.add_history_to_context = True
+        self.agent.run(QUESTION, user_id="alice", session_id="s1", stream=False)
+        self.agent.run(QUESTION, user_id="alice", session_id="s2", stream=False)
+        self.agent.run(QUESTION, user_id="alice", session_id="s1", stream=False)
+        self.assertEqual(mock_run.call_count, 4)
+
+    @patch.object(BudgetedAgent, "run")
+    def test_replayed_answer_is_saved_to_session(self, mock_run):
+        """Test that a cache hit is stored as a run of the session like a model answer."""
+        mock_run.return_value = RunOutput(content=ANSWER, status=RunStatus.completed)
+        db = SqliteDb(db_file=os.path.join(self.tmp_dir.name, "sessions.db"))
+        self.agent.db = db
+
+        self.agent.run(QUESTION, session_id="first", stream=False)
+        list(self.agent.run(QUESTION, session_id="second", stream=True))
+
+        mock_run.assert_called_once()
+        session = db.get_session(session_id="second", session_type="agent")
+        self.assertEqual(len(session.runs), 1)
+        self.assertEqual(session.runs[0].content, ANSWER)
+        self.assertEqual([m.role for m in session.runs[0].messages], ["user", "assistant"])
+
+
+if __name__ == "__main__":
+    unittest.main()
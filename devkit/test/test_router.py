@@ -0,0 +1,101 @@
+import asyncio
+import copy
+import unittest
+from unittest.mock import MagicMock
+
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+
+from devkit.router import FAST, STRONG, RoutingOpenAIChat
+
+
+def user(text):
+    return [Message(role="system", content="system"), Message(role="user", content=text)]
+
+
+class TestRoutingOpenAIChat(unittest.TestCase):
+    """Test suite for the RoutingOpenAIChat model."""
+
+    def setUp(self):
+        self.model = RoutingOpenAIChat(id="gpt-4.1", fast_id="gpt-4.1-mini", api_key="test")
+
+    def test_tiers(self):
+        """Test that the tiers use the configured ids and share the client settings."""
+        self.assertEqual(self.model.tiers[FAST].id, "gpt-4.1-mini")
+        self.assertEqual(self.model.tiers[STRONG].id, "gpt-4.1")
+        self.assertEqual(self.model.tiers[FAST].api_key, "test")
+
+    def test_simple_lookup_is_fast(self):
+        """Test that short lookups are sent to the fast tier."""
+        self.assertEqual(self.model.classify(user("AAPL price"))[0], FAST)
+        self.assertEqual(self.model.classify(user("What time is it in Tokyo?"))[0], FAST)
+
+    def test_hard_requests_are_strong(self):
+        """Test that long, code, multi-ticker and reasoning requests go to the strong tier."""
+        self.assertEqual(self.model.classify(user("word " * 100))[0], STRONG)
+        self.assertEqual(self.model.classify(user("fix ```x = 1```"))[0], STRONG)
+        self.assertEqual(self.model.classify(user("AAPL MSFT NVDA prices"))[0], STRONG)
+        self.assertEqual(self.model.classify(user("Analyze NVDA fundamentals"))[0], STRONG)
+
+    def test_keywords_match_whole_words(self):
+        """Test that reasoning keywords only match as words, not inside other words."""
+        self.assertEqual(self.model.classify(user("Airplane tickets to Paris")), (FAST, "simple request"))
+        self.assertEqual(self.model.classify(user("Cheapest plant shop nearby")), (FAST, "simple request"))
+        self.assertEqual(self.model.classify(user("Plan my week")), (STRONG, "keyword 'plan'"))
+        self.assertEqual(self.model.classify(user("AAPL vs MSFT")), (STRONG, "keyword 'vs'"))
+
+    def test_history_is_ignored(self):
+        """Test that only the latest user message decides the tier."""
+        messages = [Message(role="user", content="Compare AAPL and MSFT", from_history=True)] + user("TSLA price")
+        self.assertEqual(self.model.classify(messages)[0], FAST)
+
+    def test_force_tier(self):
+        """Test that force_tier bypasses the heuristics."""
+        self.model.force_tier = STRONG
+        self.assertEqual(self.model.classify(user("AAPL price")), (STRONG, "forced"))
+
+    def test_response_records_stats(self):
+        """Test that a response is delegated and its latency and usage are recorded."""
+        def respond(messages, **kwargs):
+            messages.append(Message(role="assistant", content="ok", metrics=Metrics(input_tokens=10, output_tokens=2)))
+            return ModelResponse(content="ok")
+
+        fast = self.model.tiers[FAST]
+        fast.response = MagicMock(side_effect=respond)
+        response = self.model.response(user("AAPL price"))
+
+        self.assertEqual(response.content, "ok")
+        fast.response.assert_called_once()
+        stats = self.model.stats()
+        self.assertEqual(stats[FAST]["calls"], 1)
+        self.assertEqual(stats[FAST]["input_tokens"], 10)
+        self.assertEqual(stats[FAST]["output_tokens"], 2)
+        self.assertEqual(stats[STRONG]["calls"], 0)
+
+    def test_async_stream_records_errors(self):
+        """Test that a failing stream is counted as an error of its tier."""
+        async def failing(messages, **kwargs):
+            yield ModelResponse(content="partial")
+            raise RuntimeError("boom")
+
+        self.model.tiers[STRONG].aresponse_stream = failing
+
+        async def consume():
+            async for _ in self.model.aresponse_stream(user("Explain the NVDA earnings")):
+                pass
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(consume())
+        self.assertEqual(self.model.stats()[STRONG]["errors"], 1)
+        self.assertEqual(self.model.stats()[STRONG]["calls"], 1)
+
+    def test_deepcopy(self):
+        """Test that a copy gets its own tiers and stats."""
+        clone = copy.deepcopy(self.model)
+        self.assertIsNot(clone.tiers[FAST], self.model.tiers[FAST])
+        self.assertEqual(clone.fast_id, "gpt-4.1-mini")
+
+
+if __name__ == "__main__":
+    unittest.main()
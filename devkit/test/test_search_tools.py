@@ -0,0 +1,88 @@
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from devkit.tools.search import SharedSearchTools
+from devkit.utils.search import SearchService, normalize_url
+
+RESULTS = {
+    "python asyncio": [
+        {"title": "asyncio docs", "href": "https://docs.python.org/3/library/asyncio.html", "body": "a"},
+        {"title": "Real Python", "href": "https://realpython.com/async-io-python/", "body": "b"},
+    ],
+    "asyncio tutorial": [
+        {"title": "Real Python", "href": "https://www.realpython.com/async-io-python?utm_source=x", "body": "b"},
+        {"title": "Blog", "href": "https://example.com/asyncio", "body": "c"},
+    ],
+}
+
+
+def fake_ddgs(delay=0.0):
+    ddgs = MagicMock()
+    ddgs.__enter__.return_value = ddgs
+
+    def text(query, region, max_results):
+        time.sleep(delay)
+        if query == "broken":
+            raise RuntimeError("rate limited")
+        return RESULTS[query]
+
+    ddgs.text.side_effect = text
+    return ddgs
+
+
+class TestSharedSearchTools(unittest.TestCase):
+    """Test suite for the SharedSearchTools class and the search service."""
+
+    def setUp(self):
+        self.service = SearchService(max_workers=4)
+        self.tools = SharedSearchTools(service=self.service)
+        self.ddgs = fake_ddgs(delay=0.2)
+        patcher = patch("devkit.utils.search.DDGS", return_value=self.ddgs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_searches_are_cached(self):
+        """Test that normalized duplicates, also from another toolkit, hit the cache."""
+        first = self.tools.duckduckgo_search("python asyncio")
+        other = SharedSearchTools(service=self.service)
+        self.assertEqual(other.duckduckgo_search("  Python   ASYNCIO "), first)
+        self.assertEqual(self.ddgs.text.call_count, 1)
+        self.assertEqual(json.loads(first)[0]["title"], "asyncio docs")
+
+    def test_connection_settings_select_the_service(self):
+        """Test that toolkits share a service per proxy, timeout and TLS setting, and the settings reach DDGS."""
+        default = SharedSearchTools()
+        proxied = SharedSearchTools(proxy="socks5://localhost:9150", timeout=30, verify_ssl=False)
+        self.assertIs(default.service, SharedSearchTools().service)
+        self.assertIsNot(proxied.service, default.service)
+
+        with patch("devkit.utils.search.DDGS", return_value=fake_ddgs()) as ddgs:
+            proxied.duckduckgo_search("python asyncio")
+        ddgs.assert_called_once_with(proxy="socks5://localhost:9150", timeout=30, verify=False)
+
+    def test_search_many_runs_concurrently_and_merges(self):
+        """Test that queries run in parallel and shared pages are merged and ranked first."""
+        start = time.perf_counter()
+        results = json.loads(self.tools.search_many(["python asyncio", "asyncio tutorial"]))
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["title"], "Real Python")
+        self.assertEqual(results[0]["queries"], ["python asyncio", "asyncio tutorial"])
+
+    def test_search_many_reports_failed_queries(self):
+        """Test that a failing query does not hide the other results."""
+        output = json.loads(self.tools.search_many(["python asyncio", "broken"]))
+        self.assertEqual(len(output["results"]), 2)
+        self.assertEqual(output["errors"], {"broken": "rate limited"})
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url("https://WWW.Example.com/a/?utm_source=x&id=1#top"),
+            normalize_url("http://example.com/a?id=1"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import httpx
+from agno.agent import Agent
+from agno.db.sqlite import SqliteDb
+from agno.models.openai import OpenAIChat
+
+from benchmarks.stub_server import StubModelServer
+from devkit.db.storage import get_storage
+from devkit.os_app import LazyAgentOS
+from devkit.registry import AgentRegistry
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def build_echo_agent() -> Agent:
+    model = OpenAIChat(id="gpt-4.1-mini", base_url=os.getenv("STUB_MODEL_URL"), api_key="sk-test")
+    return Agent(name="Echo", model=model, db=get_storage(), add_history_to_context=True, telemetry=False)
+
+
+# Served by the worker processes started in the tests below
+registry = AgentRegistry()
+registry.register("echo", build_echo_agent)
+app = LazyAgentOS(registry, prewarm=True, os_id="test-os")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestPreforkServer(unittest.TestCase):
+    """Test suite for the pre-forking AgentOS server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubModelServer(reply_tokens=20, token_delay=0.05).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        env = {
+            **os.environ,
+            "STUB_MODEL_URL": self.stub.base_url,
+            "AGNO_TELEMETRY": "false",
+            "DB_FILE": str(Path(self.tmp_dir.name) / "data.db"),
+        }
+        self.server = subprocess.Popen(
+            [
+                sys.executable, "-m", "devkit.serve", f"{__name__}:app",
+                "--host", "127.0.0.1", "--port", str(self.port), "--workers", "2",
+                "--graceful-timeout", "10", "--no-access-log", "--log-level", "warning",
+            ],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def tearDown(self):
+        if self.server.poll() is None:
+            self.server.kill()
+            self.server.wait()
+        self.tmp_dir.cleanup()
+
+    def ready_workers(self, count: int, timeout: float = 30.0) -> set:
+        """Pids of the workers answering ready, once `count` distinct ones did."""
+        pids = set()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                response = httpx.get(f"{self.base_url}/readyz", headers={"Connection": "close"}, timeout=2)
+                if response.status_code == 200:
+                    pids.add(response.json()["pid"])
+                    if len(pids) >= count:
+                        return pids
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+        self.fail(f"Only {len(pids)} of {count} workers became ready")
+
+    def test_restarts_dead_worker(self):
+        """Test that a worker that dies is replaced by a new one."""
+        pids = self.ready_workers(2)
+        dead = pids.pop()
+        os.kill(dead, signal.SIGKILL)
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.ready_workers(1) - {dead} - pids:
+                break
+        else:
+            self.fail("The dead worker was not replaced")
+
+    def test_workers_share_sessions(self):
+        """Test that runs of one session served by different workers all land in the shared database."""
+        self.ready_workers(2)
+        for i in range(6):
+            response = httpx.post(
+                f"{self.base_url}/agents/echo/runs",
+                data={"message": f"question {i}", "stream": "false", "session_id": "shared"},
+                headers={"Connection": "close"},
+                timeout=30,
+            )
+            self.assertEqual(response.status_code, 200)
+
+        db = SqliteDb(db_file=str(Path(self.tmp_dir.name) / "data.db"))
+        session = db.get_session(session_id="shared", session_type="agent")
+        self.assertEqual(len(session.runs), 6)
+
+    def test_graceful_shutdown_finishes_streamed_run(self):
+        """Test that a streamed run in flight when the server is stopped still completes."""
+        self.ready_workers(2)
+        events = []
+        started = threading.Event()
+
+        def stream():
+            with httpx.stream(
+                "POST",
+                f"{self.base_url}/agents/echo/runs",
+                data={"message": "hello", "stream": "true", "session_id": "drain"},
+                timeout=30,
+            ) as response:
+                for line in response.iter_lines():
+                    if line.startswith("event:"):
+                        events.append(line.split(":", 1)[1].strip())
+                        started.set()
+
+        client = threading.Thread(target=stream)
+        client.start()
+        self.assertTrue(started.wait(10))
+        self.server.send_signal(signal.SIGTERM)
+        client.join(timeout=30)
+
+        self.assertEqual(self.server.wait(timeout=30), 0)
+        self.assertGreaterEqual(events.count("RunContent"), 20)
+        self.assertEqual(events[-1], "RunCompleted")
+
+
+if __name__ == "__main__":
+    unittest.main()
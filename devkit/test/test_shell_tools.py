@@ -0,0 +1,153 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from devkit.tools.shell import PersistentShellTools
+from devkit.utils.shell_pool import OutputBuffer, ShellWorkerPool
+
+
+class TestPersistentShellTools(unittest.TestCase):
+    """Test suite for the PersistentShellTools class and its worker pool."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.pool = ShellWorkerPool(size=2, base_dir=self.base_dir)
+        self.tools = PersistentShellTools(pool=self.pool, session_id="s1", timeout=5, max_output_bytes=200)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_runs_command(self):
+        """Test that output and failing exit codes are returned."""
+        self.assertEqual(self.tools.run_shell_command("echo hello"), "hello")
+        self.assertEqual(self.tools.run_shell_command("echo oops >&2; false"), "oops\nExit code: 1")
+
+    def test_state_persists_within_session(self):
+        """Test that the working directory and variables carry over between commands."""
+        self.tools.run_shell_command("mkdir sub && cd sub && GREETING=hi")
+        self.assertTrue(self.tools.run_shell_command("pwd").endswith("/sub"))
+        self.assertEqual(self.tools.run_shell_command("echo $GREETING"), "hi")
+
+    def test_sessions_are_isolated(self):
+        """Test that another session gets its own shell."""
+        self.tools.run_shell_command("cd /")
+        other = PersistentShellTools(pool=self.pool, session_id="s2")
+        self.assertNotEqual(other.run_shell_command("pwd"), "/")
+        self.assertEqual(len(self.pool), 2)
+
+    def test_run_session_selects_the_shell(self):
+        """Test that one toolkit serving several sessions gives each run's session its own shell."""
+        self.tools.run_shell_command("cd /", session_state={"current_session_id": "alice"})
+        self.assertEqual(self.tools.run_shell_command("pwd", session_state={"current_session_id": "alice"}), "/")
+        self.assertNotEqual(self.tools.run_shell_command("pwd", session_state={"current_session_id": "bob"}), "/")
+        self.assertNotEqual(self.tools.run_shell_command("pwd"), "/")
+
+    def test_least_recently_used_session_is_evicted(self):
+        """Test that a full pool evicts the oldest session for a new one."""
+        for session_id in ("s1", "s2", "s3"):
+            PersistentShellTools(pool=self.pool, session_id=session_id).run_shell_command("cd /")
+        self.assertEqual(len(self.pool), 2)
+        self.assertNotEqual(self.tools.run_shell_command("pwd"), "/")
+
+    def test_leased_worker_is_not_evicted(self):
+        """Test that a session running a command keeps its worker while others come and go."""
+        with self.pool.lease("s1") as first:
+            with self.pool.lease("s2"):
+                pass
+            with self.pool.lease("s3"):
+                pass
+            with self.pool.lease("s1") as again:
+                self.assertIs(again, first)
+            self.assertEqual(first.run("echo still here", timeout=5, max_output_bytes=100).output, "still here\n")
+
+    def test_full_pool_wait_times_out(self):
+        """Test that a command waiting on a pool leased by other sessions gives up with an error."""
+        import devkit.tools.shell as shell
+
+        with self.pool.lease("s2"), self.pool.lease("s3"):
+            with patch.object(shell, "LEASE_MARGIN", 0.0):
+                result = self.tools.run_shell_command("echo hi", timeout=0.2)
+        self.assertIn("shell workers are busy", result)
+        self.assertEqual(self.tools.run_shell_command("echo hi"), "hi")
+
+    def test_released_session_closes_after_its_command(self):
+        """Test that releasing a session mid-command lets the command finish before the shell is closed."""
+        with self.pool.lease("s1") as worker:
+            worker.run("true", timeout=5, max_output_bytes=100)
+            self.pool.release("s1")
+            self.assertTrue(worker.alive)
+        self.assertFalse(worker.alive)
+
+    def test_timeout_kills_and_restarts_in_cwd(self):
+        """Test that a slow command is killed and the next one runs in the last directory."""
+        self.tools.run_shell_command(f"cd {self.base_dir}")
+        result = self.tools.run_shell_command("echo started; sleep 30", timeout=1)
+        self.assertIn("started", result)
+        self.assertIn("timed out", result)
+        self.assertEqual(self.tools.run_shell_command("pwd"), self.pool.base_dir)
+
+    def test_output_is_truncated(self):
+        """Test that long output keeps its head and tail within the byte budget."""
+        result = self.tools.run_shell_command("seq 1 10000")
+        self.assertTrue(result.startswith("1\n2\n"))
+        self.assertTrue(result.endswith("9999\n10000"))
+        self.assertIn("bytes truncated", result)
+
+    def test_streams_output(self):
+        """Test that output chunks reach the on_output callback."""
+        chunks = []
+        self.tools.on_output = chunks.append
+        self.tools.run_shell_command("echo one; sleep 0.2; echo two")
+        self.assertEqual("".join(chunks), "one\ntwo\n")
+
+    def test_exit_restarts_shell(self):
+        """Test that a command ending the shell does not break the session."""
+        self.assertIn("the shell exited", self.tools.run_shell_command("exit 3"))
+        self.assertEqual(self.tools.run_shell_command("echo back"), "back")
+
+    def test_environment_is_scrubbed(self):
+        """Test that secrets from the parent environment are not passed to the shell."""
+        import os
+        os.environ["DEVPET_TEST_SECRET"] = "secret"
+        try:
+            pool = ShellWorkerPool(size=1)
+            tools = PersistentShellTools(pool=pool, session_id="env")
+            self.assertEqual(tools.run_shell_command("echo ${DEVPET_TEST_SECRET:-none}"), "none")
+            pool.close()
+        finally:
+            del os.environ["DEVPET_TEST_SECRET"]
+
+    def test_agent_runs_use_their_session_shell(self):
+        """Test that an agent shared by several sessions runs each session's commands in its own shell."""
+        from agno.agent import Agent
+        from agno.models.openai import OpenAIChat
+
+        from benchmarks.stub_server import StubModelServer
+
+        with StubModelServer() as server:
+            agent = Agent(
+                model=OpenAIChat(id="gpt-4.1-mini", base_url=server.base_url, api_key="sk-test"),
+                tools=[self.tools],
+                telemetry=False,
+            )
+            agent.run('[call:run_shell_command {"command": "cd /"}]', session_id="alice")
+            agent.run('[call:run_shell_command {"command": "pwd"}]', session_id="bob")
+
+        self.assertEqual(sorted(self.pool._workers), ["alice", "bob"])
+        self.assertNotEqual(self.pool._workers["bob"].cwd, "/")
+        self.assertEqual(self.pool._workers["alice"].cwd, "/")
+
+
+class TestOutputBuffer(unittest.TestCase):
+    """Test suite for the OutputBuffer class."""
+
+    def test_keeps_head_and_tail(self):
+        buffer = OutputBuffer(max_bytes=10)
+        for chunk in (b"abcde", b"fghij", b"klmno"):
+            buffer.write(chunk)
+        self.assertEqual(buffer.dropped, 5)
+        self.assertEqual(buffer.text(), "abcde\n... [5 bytes truncated] ...\nklmno")
+
+
+if __name__ == "__main__":
+    unittest.main()
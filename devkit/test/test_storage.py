@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from agno.db.sqlite import SqliteDb
+from sqlalchemy import text
+
+from devkit.db.settings import DbSettings
+from devkit.db.storage import get_engine, get_storage
+
+
+class TestStorage(unittest.TestCase):
+    """Test suite for the shared storage factory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings = DbSettings(db_file=os.path.join(self.tmp_dir.name, "data.db"))
+
+    def tearDown(self):
+        get_engine(self.settings).dispose()
+        self.tmp_dir.cleanup()
+
+    def test_local_storage_is_shared(self):
+        """Test that the storage and its engine are created once per process."""
+        storage = get_storage(self.settings)
+        self.assertIsInstance(storage, SqliteDb)
+        self.assertIs(storage, get_storage(self.settings))
+        self.assertIs(storage.db_engine, get_engine(self.settings))
+
+    def test_sqlite_pragmas(self):
+        """Test that SQLite connections use WAL, a busy timeout and NORMAL sync."""
+        with get_engine(self.settings).connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(connection.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+            # 1 is NORMAL
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)
+
+    def test_postgres_url(self):
+        """Test that a configured server is preferred over the local file."""
+        settings = DbSettings(db_host="localhost", db_port=5432, db_user="ai", db_pass="ai", db_database="ai")
+        self.assertEqual(settings.get_db_url(), "postgresql+psycopg://ai:ai@localhost:5432/ai")
+
+    def test_cache_files_live_in_data_directory(self):
+        """Test that cache files go next to the database file unless a cache directory is set."""
+        self.assertEqual(self.settings.cache_file("market.db"), os.path.join(self.tmp_dir.name, "market.db"))
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        settings = DbSettings(db_file=self.settings.db_file, cache_dir=cache_dir)
+        self.assertEqual(settings.cache_file("market.db"), os.path.join(cache_dir, "market.db"))
+        self.assertTrue(os.path.isdir(cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
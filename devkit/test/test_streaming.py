@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+from agno.run.agent import RunContentEvent, ToolCallStartedEvent
+
+from devkit.utils.streaming import CoalescingStream
+
+
+async def fake_run(events, delay: float = 0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+def collect(stream: CoalescingStream):
+    async def run():
+        return [frame async for frame in stream]
+
+    return asyncio.run(run())
+
+
+class TestCoalescingStream(unittest.TestCase):
+    """Test suite for the CoalescingStream class."""
+
+    def test_coalesces_by_size(self):
+        """Test that content deltas are merged until max_chars is reached."""
+        events = [RunContentEvent(content="ab") for _ in range(5)]
+        stream = CoalescingStream(fake_run(events), max_chars=4, max_delay=10)
+
+        self.assertEqual(collect(stream), ["abab", "abab", "ab"])
+        self.assertEqual(stream.stats.tokens, 5)
+        self.assertEqual(stream.stats.frames, 3)
+        self.assertIsNotNone(stream.stats.time_to_first_token)
+
+    def test_skips_non_content_events(self):
+        """Test that tool events and empty chunks are not forwarded."""
+        events = [
+            RunContentEvent(content="Hello"),
+            ToolCallStartedEvent(),
+            RunContentEvent(content=None),
+            RunContentEvent(content=" world"),
+        ]
+        stream = CoalescingStream(fake_run(events), max_chars=256, max_delay=10)
+
+        self.assertEqual(collect(stream), ["Hello world"])
+        self.assertEqual(stream.stats.tokens, 2)
+
+    def test_flushes_on_stall(self):
+        """Test that buffered text is flushed when the next event is late."""
+
+        async def stalled_run():
+            yield RunContentEvent(content="first")
+            await asyncio.sleep(0.2)
+            yield RunContentEvent(content="second")
+
+        stream = CoalescingStream(stalled_run(), max_chars=256, max_delay=0.02)
+
+        self.assertEqual(collect(stream), ["first", "second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
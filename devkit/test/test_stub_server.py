@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from openai import OpenAI
+
+from benchmarks.stub_server import StubModelServer
+
+TOOLS = [{"type": "function", "function": {"name": "base64_encode", "parameters": {"type": "object", "properties": {}}}}]
+
+
+class TestStubModelServer(unittest.TestCase):
+    """Test suite for the benchmark stub model server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubModelServer(reply_tokens=5).start()
+        cls.client = OpenAI(base_url=cls.server.base_url, api_key="sk-test")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.server.stop()
+
+    def test_completion(self):
+        """Test that a plain request gets the canned reply and a usage block."""
+        response = self.client.chat.completions.create(model="gpt-4.1", messages=[{"role": "user", "content": "hi"}])
+
+        self.assertEqual(len(response.choices[0].message.content.split()), 5)
+        self.assertEqual(response.choices[0].finish_reason, "stop")
+        self.assertGreater(response.usage.total_tokens, 0)
+
+    def test_streamed_completion(self):
+        """Test that a streamed reply arrives word by word and ends with a usage chunk."""
+        chunks = list(self.client.chat.completions.create(
+            model="gpt-4.1",
+            messages=[{"role": "user", "content": "hi"}],
+            stream=True,
+            stream_options={"include_usage": True},
+        ))
+        text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+
+        self.assertEqual(len(text.split()), 5)
+        self.assertIsNotNone(chunks[-1].usage)
+
+    def test_scripted_tool_call(self):
+        """Test that a call marker triggers the tool call only when the tool is offered."""
+        messages = [{"role": "user", "content": 'go [call:base64_encode {"text": "hi"}]'}]
+        response = self.client.chat.completions.create(model="gpt-4.1", messages=messages, tools=TOOLS)
+        call = response.choices[0].message.tool_calls[0]
+        self.assertEqual(call.function.name, "base64_encode")
+        self.assertEqual(json.loads(call.function.arguments), {"text": "hi"})
+
+        response = self.client.chat.completions.create(model="gpt-4.1", messages=messages)
+        self.assertIsNone(response.choices[0].message.tool_calls)
+        self.assertTrue(response.choices[0].message.content)
+
+
+if __name__ == "__main__":
+    unittest.main()
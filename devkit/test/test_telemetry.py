@@ -0,0 +1,201 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import httpx
+from agno.agent import Agent
+from agno.exceptions import ModelProviderError
+from agno.models.openai import OpenAIChat
+from fastapi import FastAPI
+
+from benchmarks.stub_server import StubModelServer
+from devkit.telemetry import SqliteTelemetrySink, Telemetry, TelemetryRecord, add_metrics_route
+from devkit.utils.metrics import MetricsRegistry
+
+
+def base64_encode(text: str) -> str:
+    """Encode text as base64."""
+    return "YQ=="
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test suite for the Prometheus metrics registry."""
+
+    def test_counter(self):
+        """Test that counters add up per label set and render one sample each."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ["route"])
+        counter.inc(route="/a")
+        counter.inc(2, route="/a")
+        counter.inc(route="/b")
+
+        self.assertEqual(counter.value(route="/a"), 3)
+        text = registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/a"} 3', text)
+        self.assertIn('requests_total{route="/b"} 1', text)
+
+    def test_histogram(self):
+        """Test that histogram buckets are cumulative and end with +Inf, _sum and _count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count(), 4)
+        lines = registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("latency_seconds_sum 3.65", lines)
+        self.assertIn("latency_seconds_count 4", lines)
+
+    def test_type_conflict(self):
+        """Test that a name cannot be registered as two metric types."""
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("x", "X"), registry.counter("x", "X"))
+        with self.assertRaises(ValueError):
+            registry.histogram("x", "X")
+
+    def test_label_escaping(self):
+        """Test that quotes and newlines in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ["name"]).inc(name='say "hi"\n')
+        self.assertIn('errors_total{name="say \\"hi\\"\\n"} 1', registry.render())
+
+
+class TestTelemetry(unittest.TestCase):
+    """Test suite for run, model and tool telemetry against the stub model server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubModelServer(reply_tokens=5).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.telemetry = Telemetry()
+        self.agent = self.telemetry.instrument(Agent(
+            name="Echo",
+            model=OpenAIChat(id="gpt-4.1-mini", base_url=self.server.base_url, api_key="sk-test"),
+            tools=[base64_encode],
+            telemetry=False,
+        ))
+
+    def test_run(self):
+        """Test that a run records run and model durations and token counts."""
+        self.agent.run("hello")
+
+        self.assertEqual(self.telemetry.run_duration.count(kind="agent", name="Echo", status="completed"), 1)
+        self.assertEqual(self.telemetry.model_duration.count(model="gpt-4.1-mini", status="completed"), 1)
+        self.assertGreater(self.telemetry.model_tokens.value(model="gpt-4.1-mini", type="completion"), 0)
+
+    def test_streamed_tool_run(self):
+        """Test that a streamed run with a tool call records the tool, both model requests and TTFT."""
+        list(self.agent.run('encode [call:base64_encode {"text": "a"}]', stream=True))
+
+        self.assertEqual(self.telemetry.tool_duration.count(tool="base64_encode", status="completed"), 1)
+        self.assertEqual(self.telemetry.model_duration.count(model="gpt-4.1-mini", status="completed"), 2)
+        self.assertEqual(self.telemetry.model_ttft.count(model="gpt-4.1-mini"), 1)
+        self.assertEqual(self.telemetry.run_ttft.count(kind="agent", name="Echo"), 1)
+
+    def test_async_run(self):
+        """Test that async runs are recorded the same way."""
+        asyncio.run(self.agent.arun("hello"))
+        self.assertEqual(self.telemetry.run_duration.count(kind="agent", name="Echo", status="completed"), 1)
+
+    def test_instrument_is_idempotent(self):
+        """Test that instrumenting twice does not double count."""
+        self.telemetry.instrument(self.agent)
+        self.agent.run("hello")
+        self.assertEqual(self.telemetry.run_duration.count(kind="agent", name="Echo", status="completed"), 1)
+
+    def test_cached_token_ratio(self):
+        """Test that the share of input tokens served from the prompt cache is recorded per run."""
+        self.server.prompt_cache, self.server.prompt_cache_block = True, 16
+        self.addCleanup(setattr, self.server, "prompt_cache", False)
+        self.agent.run("hello " * 10)
+        self.agent.run("hello " * 10)
+
+        self.assertEqual(self.telemetry.run_cached_ratio.count(kind="agent", name="Echo"), 2)
+        self.assertIn('devkit_run_cached_token_ratio_bucket{kind="agent",name="Echo",le="0"} 1', self.telemetry.render())
+
+    def test_model_error(self):
+        """Test that a failing model request is recorded as an error."""
+        self.agent.model.base_url = "http://127.0.0.1:1/v1"
+        self.agent.model.max_retries = 0
+        with self.assertRaises(ModelProviderError):
+            self.agent.run("hello")
+
+        self.assertEqual(self.telemetry.errors.value(kind="model", name="gpt-4.1-mini"), 1)
+        self.assertEqual(self.telemetry.run_duration.count(kind="agent", name="Echo", status="error"), 1)
+
+
+class TestSqliteTelemetrySink(unittest.TestCase):
+    """Test suite for the SQLite telemetry sink."""
+
+    def test_writes_records(self):
+        """Test that queued records are in the table once the sink is closed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, "telemetry.db")
+            sink = SqliteTelemetrySink(db_file, flush_interval=0.01)
+            sink.write(TelemetryRecord(kind="tool", name="base64_encode", status="completed", duration=0.5))
+            sink.write(TelemetryRecord(kind="run", name="Echo", status="error", duration=1.5, run_id="r1"))
+            sink.close()
+
+            conn = sqlite3.connect(db_file)
+            rows = conn.execute("SELECT kind, name, status, duration, run_id FROM telemetry").fetchall()
+            conn.close()
+        self.assertEqual(rows, [("tool", "base64_encode", "completed", 0.5, None), ("run", "Echo", "error", 1.5, "r1")])
+
+    def test_drops_when_full(self):
+        """Test that records are dropped rather than blocking when the queue is full."""
+        with tempfile.TemporaryDirectory() as tmp:
+            sink = SqliteTelemetrySink(os.path.join(tmp, "telemetry.db"), max_queue=1)
+            for _ in range(1000):
+                sink.write(TelemetryRecord(kind="db", name="upsert", status="completed", duration=0.0))
+            sink.close()
+        self.assertGreater(sink.dropped, 0)
+
+
+class TestMetricsRoute(unittest.TestCase):
+    """Test suite for the Prometheus metrics route."""
+
+    def setUp(self):
+        self.telemetry = Telemetry()
+        self.telemetry.errors.inc(kind="tool", name="search")
+        self.app = FastAPI()
+
+        @self.app.get("/metrics")
+        def json_metrics():
+            return {"source": "json"}
+
+        add_metrics_route(self.app, self.telemetry)
+
+    def get(self, headers=None):
+        async def fetch():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/metrics", headers=headers)
+
+        return asyncio.run(fetch())
+
+    def test_text(self):
+        """Test that plain clients get the Prometheus text format."""
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('devkit_errors_total{kind="tool",name="search"} 1', response.text)
+
+    def test_json_passthrough(self):
+        """Test that JSON clients still reach the existing /metrics route."""
+        response = self.get({"accept": "application/json"})
+        self.assertEqual(response.json(), {"source": "json"})
+
+
+if __name__ == "__main__":
+    unittest.main()
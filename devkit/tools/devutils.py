@@ -0,0 +1,515 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import string
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, List, Optional, Set, Tuple
+
+from agno.tools import Toolkit
+from agno.utils.log import logger
+
+from ..utils.cache import cacheable
+
+CHARSETS = {
+    "alphanumeric": string.ascii_letters + string.digits,
+    "letters": string.ascii_letters,
+    "lowercase": string.ascii_lowercase,
+    "uppercase": string.ascii_uppercase,
+    "digits": string.digits,
+    "hex": "0123456789abcdef",
+    "symbols": string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{};:,.<>?/",
+}
+JWT_HMAC_ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+CRON_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    "sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6,
+}
+# (name, min, max) of the five cron fields
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day of month", 1, 31), ("month", 1, 12), ("day of week", 0, 7))
+# Base64 file chunks must be multiples of 3 raw bytes (encode) and 4 characters (decode).
+BASE64_CHUNK = 3 * 4 * 16 * 1024
+
+
+class DevUtilsTools(Toolkit):
+    def __init__(self, max_random_strings: int = 1000, max_random_length: int = 4096, **kwargs):
+        """
+        Parameters:
+            max_random_strings: Upper bound of strings produced by one `generate_random_strings` call.
+            max_random_length: Upper bound of the length of a generated string.
+        """
+        super().__init__(name="devutils_tools", **kwargs)
+        self.max_random_strings = max_random_strings
+        self.max_random_length = max_random_length
+
+        self.register(self.generate_random_strings)
+        self.register(self.decode_jwt)
+        self.register(self.base64_encode)
+        self.register(self.base64_decode)
+        self.register(self.base64_encode_file)
+        self.register(self.base64_decode_file)
+        self.register(self.parse_cron)
+        self.register(self.fix_json)
+
+    @cacheable(False)
+    def generate_random_strings(self, length: int = 16, count: int = 1, charset: str = "alphanumeric", custom_chars: Optional[str] = None) -> str:
+        """
+        Generate cryptographically secure random strings.
+
+        Parameters:
+            length (int): Length of each string.
+            count (int): Number of strings to generate.
+            charset (str): One of alphanumeric, letters, lowercase, uppercase, digits, hex, symbols.
+            custom_chars (Optional[str]): Characters to pick from instead of a named charset.
+
+        Returns:
+            str: JSON list of the generated strings, or an error message.
+        """
+        alphabet = custom_chars or CHARSETS.get(charset)
+        if not alphabet:
+            return f"Unknown charset '{charset}'. Use one of: {', '.join(CHARSETS)}"
+        if not 0 < length <= self.max_random_length:
+            return f"length must be between 1 and {self.max_random_length}"
+        if not 0 < count <= self.max_random_strings:
+            return f"count must be between 1 and {self.max_random_strings}"
+        return json.dumps(["".join(secrets.choice(alphabet) for _ in range(length)) for _ in range(count)])
+
+    def decode_jwt(self, token: str, secret: Optional[str] = None) -> str:
+        """
+        Decode a JSON Web Token and optionally verify its HMAC signature.
+
+        Parameters:
+            token (str): The JWT in compact form (header.payload.signature).
+            secret (Optional[str]): Shared secret to verify HS256/HS384/HS512 signatures.
+
+        Returns:
+            str: JSON with the decoded header and payload, readable exp/iat/nbf times, whether the
+                 token is expired, and the signature verification result when a secret is given.
+        """
+        parts = token.strip().split(".")
+        if len(parts) != 3:
+            return "Invalid JWT: expected 3 dot separated parts"
+        try:
+            header = json.loads(_b64url_decode(parts[0]))
+            payload = json.loads(_b64url_decode(parts[1]))
+        except (ValueError, binascii.Error) as e:
+            return f"Invalid JWT: {e}"
+
+        result: dict = {"header": header, "payload": payload}
+        now = datetime.now(timezone.utc)
+        times = {}
+        for claim in ("exp", "iat", "nbf"):
+            if isinstance(payload, dict) and isinstance(payload.get(claim), (int, float)):
+                times[claim] = datetime.fromtimestamp(payload[claim], timezone.utc).isoformat()
+        if times:
+            result["times"] = times
+        if isinstance(payload, dict) and isinstance(payload.get("exp"), (int, float)):
+            result["expired"] = payload["exp"] < now.timestamp()
+
+        if secret is not None:
+            algorithm = header.get("alg") if isinstance(header, dict) else None
+            digest = JWT_HMAC_ALGORITHMS.get(algorithm)
+            if digest is None:
+                result["signature"] = f"Cannot verify algorithm {algorithm} with a shared secret"
+            else:
+                expected = hmac.new(secret.encode(), f"{parts[0]}.{parts[1]}".encode(), digest).digest()
+                try:
+                    valid = hmac.compare_digest(expected, _b64url_decode(parts[2]))
+                except (ValueError, binascii.Error):
+                    valid = False
+                result["signature"] = "valid" if valid else "invalid"
+        return json.dumps(result, indent=2)
+
+    def base64_encode(self, text: str, url_safe: bool = False) -> str:
+        """
+        Encode a UTF-8 string to base64.
+
+        Parameters:
+            text (str): The text to encode.
+            url_safe (bool): Use the URL-safe alphabet (- and _ instead of + and /).
+
+        Returns:
+            str: The base64 encoded text.
+        """
+        data = text.encode()
+        encoded = base64.urlsafe_b64encode(data) if url_safe else base64.b64encode(data)
+        return encoded.decode("ascii")
+
+    def base64_decode(self, encoded: str) -> str:
+        """
+        Decode a base64 string (standard or URL-safe, padding optional) to UTF-8 text.
+
+        Parameters:
+            encoded (str): The base64 text to decode.
+
+        Returns:
+            str: The decoded text, a hex dump when the bytes are not valid UTF-8, or an error message.
+        """
+        try:
+            data = _b64_decode_lenient(encoded)
+        except (ValueError, binascii.Error) as e:
+            return f"Invalid base64 input: {e}"
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return f"Binary data ({len(data)} bytes), hex: {data[:256].hex()}{'...' if len(data) > 256 else ''}"
+
+    @cacheable(False)
+    def base64_encode_file(self, path: str, output_path: Optional[str] = None) -> str:
+        """
+        Base64 encode a file in streaming chunks, so large files are never loaded at once.
+
+        Parameters:
+            path (str): File to encode.
+            output_path (Optional[str]): Where to write the encoded text. Defaults to `<path>.b64`.
+
+        Returns:
+            str: Summary with the output path and sizes, or an error message.
+        """
+        source = Path(path)
+        target = Path(output_path) if output_path else source.with_name(source.name + ".b64")
+        try:
+            read = written = 0
+            with source.open("rb") as reader, target.open("wb") as writer:
+                while chunk := reader.read(BASE64_CHUNK):
+                    encoded = base64.b64encode(chunk)
+                    writer.write(encoded)
+                    read += len(chunk)
+                    written += len(encoded)
+        except OSError as e:
+            logger.error(f"Could not encode {path}: {e}")
+            return f"Could not encode {path}: {e}"
+        return f"Encoded {read} bytes from {source} into {written} base64 characters at {target}"
+
+    @cacheable(False)
+    def base64_decode_file(self, path: str, output_path: str) -> str:
+        """
+        Decode a base64 text file in streaming chunks, ignoring line breaks and whitespace.
+
+        Parameters:
+            path (str): File containing base64 text.
+            output_path (str): Where to write the decoded bytes.
+
+        Returns:
+            str: Summary with the output path and sizes, or an error message.
+        """
+        try:
+            read = written = 0
+            pending = b""
+            with open(path, "rb") as reader, open(output_path, "wb") as writer:
+                while chunk := reader.read(BASE64_CHUNK):
+                    read += len(chunk)
+                    pending += re.sub(rb"\s+", b"", chunk)
+                    usable = len(pending) - len(pending) % 4
+                    if usable:
+                        written += writer.write(base64.b64decode(pending[:usable], validate=True))
+                        pending = pending[usable:]
+                if pending:
+                    written += writer.write(_b64_decode_lenient(pending.decode("ascii")))
+        except (OSError, ValueError, binascii.Error) as e:
+            logger.error(f"Could not decode {path}: {e}")
+            return f"Could not decode {path}: {e}"
+        return f"Decoded {read} base64 characters from {path} into {written} bytes at {output_path}"
+
+    # Without a start the fire times are computed from the current time
+    @cacheable(lambda start=None, **_: start is not None)
+    def parse_cron(self, expression: str, count: int = 5, start: Optional[str] = None) -> str:
+        """
+        Validate a 5-field cron expression, explain its fields and list its next fire times.
+
+        Parameters:
+            expression (str): Cron expression such as "*/15 9-17 * * mon-fri" or an alias like "@daily".
+            count (int): Number of upcoming fire times to list (at most 100).
+            start (Optional[str]): ISO datetime to compute from. Defaults to now (UTC).
+
+        Returns:
+            str: JSON with the expanded values of each field and the next fire times, or an error message.
+        """
+        try:
+            fields = _parse_cron(expression)
+            begin = datetime.fromisoformat(start) if start else datetime.now(timezone.utc)
+        except ValueError as e:
+            return f"Invalid cron expression: {e}"
+        count = max(1, min(count, 100))
+        fire_times = _next_fire_times(fields, begin, count)
+        return json.dumps(
+            {
+                "expression": expression,
+                "fields": {name: _compact_values(values) for (name, _, _), (values, _) in zip(CRON_FIELDS, fields)},
+                "next": [t.isoformat() for t in fire_times],
+            },
+            indent=2,
+        )
+
+    def fix_json(self, text: str) -> str:
+        """
+        Repair common JSON mistakes and return valid, pretty-printed JSON.
+
+        Handles code fences, comments, single quotes, unquoted keys, trailing or missing commas,
+        Python literals (True/False/None) and unclosed brackets or strings.
+
+        Parameters:
+            text (str): The broken JSON text.
+
+        Returns:
+            str: The repaired JSON, or an error message if it cannot be repaired.
+        """
+        cleaned = text.strip()
+        fence = re.match(r"^```[a-zA-Z]*\n(.*?)\n?```$", cleaned, re.S)
+        if fence:
+            cleaned = fence.group(1)
+        try:
+            return json.dumps(json.loads(cleaned), indent=2, ensure_ascii=False)
+        except ValueError:
+            pass
+        try:
+            return json.dumps(_LenientJsonParser(cleaned).parse(), indent=2, ensure_ascii=False)
+        except ValueError as e:
+            return f"Could not repair JSON: {e}"
+
+
+def _b64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _b64_decode_lenient(value: str) -> bytes:
+    value = re.sub(r"\s+", "", value).rstrip("=")
+    value += "=" * (-len(value) % 4)
+    if "-" in value or "_" in value:
+        return base64.urlsafe_b64decode(value)
+    return base64.b64decode(value, validate=True)
+
+
+def _parse_cron(expression: str) -> List[Tuple[Set[int], bool]]:
+    """Returns the allowed values of each field and whether the field was restricted (not '*')."""
+    expression = CRON_ALIASES.get(expression.strip().lower(), expression)
+    parts = expression.split()
+    if len(parts) != 5:
+        raise ValueError(f"expected 5 fields, got {len(parts)}")
+    fields = []
+    for part, (name, low, high) in zip(parts, CRON_FIELDS):
+        values: Set[int] = set()
+        for item in part.lower().split(","):
+            values |= _parse_cron_item(item, name, low, high)
+        if name == "day of week" and 7 in values:
+            values = (values - {7}) | {0}
+        fields.append((values, not part.startswith("*")))
+    return fields
+
+
+def _parse_cron_item(item: str, name: str, low: int, high: int) -> Set[int]:
+    value_range, _, step_text = item.partition("/")
+    step = int(step_text) if step_text else 1
+    if step < 1:
+        raise ValueError(f"step must be positive in {name} field '{item}'")
+    if value_range in ("*", "?"):
+        start, end = low, high
+    elif "-" in value_range:
+        start_text, end_text = value_range.split("-", 1)
+        start, end = _cron_value(start_text, name), _cron_value(end_text, name)
+    else:
+        start = _cron_value(value_range, name)
+        end = high if step_text else start
+    if not (low <= start <= high and low <= end <= high) or start > end:
+        raise ValueError(f"{name} field '{item}' is outside {low}-{high}")
+    return set(range(start, end + 1, step))
+
+
+def _compact_values(values: Set[int]) -> str:
+    """Render {1, 2, 3, 5} as "1-3,5"."""
+    ordered = sorted(values)
+    ranges = []
+    start = previous = ordered[0]
+    for value in ordered[1:] + [None]:
+        if value is not None and value == previous + 1:
+            previous = value
+            continue
+        ranges.append(str(start) if start == previous else f"{start}-{previous}")
+        if value is not None:
+            start = previous = value
+    return ",".join(ranges)
+
+
+def _cron_value(text: str, name: str) -> int:
+    if text in CRON_NAMES:
+        return CRON_NAMES[text]
+    if not text.isdigit():
+        raise ValueError(f"invalid value '{text}' in {name} field")
+    return int(text)
+
+
+def _next_fire_times(fields: List[Tuple[Set[int], bool]], start: datetime, count: int) -> List[datetime]:
+    (minutes, _), (hours, _), (days, days_restricted), (months, _), (weekdays, weekdays_restricted) = fields
+    current = start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    results: List[datetime] = []
+    day = current.replace(hour=0, minute=0)
+    # Bounded so impossible dates such as "0 0 31 2 *" terminate.
+    for _ in range(366 * 8):
+        # Python weekday: Monday=0, cron: Sunday=0
+        cron_weekday = (day.weekday() + 1) % 7
+        if days_restricted and weekdays_restricted:
+            day_matches = day.day in days or cron_weekday in weekdays
+        else:
+            day_matches = day.day in days and cron_weekday in weekdays
+        if day.month in months and day_matches:
+            for hour in sorted(hours):
+                for minute in sorted(minutes):
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate >= current:
+                        results.append(candidate)
+                        if len(results) == count:
+                            return results
+        day += timedelta(days=1)
+    return results
+
+
+class _LenientJsonParser:
+    """Recursive descent parser that accepts the JSON mistakes `fix_json` repairs."""
+
+    LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Any:
+        self._skip()
+        if self.pos >= len(self.text):
+            raise ValueError("empty input")
+        value = self._value()
+        # Drop surplus closing brackets left over from a mismatched pair.
+        while self._peek() in ("]", "}") and self.pos < len(self.text):
+            self.pos += 1
+        if self.pos < len(self.text):
+            raise ValueError(f"unexpected '{self.text[self.pos]}' at position {self.pos}")
+        return value
+
+    def _skip(self) -> None:
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif self.text.startswith("//", self.pos) or char == "#":
+                end = self.text.find("\n", self.pos)
+                self.pos = len(self.text) if end == -1 else end + 1
+            elif self.text.startswith("/*", self.pos):
+                end = self.text.find("*/", self.pos + 2)
+                self.pos = len(self.text) if end == -1 else end + 2
+            else:
+                break
+
+    def _peek(self) -> str:
+        self._skip()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def _value(self) -> Any:
+        char = self._peek()
+        if char == "{":
+            return self._object()
+        if char == "[":
+            return self._array()
+        if char in "\"'":
+            return self._string()
+        if char == "":
+            raise ValueError("unexpected end of input")
+        return self._bare()
+
+    def _object(self) -> dict:
+        self.pos += 1
+        result = {}
+        while True:
+            char = self._peek()
+            if char == "}":
+                self.pos += 1
+                return result
+            if char in ("", "]"):
+                return result  # unclosed object, or closed with the wrong bracket
+            if char == ",":
+                self.pos += 1
+                continue
+            key = self._string() if char in "\"'" else str(self._bare(key=True))
+            if self._peek() in (":", "="):
+                self.pos += 1
+            result[key] = self._value() if self._peek() not in (",", "}", "") else None
+
+    def _array(self) -> list:
+        self.pos += 1
+        result = []
+        while True:
+            char = self._peek()
+            if char == "]":
+                self.pos += 1
+                return result
+            if char in ("", "}"):
+                return result  # unclosed array, or closed with the wrong bracket
+            if char == ",":
+                self.pos += 1
+                continue
+            result.append(self._value())
+
+    def _string(self) -> str:
+        quote = self.text[self.pos]
+        self.pos += 1
+        chars = []
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char == "\\" and self.pos + 1 < len(self.text):
+                escaped = self.text[self.pos + 1]
+                if escaped == "u" and re.fullmatch(r"[0-9a-fA-F]{4}", self.text[self.pos + 2:self.pos + 6]):
+                    chars.append(chr(int(self.text[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                chars.append({"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(escaped, escaped))
+                self.pos += 2
+                continue
+            if char == quote:
+                self.pos += 1
+                return "".join(chars)
+            if char == "\n" and quote == "'":
+                break
+            chars.append(char)
+            self.pos += 1
+        return "".join(chars)  # unclosed string
+
+    def _bare(self, key: bool = False) -> Any:
+        stop = ":,}]\n" if not key else ":=,}\n"
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in stop and not self.text.startswith("//", self.pos):
+            # Numbers and literals end at whitespace, so "[1 2]" reads as two values.
+            if not key and self.text[self.pos].isspace() and self._is_scalar(self.text[start:self.pos].strip()):
+                break
+            self.pos += 1
+        token = self.text[start:self.pos].strip()
+        if not token:
+            raise ValueError(f"unexpected '{self.text[self.pos:self.pos + 1]}' at position {self.pos}")
+        if key:
+            return token.strip("\"'")
+        if token in self.LITERALS:
+            return self.LITERALS[token]
+        try:
+            return json.loads(token)
+        except ValueError:
+            return token
+
+    def _is_scalar(self, token: str) -> bool:
+        if token in self.LITERALS:
+            return True
+        try:
+            float(token)
+        except ValueError:
+            return False
+        return True
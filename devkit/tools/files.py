@@ -0,0 +1,381 @@
+import json
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from agno.tools.file import FileTools
+from agno.utils.log import log_debug, log_error, log_info
+
+COUNT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+@dataclass
+class LineIndex:
+    """Byte offsets of every `step`-th line of a file, valid while its size and mtime are unchanged."""
+
+    size: int
+    mtime_ns: int
+    step: int
+    # offsets[i] is the byte offset of line i * step + 1
+    offsets: array
+    line_count: int
+
+    @classmethod
+    def build(cls, mm: "mmap.mmap", size: int, mtime_ns: int, step: int) -> "LineIndex":
+        offsets = array("Q", [0])
+        line = 1
+        position = mm.find(b"\n")
+        while position >= 0:
+            line += 1
+            if (line - 1) % step == 0:
+                offsets.append(position + 1)
+            position = mm.find(b"\n", position + 1)
+        # A trailing newline does not start another line.
+        line_count = line - 1 if size and mm[size - 1:size] == b"\n" else line
+        if size == 0:
+            line_count = 0
+        return cls(size=size, mtime_ns=mtime_ns, step=step, offsets=offsets, line_count=line_count)
+
+    def checkpoint(self, line: int) -> Tuple[int, int]:
+        """Return the closest indexed (line, offset) at or before `line`."""
+        slot = min((line - 1) // self.step, len(self.offsets) - 1)
+        return slot * self.step + 1, self.offsets[slot]
+
+
+class LargeFileTools(FileTools):
+    def __init__(
+            self,
+            base_dir: Optional[Path] = None,
+            max_read_bytes: int = 100_000,
+            max_lines: int = 500,
+            max_line_chars: int = 1000,
+            max_matches: int = 50,
+            enable_line_index: bool = True,
+            index_step: int = 1000,
+            index_cache_size: int = 16,
+            **kwargs,
+    ):
+        """
+        Parameters:
+            base_dir: Directory relative paths are resolved against, defaults to the working directory.
+            max_read_bytes: Files larger than this are not returned whole by `read_file`.
+            max_lines: Most lines returned by one `read_lines`, `head_file` or `tail_file` call.
+            max_line_chars: Longer lines are clipped before they reach the model.
+            max_matches: Most matches returned by one `search_in_file` call.
+            enable_line_index: Cache sparse line offsets per file so `read_lines` seeks instead of scanning.
+            index_step: Lines between two indexed offsets; the index of a file holds line_count / index_step entries.
+            index_cache_size: Number of file indexes kept in memory.
+        """
+        super().__init__(base_dir=base_dir, **kwargs)
+        self.max_read_bytes = max_read_bytes
+        self.max_lines = max_lines
+        self.max_line_chars = max_line_chars
+        self.max_matches = max_matches
+        self.enable_line_index = enable_line_index
+        self.index_step = index_step
+        self.index_cache_size = index_cache_size
+        self._indexes: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._index_lock = threading.Lock()
+
+        self.register(self.file_stats)
+        self.register(self.head_file)
+        self.register(self.tail_file)
+        self.register(self.read_lines)
+        self.register(self.search_in_file)
+
+    def read_file(self, file_name: str) -> str:
+        """Reads the contents of the file `file_name` and returns the contents if successful.
+        Large files are not returned whole; use read_lines, head_file, tail_file or search_in_file for them.
+
+        :param file_name: The name of the file to read.
+        :return: The contents of the file if successful, otherwise returns an error message.
+        """
+        try:
+            file_path = self._resolve(file_name)
+            size = file_path.stat().st_size
+            if size <= self.max_read_bytes:
+                return super().read_file(file_name)
+            log_info(f"File {file_name} is {size} bytes, returning its head")
+            return (
+                f"{file_name} is {_format_size(size)}, too large to read whole. "
+                f"Use read_lines, tail_file or search_in_file to look at specific parts. "
+                f"First lines:\n{self.head_file(file_name, lines=50)}"
+            )
+        except Exception as e:
+            log_error(f"Error reading file: {e}")
+            return f"Error reading file: {e}"
+
+    def file_stats(self, file_name: str) -> str:
+        """Returns the size, line count and modification time of a file without reading it into memory.
+
+        :param file_name: The name of the file.
+        :return: JSON with the file stats, or an error message.
+        """
+        try:
+            file_path = self._resolve(file_name)
+            stat = file_path.stat()
+            with self._mapped(file_path) as mm:
+                line_count = self._index(file_path, mm).line_count if self.enable_line_index else _count_lines(mm)
+                binary = mm is not None and b"\0" in mm[:8192]
+            return json.dumps(
+                {
+                    "path": str(file_path),
+                    "size_bytes": stat.st_size,
+                    "size": _format_size(stat.st_size),
+                    "lines": line_count,
+                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+                    "binary": binary,
+                },
+                indent=2,
+            )
+        except Exception as e:
+            log_error(f"Error reading file stats: {e}")
+            return f"Error reading file stats: {e}"
+
+    def head_file(self, file_name: str, lines: int = 50) -> str:
+        """Returns the first lines of a file, prefixed with their line numbers.
+
+        :param file_name: The name of the file.
+        :param lines: Number of lines to return.
+        :return: The numbered lines, or an error message.
+        """
+        return self.read_lines(file_name, start=1, count=lines)
+
+    def tail_file(self, file_name: str, lines: int = 50) -> str:
+        """Returns the last lines of a file, prefixed with their line numbers.
+
+        :param file_name: The name of the file.
+        :param lines: Number of lines to return.
+        :return: The numbered lines, or an error message.
+        """
+        try:
+            file_path = self._resolve(file_name)
+            lines = max(1, min(lines, self.max_lines))
+            with self._mapped(file_path) as mm:
+                if mm is None:
+                    return "(empty file)"
+                end = len(mm) - 1 if mm[-1:] == b"\n" else len(mm)
+                start = end
+                for step in range(lines):
+                    if start == 0:
+                        break
+                    start = mm.rfind(b"\n", 0, start - 1 if step else start) + 1
+                # Lines in the tail are numbered from the total line count.
+                total = self._index(file_path, mm).line_count if self.enable_line_index else _count_lines(mm)
+                chunk = mm[start:end].split(b"\n")
+                chunk = chunk[-lines:]
+                return self._numbered(chunk, total - len(chunk) + 1)
+        except Exception as e:
+            log_error(f"Error reading file tail: {e}")
+            return f"Error reading file tail: {e}"
+
+    def read_lines(self, file_name: str, start: int = 1, count: int = 100) -> str:
+        """Returns `count` lines of a file beginning at line `start` (1-based), prefixed with their line numbers.
+        Works on files of any size; only the requested range is read.
+
+        :param file_name: The name of the file.
+        :param start: The first line to return, 1 for the beginning of the file.
+        :param count: Number of lines to return.
+        :return: The numbered lines, or an error message.
+        """
+        try:
+            file_path = self._resolve(file_name)
+            start = max(1, start)
+            count = max(1, min(count, self.max_lines))
+            with self._mapped(file_path) as mm:
+                if mm is None:
+                    return "(empty file)"
+                offset = self._line_offset(file_path, mm, start)
+                if offset is None:
+                    return f"Line {start} is past the end of {file_name}"
+                end = offset
+                for _ in range(count):
+                    end = mm.find(b"\n", end)
+                    if end < 0:
+                        end = len(mm)
+                        break
+                    end += 1
+                chunk = mm[offset:end]
+            if chunk.endswith(b"\n"):
+                chunk = chunk[:-1]
+            return self._numbered(chunk.split(b"\n"), start)
+        except Exception as e:
+            log_error(f"Error reading lines: {e}")
+            return f"Error reading lines: {e}"
+
+    def search_in_file(self, file_name: str, pattern: str, context: int = 2, ignore_case: bool = False) -> str:
+        """Searches a file for a regular expression and returns only the matching lines with a few lines around them.
+        Works on files of any size; the file is scanned without loading it into memory.
+
+        :param file_name: The name of the file.
+        :param pattern: Python regular expression to search for, e.g. "ERROR|Traceback".
+        :param context: Number of lines shown before and after each match.
+        :param ignore_case: Match case-insensitively.
+        :return: Numbered matching windows separated by "--", or an error message.
+        """
+        try:
+            file_path = self._resolve(file_name)
+            regex = re.compile(pattern.encode(), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+            context = max(0, min(context, 10))
+            windows: List[Tuple[int, List[bytes]]] = []
+            matches = 0
+            truncated = False
+            with self._mapped(file_path) as mm:
+                if mm is None:
+                    return "No matches"
+                counter = _LineCounter(mm)
+                previous_line_start = -1
+                for match in regex.finditer(mm):
+                    line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                    if line_start == previous_line_start:
+                        # Another match on a line that is already shown.
+                        continue
+                    if matches >= self.max_matches:
+                        truncated = True
+                        break
+                    matches += 1
+                    previous_line_start = line_start
+                    line = counter.line_at(line_start)
+                    first_offset, first_line = line_start, line
+                    for _ in range(min(context, line - 1)):
+                        first_offset = mm.rfind(b"\n", 0, first_offset - 1) + 1
+                        first_line -= 1
+                    last_line_end = mm.find(b"\n", line_start)
+                    last_line_end = len(mm) if last_line_end < 0 else last_line_end
+                    for _ in range(context):
+                        if last_line_end >= len(mm) - 1:
+                            break
+                        following = mm.find(b"\n", last_line_end + 1)
+                        last_line_end = len(mm) if following < 0 else following
+                    window = mm[first_offset:last_line_end].split(b"\n")
+                    windows.append((first_line, window))
+            if not windows:
+                return "No matches"
+            log_debug(f"Found {matches} matching lines in {file_name}")
+            result = "\n--\n".join(self._numbered(lines, first) for first, lines in _merge_windows(windows))
+            if truncated:
+                result += f"\n-- stopped after {self.max_matches} matches, narrow the pattern or use read_lines --"
+            return result
+        except re.error as e:
+            return f"Error: invalid regular expression: {e}"
+        except Exception as e:
+            log_error(f"Error searching file: {e}")
+            return f"Error searching file: {e}"
+
+    def clear_index(self) -> None:
+        with self._index_lock:
+            self._indexes.clear()
+
+    def _resolve(self, file_name: str) -> Path:
+        return self.base_dir.joinpath(file_name)
+
+    @staticmethod
+    @contextmanager
+    def _mapped(file_path: Path) -> Iterator[Optional["mmap.mmap"]]:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield None
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    def _index(self, file_path: Path, mm: "mmap.mmap") -> LineIndex:
+        stat = file_path.stat()
+        key = str(file_path.resolve())
+        with self._index_lock:
+            index = self._indexes.get(key)
+            if index is not None and index.size == stat.st_size and index.mtime_ns == stat.st_mtime_ns:
+                self._indexes.move_to_end(key)
+                return index
+        if mm is None:
+            return LineIndex(size=0, mtime_ns=stat.st_mtime_ns, step=self.index_step, offsets=array("Q", [0]), line_count=0)
+        log_debug(f"Building line index for {file_path}")
+        index = LineIndex.build(mm, stat.st_size, stat.st_mtime_ns, self.index_step)
+        with self._index_lock:
+            self._indexes[key] = index
+            while len(self._indexes) > self.index_cache_size:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _line_offset(self, file_path: Path, mm: "mmap.mmap", line: int) -> Optional[int]:
+        """Byte offset where `line` starts, or None when the file has fewer lines."""
+        if self.enable_line_index:
+            index = self._index(file_path, mm)
+            if line > index.line_count:
+                return None
+            current, offset = index.checkpoint(line)
+        else:
+            current, offset = 1, 0
+        while current < line:
+            offset = mm.find(b"\n", offset) + 1
+            if offset == 0 or offset >= len(mm):
+                return None
+            current += 1
+        return offset
+
+    def _numbered(self, lines: List[bytes], first: int) -> str:
+        numbered = []
+        for number, raw in enumerate(lines, start=first):
+            text = raw.decode(errors="replace").rstrip("\r")
+            if len(text) > self.max_line_chars:
+                text = text[: self.max_line_chars] + f" ... [{len(text) - self.max_line_chars} characters clipped]"
+            numbered.append(f"{number}: {text}")
+        return "\n".join(numbered)
+
+
+class _LineCounter:
+    """Line numbers of increasing offsets, counting newlines in bounded chunks."""
+
+    def __init__(self, mm: "mmap.mmap"):
+        self.mm = mm
+        self.offset = 0
+        self.line = 1
+
+    def line_at(self, offset: int) -> int:
+        while self.offset < offset:
+            end = min(offset, self.offset + COUNT_CHUNK_SIZE)
+            self.line += self.mm[self.offset:end].count(b"\n")
+            self.offset = end
+        return self.line
+
+
+def _count_lines(mm: Optional["mmap.mmap"]) -> int:
+    if mm is None:
+        return 0
+    newlines = 0
+    for start in range(0, len(mm), COUNT_CHUNK_SIZE):
+        newlines += mm[start:start + COUNT_CHUNK_SIZE].count(b"\n")
+    return newlines if mm[-1:] == b"\n" else newlines + 1
+
+
+def _merge_windows(windows: List[Tuple[int, List[bytes]]]) -> List[Tuple[int, List[bytes]]]:
+    merged: List[Tuple[int, List[bytes]]] = []
+    for first, lines in windows:
+        if merged:
+            previous_first, previous_lines = merged[-1]
+            previous_last = previous_first + len(previous_lines) - 1
+            if first <= previous_last + 1:
+                overlap = previous_last - first + 1
+                merged[-1] = (previous_first, previous_lines + lines[overlap:])
+                continue
+        merged.append((first, lines))
+    return merged
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
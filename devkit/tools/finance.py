@@ -0,0 +1,313 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, logger
+
+from ..utils.cache import TTLCache
+
+try:
+    import numpy as np
+    import pandas as pd
+    import yfinance as yf
+except ImportError as e:
+    raise ImportError(f"`{e.name}` not installed. Please install using `pip install {e.name}`.") from e
+
+TRADING_DAYS = 252
+# Fields kept from Yahoo's `Ticker.info`, with their table headers
+FUNDAMENTAL_FIELDS = {
+    "shortName": "Name",
+    "sector": "Sector",
+    "marketCap": "Market Cap",
+    "trailingPE": "P/E",
+    "forwardPE": "Fwd P/E",
+    "trailingEps": "EPS",
+    "priceToBook": "P/B",
+    "profitMargins": "Margin",
+    "revenueGrowth": "Rev Growth",
+    "beta": "Beta",
+    "fiftyTwoWeekLow": "52w Low",
+    "fiftyTwoWeekHigh": "52w High",
+}
+
+
+class MarketDataTools(Toolkit):
+    def __init__(
+            self,
+            quote_ttl: float = 60,
+            history_ttl: float = 15 * 60,
+            fundamentals_ttl: float = 24 * 3600,
+            cache_file: Optional[str] = None,
+            cache_size: int = 512,
+            max_symbols: int = 25,
+            fundamentals_concurrency: int = 8,
+            **kwargs,
+    ):
+        """
+        Parameters:
+            quote_ttl: Seconds a quote stays valid.
+            history_ttl: Seconds a downloaded price history stays valid.
+            fundamentals_ttl: Seconds company fundamentals stay valid.
+            cache_file: SQLite file shared by the three caches so they survive restarts, None keeps
+                        them in memory only. `db_settings.cache_file("market_data.db")` puts it in the
+                        configured data directory.
+            cache_size: Entries per cache kept in the in-memory LRU.
+            max_symbols: Most tickers accepted by one tool call.
+            fundamentals_concurrency: Parallel requests when fundamentals of several tickers are missing.
+        """
+        super().__init__(name="market_data_tools", **kwargs)
+        self.max_symbols = max_symbols
+        self.fundamentals_concurrency = fundamentals_concurrency
+        self.quote_cache = TTLCache(maxsize=cache_size, ttl=quote_ttl, db_file=cache_file, table="market_quotes")
+        self.history_cache = TTLCache(maxsize=cache_size, ttl=history_ttl, db_file=cache_file, table="market_history")
+        self.fundamentals_cache = TTLCache(
+            maxsize=cache_size, ttl=fundamentals_ttl, db_file=cache_file, table="market_fundamentals"
+        )
+
+        self.register(self.get_quotes)
+        self.register(self.get_fundamentals)
+        self.register(self.get_price_metrics)
+
+    def get_quotes(self, symbols: List[str]) -> str:
+        """Use this function to get the latest price, daily change and volume of one or more stocks in one call.
+        Pass every ticker you need at once instead of calling this once per ticker.
+
+        Args:
+            symbols (List[str]): Ticker symbols, e.g. ["AAPL", "MSFT"].
+
+        Returns:
+            str: A markdown table with one row per ticker, or an error message.
+        """
+        try:
+            symbols = self._normalize(symbols)
+            close, volume = self._history(symbols, "5d", "1d", self.quote_cache)
+            if close.empty:
+                return f"No quotes found for {', '.join(symbols)}"
+            filled = close.ffill()
+            last = filled.iloc[-1]
+            previous = filled.shift(1).iloc[-1]
+            table = pd.DataFrame({
+                "Price": last,
+                "Change": last - previous,
+                "Change %": last / previous - 1,
+                "Volume": volume.ffill().iloc[-1] if not volume.empty else np.nan,
+            })
+            return _markdown_table(table, {
+                "Price": _number, "Change": _signed, "Change %": _change, "Volume": _compact,
+            })
+        except Exception as e:
+            logger.warning(f"Failed to get quotes: {e}")
+            return f"Error getting quotes: {e}"
+
+    def get_fundamentals(self, symbols: List[str]) -> str:
+        """Use this function to compare the fundamentals (market cap, P/E, EPS, margins, growth, beta) of one or more stocks.
+        Pass every ticker you need at once; the P/E column is also compared to the median of the group.
+
+        Args:
+            symbols (List[str]): Ticker symbols, e.g. ["META", "AAPL", "AMZN", "NFLX", "GOOGL"].
+
+        Returns:
+            str: A markdown table with one row per ticker, or an error message.
+        """
+        try:
+            symbols = self._normalize(symbols)
+            table = self._fundamentals(symbols)
+            if table.empty:
+                return f"No fundamentals found for {', '.join(symbols)}"
+            pe = pd.to_numeric(table["P/E"], errors="coerce")
+            table["P/E vs Median"] = pe / pe.median() - 1
+            return _markdown_table(table, {
+                "Market Cap": _compact, "P/E": _number, "Fwd P/E": _number, "EPS": _number, "P/B": _number,
+                "Margin": _percent, "Rev Growth": _change, "Beta": _number, "52w Low": _number,
+                "52w High": _number, "P/E vs Median": _change,
+            })
+        except Exception as e:
+            logger.warning(f"Failed to get fundamentals: {e}")
+            return f"Error getting fundamentals: {e}"
+
+    def get_price_metrics(self, symbols: List[str], period: str = "1y") -> str:
+        """Use this function to get return, volatility, moving averages and drawdown of one or more stocks over a period.
+
+        Args:
+            symbols (List[str]): Ticker symbols, e.g. ["NVDA", "AMD"].
+            period (str): History to analyse: 1mo, 3mo, 6mo, 1y, 2y, 5y, ytd or max.
+
+        Returns:
+            str: A markdown table with one row per ticker, or an error message.
+        """
+        try:
+            symbols = self._normalize(symbols)
+            close, _ = self._history(symbols, period, "1d", self.history_cache)
+            if close.empty:
+                return f"No price history found for {', '.join(symbols)}"
+            return _markdown_table(price_metrics(close), {
+                "Price": _number, "Return": _change, "1M Return": _change, "Volatility": _percent,
+                "SMA50": _number, "SMA200": _number, "vs SMA50": _change, "vs SMA200": _change,
+                "Max Drawdown": _change,
+            })
+        except Exception as e:
+            logger.warning(f"Failed to get price metrics: {e}")
+            return f"Error getting price metrics: {e}"
+
+    def close(self) -> None:
+        for cache in (self.quote_cache, self.history_cache, self.fundamentals_cache):
+            cache.close()
+
+    def _normalize(self, symbols: List[str]) -> List[str]:
+        if isinstance(symbols, str):
+            symbols = symbols.replace(",", " ").split()
+        unique = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if not unique:
+            raise ValueError("no ticker symbols given")
+        return unique[: self.max_symbols]
+
+    def _history(self, symbols: List[str], period: str, interval: str, cache: TTLCache) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+        """Close and volume frames (one column per ticker), downloading only the uncached tickers in one request."""
+        series: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for symbol in symbols:
+            cached = cache.get(TTLCache.make_key(symbol, period, interval))
+            if cached is None:
+                missing.append(symbol)
+            else:
+                series[symbol] = cached
+        if missing:
+            log_debug(f"Downloading {period} history for {', '.join(missing)}")
+            frame = self._download(missing, period, interval)
+            for symbol in missing:
+                close = _column(frame, "Close", symbol)
+                if close is None or close.dropna().empty:
+                    continue
+                volume = _column(frame, "Volume", symbol)
+                close = close.dropna()
+                entry = {
+                    "index": [ts.isoformat() for ts in close.index],
+                    "close": close.astype(float).tolist(),
+                    "volume": volume.reindex(close.index).fillna(0).astype(float).tolist() if volume is not None else [],
+                }
+                cache.set(TTLCache.make_key(symbol, period, interval), entry)
+                series[symbol] = entry
+
+        close = pd.DataFrame({
+            symbol: pd.Series(entry["close"], index=pd.to_datetime(entry["index"], utc=True))
+            for symbol, entry in series.items()
+        })
+        volume = pd.DataFrame({
+            symbol: pd.Series(entry["volume"], index=pd.to_datetime(entry["index"], utc=True))
+            for symbol, entry in series.items() if entry["volume"]
+        })
+        ordered = [s for s in symbols if s in close.columns]
+        return close.sort_index()[ordered], volume.sort_index()
+
+    def _fundamentals(self, symbols: List[str]) -> "pd.DataFrame":
+        rows: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for symbol in symbols:
+            cached = self.fundamentals_cache.get(TTLCache.make_key(symbol))
+            if cached is None:
+                missing.append(symbol)
+            else:
+                rows[symbol] = cached
+        if missing:
+            log_debug(f"Fetching fundamentals for {', '.join(missing)}")
+            with ThreadPoolExecutor(max_workers=min(self.fundamentals_concurrency, len(missing))) as pool:
+                for symbol, info in zip(missing, pool.map(self._safe_info, missing)):
+                    if not info:
+                        continue
+                    row = {header: info.get(field) for field, header in FUNDAMENTAL_FIELDS.items()}
+                    self.fundamentals_cache.set(TTLCache.make_key(symbol), row)
+                    rows[symbol] = row
+        return pd.DataFrame.from_dict({s: rows[s] for s in symbols if s in rows}, orient="index")
+
+    def _safe_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._fetch_info(symbol)
+        except Exception as e:
+            logger.warning(f"Could not fetch fundamentals for {symbol}: {e}")
+            return None
+
+    @staticmethod
+    def _download(symbols: List[str], period: str, interval: str) -> "pd.DataFrame":
+        return yf.download(
+            symbols,
+            period=period,
+            interval=interval,
+            group_by="column",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+            multi_level_index=True,
+        )
+
+    @staticmethod
+    def _fetch_info(symbol: str) -> Dict[str, Any]:
+        return yf.Ticker(symbol).info
+
+
+def price_metrics(close: "pd.DataFrame") -> "pd.DataFrame":
+    """Per-ticker metrics of a close price frame (rows are days, columns are tickers), computed column-wise."""
+    close = close.ffill()
+    last = close.iloc[-1]
+    first = close.bfill().iloc[0]
+    log_returns = np.log(close).diff()
+    sma50 = close.rolling(50, min_periods=50).mean().iloc[-1]
+    sma200 = close.rolling(200, min_periods=200).mean().iloc[-1]
+    month_ago = close.shift(21).iloc[-1]
+    return pd.DataFrame({
+        "Price": last,
+        "Return": last / first - 1,
+        "1M Return": last / month_ago - 1,
+        "Volatility": log_returns.std() * np.sqrt(TRADING_DAYS),
+        "SMA50": sma50,
+        "SMA200": sma200,
+        "vs SMA50": last / sma50 - 1,
+        "vs SMA200": last / sma200 - 1,
+        "Max Drawdown": (close / close.cummax() - 1).min(),
+    })
+
+
+def _column(frame: "pd.DataFrame", field: str, symbol: str) -> Optional["pd.Series"]:
+    if isinstance(frame.columns, pd.MultiIndex):
+        if (field, symbol) in frame.columns:
+            return frame[(field, symbol)]
+        return None
+    return frame[field] if field in frame.columns else None
+
+
+def _markdown_table(frame: "pd.DataFrame", formats: Dict[str, Callable[[Any], str]]) -> str:
+    headers = ["Symbol", *frame.columns]
+    lines = ["| " + " | ".join(headers) + " |", "|" + "|".join("---" for _ in headers) + "|"]
+    for symbol, row in frame.iterrows():
+        cells = [str(symbol)]
+        for column in frame.columns:
+            value = row[column]
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                cells.append("n/a")
+            else:
+                cells.append(formats.get(column, str)(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _number(value: Any) -> str:
+    return f"{float(value):,.2f}"
+
+
+def _signed(value: Any) -> str:
+    return f"{float(value):+,.2f}"
+
+
+def _percent(value: Any) -> str:
+    return f"{float(value) * 100:.1f}%"
+
+
+def _change(value: Any) -> str:
+    return f"{float(value) * 100:+.1f}%"
+
+
+def _compact(value: Any) -> str:
+    value = float(value)
+    for threshold, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= threshold:
+            return f"{value / threshold:.2f}{suffix}"
+    return f"{value:.0f}"
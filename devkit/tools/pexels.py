@@ -1,5 +1,12 @@
+import asyncio
+import importlib.util
+import mimetypes
 import os
-from typing import Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Union
 
 import httpx
 from agno.agent import Agent
@@ -9,21 +16,175 @@ from agno.tools import Toolkit
 from agno.tools.function import ToolResult
 from agno.utils.log import logger
 
+from ..utils.cache import TTLCache
+from ..utils.image_cache import MB, ImageCache
+from ..utils.ratelimit import RateLimitExceeded, TokenBucket, backoff_delay, parse_int_header, parse_retry_after
+
+
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+# Resized `src` variants of a Pexels photo: bounding width and height (None is unbounded), cropped to fill
+PEXELS_VARIANTS = {
+    "tiny": (280, 200, True),
+    "small": (None, 130, False),
+    "medium": (None, 350, False),
+    "large": (940, 650, False),
+    "large2x": (1880, 1300, False),
+}
+
 
 class PexelsTools(Toolkit):
     def __init__(
             self,
             api_key: Optional[str] = None,
+            async_mode: bool = False,
+            http2: bool = True,
+            timeout: float = 10.0,
+            max_connections: int = 20,
+            max_keepalive_connections: int = 10,
+            keepalive_expiry: float = 30.0,
+            enable_search_cache: bool = True,
+            search_cache_size: int = 256,
+            search_cache_ttl: float = 3600,
+            search_cache_file: Optional[str] = None,
+            requests_per_hour: int = 200,
+            burst: int = 20,
+            max_retries: int = 3,
+            max_rate_limit_wait: float = 30.0,
+            batch_concurrency: int = 4,
+            max_dimension: Optional[int] = 1280,
+            image_cache_dir: Optional[str] = None,
+            image_cache_max_bytes: int = 512 * MB,
+            image_max_file_bytes: int = 20 * MB,
             **kwargs,
     ):
+        """
+        Parameters:
+            api_key: Pexels API key, defaults to the PEXELS_API_KEY environment variable.
+            async_mode: Register the awaitable `asearch_photos` as the `search_photos` tool.
+                        Use it with `agent.arun()`; synchronous `agent.run()` rejects async tools.
+            http2: Negotiate HTTP/2 when the `h2` package is installed.
+            timeout: Total request timeout in seconds.
+            max_connections: Upper bound of open connections in the pool.
+            max_keepalive_connections: Idle connections kept alive for reuse.
+            keepalive_expiry: Seconds an idle connection stays in the pool.
+            enable_search_cache: Reuse Pexels responses for identical searches.
+            search_cache_size: Number of searches kept in the in-memory LRU.
+            search_cache_ttl: Seconds a cached search stays valid.
+            search_cache_file: Optional SQLite file so cached searches survive restarts.
+            requests_per_hour: Sustained request budget of the token bucket (Pexels default quota is 200/hour).
+            burst: Requests that may be issued back to back before the bucket throttles.
+            max_retries: Retries with jittered backoff on 429, 5xx and transport errors.
+            max_rate_limit_wait: Longest wait for quota before failing fast with a rate limit message.
+            batch_concurrency: Parallel requests issued by `search_photos_batch`, and parallel image downloads.
+            max_dimension: Longest side in pixels the photos are needed at. The smallest Pexels variant
+                           covering it is returned instead of the original, None always returns the original.
+            image_cache_dir: Download the returned photos into this content-addressed cache and return
+                             them as local files. Failed downloads fall back to the remote URL.
+            image_cache_max_bytes: Size of the image cache before least recently used files are evicted.
+            image_max_file_bytes: Largest image that is downloaded into the cache.
+        """
         super().__init__(name="pexels_tools", **kwargs)
 
         self.api_key = api_key or os.getenv("PEXELS_API_KEY")
         if not self.api_key:
             logger.error("No Pexels API key provided")
-        self.register(self.search_photos)
 
-    def search_photos(self, agent: Union[Agent, Team], query: str, max_results: int = 3, orientation: str = "landscape", color: Optional[str] = None) -> ToolResult:
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 is not installed, falling back to HTTP/1.1 for Pexels")
+            http2 = False
+        self.http2 = http2
+        self.timeout = httpx.Timeout(timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client_lock = threading.Lock()
+        self.search_cache: Optional[TTLCache] = None
+        if enable_search_cache:
+            self.search_cache = TTLCache(
+                maxsize=search_cache_size,
+                ttl=search_cache_ttl,
+                db_file=search_cache_file,
+                table="pexels_search_cache",
+            )
+
+        self.max_retries = max_retries
+        self.batch_concurrency = batch_concurrency
+        self.max_dimension = max_dimension
+        self.image_cache: Optional[ImageCache] = None
+        if image_cache_dir:
+            self.image_cache = ImageCache(
+                image_cache_dir,
+                max_bytes=image_cache_max_bytes,
+                max_file_bytes=image_max_file_bytes,
+                max_connections=max(1, batch_concurrency),
+            )
+        self.rate_limiter = TokenBucket(rate=requests_per_hour / 3600, capacity=burst, max_wait=max_rate_limit_wait)
+
+        if async_mode:
+            self.register(self.asearch_photos, name="search_photos")
+            self.register(self.asearch_photos_batch, name="search_photos_batch")
+        else:
+            self.register(self.search_photos)
+            self.register(self.search_photos_batch)
+
+    @property
+    def client(self) -> httpx.Client:
+        """Long-lived pooled client, created on first use."""
+        client = self._client
+        if client is None or client.is_closed:
+            with self._client_lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.Client(
+                        headers={"Authorization": self.api_key or ""},
+                        http2=self.http2,
+                        timeout=self.timeout,
+                        limits=self.limits,
+                    )
+                client = self._client
+        return client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Long-lived pooled async client, created on first use."""
+        client = self._async_client
+        if client is None or client.is_closed:
+            with self._client_lock:
+                if self._async_client is None or self._async_client.is_closed:
+                    self._async_client = httpx.AsyncClient(
+                        headers={"Authorization": self.api_key or ""},
+                        http2=self.http2,
+                        timeout=self.timeout,
+                        limits=self.limits,
+                    )
+                client = self._async_client
+        return client
+
+    def close(self) -> None:
+        """Close the pooled sync client and the caches. The async clients must be closed with `aclose`."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+        if self.search_cache is not None:
+            self.search_cache.close()
+        if self.image_cache is not None:
+            self.image_cache.close()
+
+    async def aclose(self) -> None:
+        """Close both pooled clients."""
+        if self.image_cache is not None:
+            await self.image_cache.aclose()
+        self.close()
+        with self._client_lock:
+            client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+
+    def search_photos(self, agent: Union[Agent, Team], query: str, max_results: int = 3, orientation: str = "landscape", color: Optional[str] = None, max_dimension: Optional[int] = None) -> ToolResult:
         """
         Search for high-quality photos on Pexels matching a given text description.
 
@@ -50,6 +211,8 @@ class PexelsTools(Toolkit):
                         - square
             color: Optional[str]: Desired photo color.Supported colors:
                     red, orange, yellow, green, turquoise, blue, violet, pink, brown, black, gray, white, or any hexadecimal color code (e.g., #ffffff).
+            max_dimension: Optional[int]: Longest side in pixels the photos will be shown at (e.g., 400 for thumbnails).
+                           Defaults to the toolkit setting. Smaller values return smaller, faster to load files.
 
         Returns:
             ToolResult: Containing the URLs of the found photos, or "No photo found" if the search
@@ -58,15 +221,20 @@ class PexelsTools(Toolkit):
         Image Behavior:
             - Each photo is added to the agent as an ImageArtifact with:
               - ID: The original Pexels photo ID
-              - URL: The URL to the original size image
+              - URL: The URL of the smallest Pexels variant covering `max_dimension`
+                (the original when no variant is large enough), or the local file when the
+                image cache is enabled
               - Alt text: The alternative text description from Pexels
               - Revised prompt: The original search query
 
             - Images are retrieved in landscape orientation by default
 
         Error Handling:
-            - HTTP errors (e.g., API limit exceeded, authentication failures) are logged and result in "No photo found"
-            - General exceptions during processing are caught, logged, and result in "No photo found"
+            - 429, 5xx and network errors are retried with jittered backoff within the Pexels quota
+            - An exhausted quota is reported as a rate limit message telling the caller not to retry
+            - Other HTTP errors (e.g., authentication failures) are logged and returned as
+              "HTTP error occurred: <status>"
+            - General exceptions during processing are caught, logged, and returned as "An error occurred: ..."
 
         Example:
             >> result = pexels_tools.search_photos(agent, "beach sunset", 3, "landscape", "white")
@@ -76,44 +244,321 @@ class PexelsTools(Toolkit):
         Note:
             This function requires a valid Pexels API key to be set either during toolkit initialization
             or via the PEXELS_API_KEY environment variable.
+            Successful searches are cached per normalized (query, orientation, color, max_results),
+            so repeated searches are answered without calling the API.
         """
 
-        base_url = "https://api.pexels.com/v1/search"
-        params = {
-            "query": query,
-            "orientation": orientation,
-            "per_page": max_results,
-            "color": color
-        }
-        image_artifacts = []
+        return self._search(query, max_results, orientation, color, max_dimension)
 
-        ## orientation Desired photo orientation. The current supported orientations are: landscape, portrait or square.
-        try:
-            response = httpx.get(base_url, params=params, headers={"Authorization": self.api_key})
-            response.raise_for_status()
+    async def asearch_photos(self, agent: Union[Agent, Team], query: str, max_results: int = 3, orientation: str = "landscape", color: Optional[str] = None, max_dimension: Optional[int] = None) -> ToolResult:
+        """
+        Search for high-quality photos on Pexels matching a given text description.
 
-            data = response.json()
-            photo_urls = []
-            for photo in data.get("photos", []):
-                media_id = str(photo.get("id"))
-                images = photo.get("src", {})
-                original_image = images["original"]
+        Parameters:
+            query (str): A text description of the photos to search for (e.g., "sunset over mountains").
+            max_results (int): The maximum number of photos to retrieve from Pexels.
+            orientation (str): Desired photo orientation: landscape, portrait or square.
+            color: Optional[str]: Desired photo color. Supported colors:
+                    red, orange, yellow, green, turquoise, blue, violet, pink, brown, black, gray, white, or any hexadecimal color code (e.g., #ffffff).
+            max_dimension: Optional[int]: Longest side in pixels the photos will be shown at (e.g., 400 for thumbnails).
 
-                alt_text = photo["alt"]
-                photo_urls.append(original_image)
-                image_artifact = Image(id=media_id, url=original_image, alt_text=alt_text, revised_prompt=query)
-                image_artifacts.append(image_artifact)
+        Returns:
+            ToolResult: Containing the URLs of the found photos, or "No photo found" if no photos matched the query.
+        """
+        return await self._asearch(query, max_results, orientation, color, max_dimension)
+
+    def search_photos_batch(self, agent: Union[Agent, Team], queries: List[str], max_results: int = 3, orientation: str = "landscape", color: Optional[str] = None, max_dimension: Optional[int] = None) -> ToolResult:
+        """
+        Search Pexels for several text descriptions at once and return all photos in one result.
+
+        Prefer this over calling search_photos repeatedly when you need photos for more than one subject.
+
+        Parameters:
+            queries (List[str]): Text descriptions to search for (e.g., ["sunset", "office team"]).
+            max_results (int): The maximum number of photos to retrieve per query.
+            orientation (str): Desired photo orientation: landscape, portrait or square.
+            color: Optional[str]: Desired photo color, a color name or hexadecimal code (e.g., #ffffff).
+            max_dimension: Optional[int]: Longest side in pixels the photos will be shown at (e.g., 400 for thumbnails).
 
-            if image_artifacts:
-                return ToolResult(content=f"Found {len(photo_urls)} Photo(s): {photo_urls}", images=image_artifacts)
-            else:
-                return ToolResult(content="No photo found")
+        Returns:
+            ToolResult: One line per query with its photo URLs or error, and all found photos as images.
+        """
+        queries = self._unique_queries(queries)
+        if not queries:
+            return ToolResult(content="No queries provided")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.batch_concurrency, len(queries)))) as executor:
+            results = list(executor.map(lambda q: self._search(q, max_results, orientation, color, max_dimension), queries))
+        return self._merge_results(queries, results)
+
+    async def asearch_photos_batch(self, agent: Union[Agent, Team], queries: List[str], max_results: int = 3, orientation: str = "landscape", color: Optional[str] = None, max_dimension: Optional[int] = None) -> ToolResult:
+        """
+        Search Pexels for several text descriptions at once and return all photos in one result.
+
+        Prefer this over calling search_photos repeatedly when you need photos for more than one subject.
+
+        Parameters:
+            queries (List[str]): Text descriptions to search for (e.g., ["sunset", "office team"]).
+            max_results (int): The maximum number of photos to retrieve per query.
+            orientation (str): Desired photo orientation: landscape, portrait or square.
+            color: Optional[str]: Desired photo color, a color name or hexadecimal code (e.g., #ffffff).
+            max_dimension: Optional[int]: Longest side in pixels the photos will be shown at (e.g., 400 for thumbnails).
+
+        Returns:
+            ToolResult: One line per query with its photo URLs or error, and all found photos as images.
+        """
+        queries = self._unique_queries(queries)
+        if not queries:
+            return ToolResult(content="No queries provided")
+        semaphore = asyncio.Semaphore(max(1, self.batch_concurrency))
 
+        async def run(q: str) -> ToolResult:
+            async with semaphore:
+                return await self._asearch(q, max_results, orientation, color, max_dimension)
 
+        results = await asyncio.gather(*(run(q) for q in queries))
+        return self._merge_results(queries, list(results))
 
+    def _search(self, query: str, max_results: int, orientation: str, color: Optional[str], max_dimension: Optional[int] = None) -> ToolResult:
+        params = self._build_params(query, max_results, orientation, color)
+        cache_key = self._cache_key(params)
+        max_dimension = max_dimension or self.max_dimension
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._localize(self._to_tool_result(cached, query, max_dimension))
+        try:
+            data = self._fetch(params)
+            self._cache_set(cache_key, data)
+            return self._localize(self._to_tool_result(data, query, max_dimension))
+        except RateLimitExceeded as e:
+            logger.error(f"Pexels rate limit: {e}")
+            return ToolResult(content=f"Pexels {e}. Do not retry this search now.")
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
             return ToolResult(content=f"HTTP error occurred: {e.response.status_code}")
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             return ToolResult(content=f"An error occurred: {e}")
+
+    async def _asearch(self, query: str, max_results: int, orientation: str, color: Optional[str], max_dimension: Optional[int] = None) -> ToolResult:
+        params = self._build_params(query, max_results, orientation, color)
+        cache_key = self._cache_key(params)
+        max_dimension = max_dimension or self.max_dimension
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return await self._alocalize(self._to_tool_result(cached, query, max_dimension))
+        try:
+            data = await self._afetch(params)
+            self._cache_set(cache_key, data)
+            return await self._alocalize(self._to_tool_result(data, query, max_dimension))
+        except RateLimitExceeded as e:
+            logger.error(f"Pexels rate limit: {e}")
+            return ToolResult(content=f"Pexels {e}. Do not retry this search now.")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
+            return ToolResult(content=f"HTTP error occurred: {e.response.status_code}")
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+            return ToolResult(content=f"An error occurred: {e}")
+
+    def _fetch(self, params: dict) -> dict:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.client.get(PEXELS_SEARCH_URL, params=params)
+                self._observe_quota(response)
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            logger.warning(f"Pexels request failed, retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    async def _afetch(self, params: dict) -> dict:
+        attempt = 0
+        while True:
+            await self.rate_limiter.aacquire()
+            try:
+                response = await self.async_client.get(PEXELS_SEARCH_URL, params=params)
+                self._observe_quota(response)
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            logger.warning(f"Pexels request failed, retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _observe_quota(self, response: httpx.Response) -> None:
+        remaining = parse_int_header(response.headers, "X-Ratelimit-Remaining")
+        reset_at = parse_int_header(response.headers, "X-Ratelimit-Reset")
+        if remaining is not None:
+            self.rate_limiter.update(remaining=remaining, reset_at=reset_at)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None when the error is final."""
+        if attempt >= self.max_retries:
+            return None
+        retry_after = None
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code != 429 and status_code < 500:
+                return None
+            retry_after = parse_retry_after(error.response.headers)
+            if status_code == 429 and retry_after is not None:
+                # The bucket waits out Retry-After on the next acquire, or fails fast if it is too long.
+                self.rate_limiter.block(retry_after)
+                retry_after = None
+        return backoff_delay(attempt, retry_after=retry_after)
+
+    @staticmethod
+    def _unique_queries(queries: List[str]) -> List[str]:
+        seen = set()
+        unique = []
+        for query in queries or []:
+            normalized = " ".join(str(query).lower().split())
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                unique.append(query)
+        return unique
+
+    @staticmethod
+    def _merge_results(queries: List[str], results: List[ToolResult]) -> ToolResult:
+        lines = []
+        images = []
+        seen_ids = set()
+        for query, result in zip(queries, results):
+            lines.append(f"{query}: {result.content}")
+            for image in result.images or []:
+                if image.id not in seen_ids:
+                    seen_ids.add(image.id)
+                    images.append(image)
+        return ToolResult(content="\n".join(lines), images=images or None)
+
+    @staticmethod
+    def _build_params(query: str, max_results: int, orientation: str, color: Optional[str]) -> dict:
+        params = {
+            "query": query,
+            "orientation": orientation,
+            "per_page": max_results,
+        }
+        if color:
+            params["color"] = color
+        return params
+
+    @staticmethod
+    def _cache_key(params: dict) -> str:
+        return TTLCache.make_key(
+            " ".join(params["query"].lower().split()),
+            params["orientation"].lower(),
+            str(params.get("color") or "").lower(),
+            int(params["per_page"]),
+        )
+
+    def _cache_get(self, key: str) -> Optional[dict]:
+        if self.search_cache is None:
+            return None
+        return self.search_cache.get(key)
+
+    def _cache_set(self, key: str, data: dict) -> None:
+        if self.search_cache is not None:
+            # Keep only the fields used to build the result, so the cache stays small on disk.
+            photos = [
+                {"id": p.get("id"), "src": p.get("src", {}), "alt": p.get("alt"), "width": p.get("width"), "height": p.get("height")}
+                for p in data.get("photos", [])
+            ]
+            self.search_cache.set(key, {"photos": photos})
+
+    def _localize(self, result: ToolResult) -> ToolResult:
+        """Download the result's photos into the image cache, in parallel, and point the artifacts at the files."""
+        if self.image_cache is None or not result.images:
+            return result
+        with ThreadPoolExecutor(max_workers=max(1, min(self.batch_concurrency, len(result.images)))) as executor:
+            paths = list(executor.map(self._cache_image, [image.url for image in result.images]))
+        return self._with_local_files(result, paths)
+
+    async def _alocalize(self, result: ToolResult) -> ToolResult:
+        if self.image_cache is None or not result.images:
+            return result
+        semaphore = asyncio.Semaphore(max(1, self.batch_concurrency))
+
+        async def run(url: str) -> Optional[Path]:
+            async with semaphore:
+                return await self._acache_image(url)
+
+        paths = await asyncio.gather(*(run(image.url) for image in result.images))
+        return self._with_local_files(result, list(paths))
+
+    def _cache_image(self, url: str) -> Optional[Path]:
+        try:
+            return self.image_cache.fetch(url)
+        except Exception as e:
+            logger.warning(f"Could not cache image {url}: {e}")
+            return None
+
+    async def _acache_image(self, url: str) -> Optional[Path]:
+        try:
+            return await self.image_cache.afetch(url)
+        except Exception as e:
+            logger.warning(f"Could not cache image {url}: {e}")
+            return None
+
+    @staticmethod
+    def _with_local_files(result: ToolResult, paths: List[Optional[Path]]) -> ToolResult:
+        images = [
+            image if path is None else Image(
+                id=image.id,
+                filepath=str(path),
+                mime_type=mimetypes.guess_type(path.name)[0],
+                alt_text=image.alt_text,
+                revised_prompt=image.revised_prompt,
+            )
+            for image, path in zip(result.images, paths)
+        ]
+        return ToolResult(content=result.content, images=images)
+
+    @staticmethod
+    def _to_tool_result(data: dict, query: str, max_dimension: Optional[int] = None) -> ToolResult:
+        image_artifacts = []
+        photo_urls = []
+        for photo in data.get("photos", []):
+            media_id = str(photo.get("id"))
+            image_url = select_variant(photo, max_dimension)
+
+            alt_text = photo["alt"]
+            photo_urls.append(image_url)
+            image_artifact = Image(id=media_id, url=image_url, alt_text=alt_text, revised_prompt=query)
+            image_artifacts.append(image_artifact)
+
+        if image_artifacts:
+            return ToolResult(content=f"Found {len(photo_urls)} Photo(s): {photo_urls}", images=image_artifacts)
+        return ToolResult(content="No photo found")
+
+
+def select_variant(photo: dict, max_dimension: Optional[int]) -> str:
+    """
+    URL of the smallest `src` variant of a Pexels photo whose longest side covers `max_dimension`,
+    or of the original when no variant is large enough (or `max_dimension` is None).
+    """
+    sources = photo.get("src", {})
+    if not max_dimension:
+        return sources["original"]
+    width, height = photo.get("width"), photo.get("height")
+    best_url, best_side = sources["original"], None
+    for name, (max_width, max_height, crop) in PEXELS_VARIANTS.items():
+        if not sources.get(name):
+            continue
+        if crop or not width or not height:
+            # Without the original's size, assume the variant fills its bounding box
+            side = max(max_width or 0, max_height or 0)
+        else:
+            scale = min(1.0, *(bound / size for bound, size in ((max_width, width), (max_height, height)) if bound))
+            side = max(width, height) * scale
+        if side >= max_dimension and (best_side is None or side < best_side):
+            best_url, best_side = sources[name], side
+    return best_url
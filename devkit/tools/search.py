@@ -0,0 +1,95 @@
+import json
+from typing import List, Optional
+
+from agno.tools.duckduckgo import DuckDuckGoTools
+from agno.utils.log import logger
+
+from ..utils.search import SearchService, get_search_service
+
+
+class SharedSearchTools(DuckDuckGoTools):
+    def __init__(
+            self,
+            service: Optional[SearchService] = None,
+            region: str = "us-en",
+            enable_search_many: bool = True,
+            max_merged_results: int = 15,
+            **kwargs,
+    ):
+        """
+        Parameters:
+            service: Search service to query, defaults to the process-wide `get_search_service()` for
+                     this toolkit's `proxy`, `timeout` and `verify_ssl`.
+            region: DuckDuckGo region, part of the cache key.
+            enable_search_many: Register the concurrent multi-query `search_many` tool.
+            max_merged_results: Most results returned by `search_many` after deduplication.
+            kwargs: `DuckDuckGoTools` options, including `proxy`, `timeout` and `verify_ssl`; the tool
+                    names and output format are unchanged.
+        """
+        super().__init__(**kwargs)
+        if service is None:
+            service = get_search_service(timeout=self.timeout, proxy=self.proxy, verify_ssl=self.verify_ssl)
+        elif (service.timeout, service.proxy, service.verify_ssl) != (self.timeout, self.proxy, self.verify_ssl):
+            logger.warning("The proxy, timeout and verify_ssl of the given search service are used, not the toolkit's")
+        self.service = service
+        self.region = region
+        self.max_merged_results = max_merged_results
+        if enable_search_many:
+            self.register(self.search_many)
+
+    def duckduckgo_search(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search DuckDuckGo for a query.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The result from DuckDuckGo.
+        """
+        results = self.service.search(self._modified(query), self.fixed_max_results or max_results, self.region)
+        return json.dumps(results, indent=2)
+
+    def duckduckgo_news(self, query: str, max_results: int = 5) -> str:
+        """Use this function to get the latest news from DuckDuckGo.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The latest news from DuckDuckGo.
+        """
+        results = self.service.search(query, self.fixed_max_results or max_results, self.region, kind="news")
+        return json.dumps(results, indent=2)
+
+    def search_many(self, queries: List[str], max_results: int = 5) -> str:
+        """Use this function to run several web searches at once, e.g. to research a topic from different angles.
+        The queries run in parallel and the results are merged: each page appears once, pages found by
+        more queries come first, and every result lists the queries that found it.
+
+        Args:
+            queries (List[str]): The queries to search for.
+            max_results (optional, default=5): The maximum number of results per query.
+
+        Returns:
+            JSON list of merged results, with an "errors" entry for queries that failed.
+        """
+        if not queries:
+            return "Error: no queries given"
+        modified = {self._modified(query): query for query in queries}
+        results, errors = self.service.search_many(
+            list(modified),
+            max_results=self.fixed_max_results or max_results,
+            region=self.region,
+            max_merged_results=self.max_merged_results,
+        )
+        for result in results:
+            result["queries"] = [modified.get(q, q) for q in result["queries"]]
+        if errors:
+            logger.warning(f"{len(errors)} of {len(modified)} searches failed")
+            return json.dumps({"results": results, "errors": {modified.get(q, q): e for q, e in errors.items()}}, indent=2)
+        return json.dumps(results, indent=2)
+
+    def _modified(self, query: str) -> str:
+        return f"{self.modifier} {query}" if self.modifier else query
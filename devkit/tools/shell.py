@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, log_info, logger
+
+from ..utils.cache import cacheable
+from ..utils.shell_pool import ShellPoolBusy, ShellResult, ShellWorkerPool, get_shell_pool
+
+# Seconds a command waits for a free shell beyond its own timeout when the pool is full
+LEASE_MARGIN = 10.0
+
+
+class PersistentShellTools(Toolkit):
+    def __init__(
+            self,
+            pool: Optional[ShellWorkerPool] = None,
+            session_id: Optional[str] = None,
+            async_mode: bool = False,
+            timeout: float = 60.0,
+            max_timeout: float = 600.0,
+            max_output_bytes: int = 16_000,
+            on_output: Optional[Callable[[str], None]] = None,
+            **kwargs,
+    ):
+        """
+        Parameters:
+            pool: Worker pool to run commands in, defaults to the process-wide `get_shell_pool()`.
+            session_id: Affinity key used when a command runs outside an agent run. Within a run
+                        the run's session id is used, so an agent serving several sessions
+                        (AgentOS) gives each its own shell, cwd and variables.
+            async_mode: Register the awaitable `arun_shell_command` as the `run_shell_command` tool.
+            timeout: Default wall-clock limit of a command in seconds.
+            max_timeout: Upper bound for the timeout the model may request.
+            max_output_bytes: Output kept for the model; the middle of longer output is dropped.
+            on_output: Called with each output chunk while the command runs.
+        """
+        super().__init__(name="shell_tools", **kwargs)
+        self.pool = pool if pool is not None else get_shell_pool()
+        self.session_id = session_id or "default"
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.max_output_bytes = max_output_bytes
+        self.on_output = on_output
+
+        if async_mode:
+            self.register(self.arun_shell_command, name="run_shell_command")
+        else:
+            self.register(self.run_shell_command)
+
+    @cacheable(False)
+    def run_shell_command(self, command: str, timeout: Optional[int] = None, session_state: Optional[Dict[str, Any]] = None) -> str:
+        """Runs a bash command in a persistent shell and returns its combined stdout and stderr.
+
+        The working directory and variables carry over to later commands, so `cd` works as usual.
+        Long output is cut down to its beginning and end; prefer commands with focused output
+        (grep, head, tail, wc) over dumping whole files or directory trees.
+
+        Args:
+            command (str): The command line to run, e.g. "ls -la src" or "cd build && make".
+            timeout (int): Optional time limit in seconds for slow commands.
+
+        Returns:
+            str: The output of the command, with the exit code when it failed.
+        """
+        limit = min(timeout or self.timeout, self.max_timeout)
+        log_info(f"Running shell command: {command}")
+        try:
+            with self.pool.lease(self.session_for(session_state), timeout=limit + LEASE_MARGIN) as worker:
+                result = worker.run(command, timeout=limit, max_output_bytes=self.max_output_bytes, on_output=self.on_output)
+        except ShellPoolBusy as e:
+            logger.warning(f"Shell command not run: {e}")
+            return f"Error: {e}, the command was not run. Try again shortly."
+        log_debug(f"Shell command finished in {result.duration:.2f}s with exit code {result.exit_code}")
+        return self._format(result, limit)
+
+    @cacheable(False)
+    async def arun_shell_command(self, command: str, timeout: Optional[int] = None, session_state: Optional[Dict[str, Any]] = None) -> str:
+        """Runs a bash command in a persistent shell and returns its combined stdout and stderr.
+
+        The working directory and variables carry over to later commands, so `cd` works as usual.
+        Long output is cut down to its beginning and end; prefer commands with focused output
+        (grep, head, tail, wc) over dumping whole files or directory trees.
+
+        Args:
+            command (str): The command line to run, e.g. "ls -la src" or "cd build && make".
+            timeout (int): Optional time limit in seconds for slow commands.
+
+        Returns:
+            str: The output of the command, with the exit code when it failed.
+        """
+        return await asyncio.to_thread(self.run_shell_command, command, timeout, session_state)
+
+    def session_for(self, session_state: Optional[Dict[str, Any]]) -> str:
+        """The shell affinity key: the session of the current run, injected by agno, else `session_id`."""
+        return (session_state or {}).get("current_session_id") or self.session_id
+
+    @staticmethod
+    def _format(result: ShellResult, limit: float) -> str:
+        output = result.output.rstrip("\n") or "(no output)"
+        if result.timed_out:
+            return (
+                f"{output}\nError: the command timed out after {limit:g}s and was killed. "
+                f"The shell was restarted in {result.cwd}, shell variables were reset."
+            )
+        if result.exit_code is None:
+            return f"{output}\nError: the shell exited. A new shell will start in {result.cwd}."
+        if result.exit_code != 0:
+            return f"{output}\nExit code: {result.exit_code}"
+        return output
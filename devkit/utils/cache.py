@@ -0,0 +1,150 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple, TypeVar, Union
+
+from agno.utils.log import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def cacheable(value: Union[bool, Callable[..., bool]]) -> Callable[[F], F]:
+    """
+    Mark whether answers built on a tool's result may be replayed by the response cache:
+    False for tools with side effects (writing files, running commands) or results that
+    differ between calls, or a predicate called with the tool arguments to decide per call.
+    """
+    def decorator(fn: F) -> F:
+        fn.cacheable = value
+        return fn
+
+    return decorator
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and an optional SQLite backing store.
+
+    The in-memory LRU front answers hot keys without touching disk. When `db_file` is
+    set, every write is also persisted so entries survive a restart; a memory miss
+    falls through to SQLite and promotes the entry back into the LRU. Values must be
+    JSON serializable when a backing store is used. `max_disk_entries` caps the store,
+    evicting the entries closest to expiry first.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 256,
+            ttl: float = 3600,
+            db_file: Optional[str] = None,
+            table: str = "cache",
+            max_disk_entries: Optional[int] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_file = db_file
+        self.table = table
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_file:
+            self._conn = sqlite3.connect(db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Hashable) -> str:
+        return json.dumps(parts, default=str)
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = json.loads(row[0]), row[1]
+                    if expires_at > now:
+                        self._put(key, value, expires_at)
+                        self.hits += 1
+                        return value
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._put(key, value, expires_at)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at),
+                    )
+                    if self.max_disk_entries is not None:
+                        self._conn.execute(
+                            f"DELETE FROM {self.table} WHERE key IN ("
+                            f"SELECT key FROM {self.table} ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                            (self.max_disk_entries,),
+                        )
+                    self._conn.commit()
+                except (TypeError, sqlite3.Error) as e:
+                    logger.warning(f"Could not persist cache entry: {e}")
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from memory and disk. Returns the number of removed disk rows."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+            if self._conn is None:
+                return 0
+            removed = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,)).rowcount
+            self._conn.commit()
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute(f"DELETE FROM {self.table}")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from agno.utils.log import log_debug, logger
+
+MB = 1024 * 1024
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class _UrlLock:
+    """Per-URL download lock, kept while any thread holds or waits for it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class ImageCache:
+    """
+    Content-addressed on-disk cache of downloaded images.
+
+    Each file is stored once under `directory`, named by the SHA-256 of its bytes, and a
+    SQLite index maps source URLs to those digests, so the same photo reached through
+    several searches or URLs is downloaded and kept once. Downloads are streamed to a
+    temporary file while hashing and abort once they exceed `max_file_bytes`. When the
+    stored files add up to more than `max_bytes` the least recently used ones are evicted.
+    Concurrent requests for the same URL share one download.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            max_bytes: int = 512 * MB,
+            max_file_bytes: int = 20 * MB,
+            timeout: float = 30.0,
+            max_connections: int = 10,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.timeout = httpx.Timeout(timeout)
+        self.limits = httpx.Limits(max_connections=max_connections)
+        self.hits = 0
+        self.misses = 0
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, _UrlLock] = {}
+        self._downloads: Dict[str, "asyncio.Task[Path]"] = {}
+        self._conn = sqlite3.connect(self.directory / "index.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, path TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, digest TEXT NOT NULL)")
+        self._conn.commit()
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(timeout=self.timeout, limits=self.limits, follow_redirects=True)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, follow_redirects=True)
+        return self._async_client
+
+    def get(self, url: str) -> Optional[Path]:
+        """The cached file of `url`, or None when it has not been downloaded (or was evicted)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.digest, b.path FROM urls u JOIN blobs b ON b.digest = u.digest WHERE u.url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            digest, path = row
+            if not os.path.exists(path):
+                self._forget(digest)
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+            self._conn.commit()
+            self.hits += 1
+            return Path(path)
+
+    def fetch(self, url: str) -> Path:
+        """Return the local file of `url`, downloading it on a miss."""
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, _UrlLock())
+            url_lock.users += 1
+        try:
+            with url_lock.lock:
+                cached = self.get(url)
+                if cached is not None:
+                    return cached
+                with self.client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    tmp_path, digest, size = self._receive(response.iter_bytes(), response.headers)
+                return self._store(url, tmp_path, digest, size, response.headers.get("content-type"))
+        finally:
+            with self._lock:
+                url_lock.users -= 1
+                if not url_lock.users:
+                    del self._url_locks[url]
+
+    async def afetch(self, url: str) -> Path:
+        """Return the local file of `url`, downloading it on a miss. Index and file work runs off the event loop."""
+        cached = await asyncio.to_thread(self.get, url)
+        if cached is not None:
+            return cached
+        download = self._downloads.get(url)
+        if download is None:
+            download = self._downloads[url] = asyncio.ensure_future(self._adownload(url))
+            download.add_done_callback(lambda _: self._downloads.pop(url, None))
+        return await asyncio.shield(download)
+
+    def evict(self) -> int:
+        """Remove least recently used files until the cache fits in `max_bytes`. Returns the number removed."""
+        with self._lock:
+            removed = self._evict()
+            self._conn.commit()
+            return removed
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self.size()}
+
+    def close(self) -> None:
+        """Close the sync client and the index. The async client must be closed with `aclose`."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        with self._lock:
+            self._conn.close()
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    async def _adownload(self, url: str) -> Path:
+        async with self.async_client.stream("GET", url) as response:
+            response.raise_for_status()
+            tmp = self._open_tmp()
+            digest = hashlib.sha256()
+            size = 0
+            try:
+                async for chunk in response.aiter_bytes():
+                    size = self._write_chunk(tmp, digest, chunk, size, response.headers)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+            tmp.close()
+        return await asyncio.to_thread(
+            self._store, url, tmp.name, digest.hexdigest(), size, response.headers.get("content-type")
+        )
+
+    def _receive(self, chunks, headers: httpx.Headers) -> Tuple[str, str, int]:
+        tmp = self._open_tmp()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            for chunk in chunks:
+                size = self._write_chunk(tmp, digest, chunk, size, headers)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        tmp.close()
+        return tmp.name, digest.hexdigest(), size
+
+    def _open_tmp(self):
+        return tempfile.NamedTemporaryFile(dir=self.directory, suffix=".part", delete=False)
+
+    def _write_chunk(self, tmp, digest, chunk: bytes, size: int, headers: httpx.Headers) -> int:
+        size += len(chunk)
+        if size > self.max_file_bytes:
+            raise ImageTooLarge(f"Image is larger than {self.max_file_bytes} bytes (content-length {headers.get('content-length')})")
+        digest.update(chunk)
+        tmp.write(chunk)
+        return size
+
+    def _store(self, url: str, tmp_path: str, digest: str, size: int, content_type: Optional[str]) -> Path:
+        path = self.directory / digest[:2] / f"{digest}{_extension(url, content_type)}"
+        path.parent.mkdir(exist_ok=True)
+        with self._lock:
+            if path.exists():
+                os.unlink(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs (digest, path, size, last_access) VALUES (?, ?, ?, ?)",
+                (digest, str(path), size, time.time()),
+            )
+            self._conn.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+            removed = self._evict(keep=digest)
+            self._conn.commit()
+        log_debug(f"Cached {url} as {path.name} ({size} bytes, {removed} evicted)")
+        return path
+
+    def _evict(self, keep: Optional[str] = None) -> int:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for digest, path, size in self._conn.execute(
+                "SELECT digest, path, size FROM blobs ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict cached image {path}: {e}")
+                continue
+            self._forget(digest)
+            total -= size
+            removed += 1
+        return removed
+
+    def _forget(self, digest: str) -> None:
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+
+
+def _extension(url: str, content_type: Optional[str]) -> str:
+    suffix = Path(urlparse(url).path).suffix.lower()
+    if suffix in (".jpg", ".jpeg", ".png", ".webp", ".gif"):
+        return suffix
+    guessed = mimetypes.guess_extension((content_type or "").split(";")[0].strip()) if content_type else None
+    return guessed or ".img"
@@ -0,0 +1,106 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the provider quota is exhausted for longer than the caller is willing to wait."""
+
+    def __init__(self, reset_at: Optional[float]):
+        self.reset_at = reset_at
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(reset_at)) if reset_at else "an unknown time"
+        super().__init__(f"Rate limit exhausted until {when}")
+
+
+class TokenBucket:
+    """
+    Token bucket shared by sync and async callers.
+
+    `rate` tokens are added per second up to `capacity`. Each call reserves one token and
+    sleeps until it becomes available. Provider headers can tighten the bucket through
+    `update`, and a hard block is honoured until the reported reset time, as long as it is
+    within `max_wait` seconds; otherwise `RateLimitExceeded` is raised.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_wait: float = 30.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, remaining: Optional[int] = None, reset_at: Optional[float] = None) -> None:
+        """Align the bucket with the quota reported by the provider."""
+        with self._lock:
+            self._refill()
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+                if remaining <= 0 and reset_at:
+                    self.blocked_until = max(self.blocked_until, reset_at)
+
+    def block(self, seconds: float) -> None:
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        with self._lock:
+            blocked_for = self.blocked_until - time.time()
+            if blocked_for > self.max_wait:
+                raise RateLimitExceeded(self.blocked_until)
+            self._refill()
+            self.tokens -= 1
+            delay = max(0.0, -self.tokens / self.rate) if self.rate > 0 else 0.0
+            delay = max(delay, blocked_for)
+            if delay > self.max_wait:
+                self.tokens += 1
+                raise RateLimitExceeded(time.time() + delay)
+            return delay
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def parse_int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,141 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from agno.utils.log import log_debug, logger
+
+from .cache import TTLCache
+
+try:
+    from ddgs import DDGS
+except ImportError:
+    raise ImportError("`ddgs` not installed. Please install using `pip install ddgs`")
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ref")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of `url` used to detect the same page across queries."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ])
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+def result_url(result: Dict[str, Any]) -> str:
+    return result.get("href") or result.get("url") or ""
+
+
+class SearchService:
+    """
+    Process-wide DuckDuckGo search with a TTL cache and concurrent multi-query search.
+
+    Results are cached on the search kind, the normalized query, the region and the
+    result count, so the same search from another agent or session is answered from
+    memory (or from `cache_file` after a restart). `search_many` runs its queries on
+    a bounded thread pool and merges the results, keeping each page once.
+    """
+
+    def __init__(
+            self,
+            ttl: float = 30 * 60,
+            cache_size: int = 512,
+            cache_file: Optional[str] = None,
+            max_workers: int = 4,
+            timeout: Optional[int] = 10,
+            proxy: Optional[str] = None,
+            verify_ssl: bool = True,
+    ):
+        self.timeout = timeout
+        self.proxy = proxy
+        self.verify_ssl = verify_ssl
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl, db_file=cache_file, table="search_cache")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+
+    def search(self, query: str, max_results: int = 5, region: str = "us-en", kind: str = "text") -> List[Dict[str, Any]]:
+        key = TTLCache.make_key(kind, normalize_query(query), region, max_results)
+        results = self.cache.get(key)
+        if results is not None:
+            log_debug(f"Search cache hit for: {query}")
+            return results
+        log_debug(f"Searching DDG {kind} for: {query}")
+        with DDGS(proxy=self.proxy, timeout=self.timeout, verify=self.verify_ssl) as ddgs:
+            if kind == "news":
+                results = ddgs.news(query=query, region=region, max_results=max_results)
+            else:
+                results = ddgs.text(query=query, region=region, max_results=max_results)
+        results = list(results or [])
+        self.cache.set(key, results)
+        return results
+
+    def search_many(
+            self,
+            queries: List[str],
+            max_results: int = 5,
+            region: str = "us-en",
+            kind: str = "text",
+            max_merged_results: int = 15,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Run `queries` concurrently and merge their results.
+
+        Pages found by more queries rank first, ties keep the best position any query
+        gave them. Returns the merged results, each listing the queries that found it,
+        and the error message of every query that failed.
+        """
+        unique = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        futures = {q: self._executor.submit(self.search, q, max_results, region, kind) for q in unique}
+        merged: Dict[str, Dict[str, Any]] = {}
+        ranking: Dict[str, Tuple[int, int, int]] = {}
+        errors: Dict[str, str] = {}
+        for order, (query, future) in enumerate(futures.items()):
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.warning(f"Search failed for '{query}': {e}")
+                errors[query] = str(e)
+                continue
+            for position, result in enumerate(results):
+                url = result_url(result)
+                key = normalize_url(url) if url else f"{query}#{position}"
+                # Sort key: more queries first, then best position, then query order.
+                if key not in merged:
+                    merged[key] = {**result, "queries": [query]}
+                    ranking[key] = (-1, position, order)
+                elif query not in merged[key]["queries"]:
+                    merged[key]["queries"].append(query)
+                    hits, best, first = ranking[key]
+                    ranking[key] = (hits - 1, min(best, position), first)
+        ordered = sorted(merged, key=lambda k: ranking[k])
+        return [merged[k] for k in ordered[:max_merged_results]], errors
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.cache.close()
+
+
+_services: Dict[Tuple[Optional[int], Optional[str], bool], SearchService] = {}
+_services_lock = threading.Lock()
+
+
+def get_search_service(timeout: Optional[int] = 10, proxy: Optional[str] = None, verify_ssl: bool = True) -> SearchService:
+    """
+    Return the search service shared by every search toolkit in the process that uses the
+    same connection settings; toolkits with another proxy, timeout or TLS setting get their own.
+    """
+    key = (timeout, proxy, verify_ssl)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = SearchService(timeout=timeout, proxy=proxy, verify_ssl=verify_ssl)
+        return service
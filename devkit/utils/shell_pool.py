@@ -0,0 +1,339 @@
+import os
+import queue
+import shlex
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Union
+
+from agno.utils.log import logger
+
+# Variables copied into the worker environment; everything else (API keys, tokens) is left out.
+SAFE_ENV_VARS = ("PATH", "HOME", "USER", "LOGNAME", "LANG", "LC_ALL", "TERM", "TZ", "TMPDIR", "SHELL")
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ShellPoolBusy(TimeoutError):
+    """Every worker stayed leased to other sessions for the whole wait."""
+
+
+@dataclass
+class ShellResult:
+    output: str
+    exit_code: Optional[int]
+    cwd: str
+    duration: float
+    timed_out: bool = False
+    # Bytes dropped from the middle of the output to stay within the byte budget
+    truncated_bytes: int = 0
+
+
+class OutputBuffer:
+    """Keeps the first and last `max_bytes / 2` bytes of a stream and counts what was dropped."""
+
+    def __init__(self, max_bytes: int):
+        self.head_limit = max_bytes // 2
+        self.tail_limit = max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.dropped = 0
+
+    def write(self, data: bytes) -> None:
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self.tail += data
+        overflow = len(self.tail) - self.tail_limit
+        if overflow > 0:
+            del self.tail[:overflow]
+            self.dropped += overflow
+
+    def text(self) -> str:
+        head = self.head.decode(errors="replace")
+        tail = self.tail.decode(errors="replace")
+        if not self.dropped:
+            return head + tail
+        return f"{head}\n... [{self.dropped} bytes truncated] ...\n{tail}"
+
+
+class ShellWorker:
+    """
+    A long-lived `bash` process that runs one command at a time.
+
+    The working directory and shell variables persist between commands. Each command is
+    followed by a unique marker carrying its exit code and the new working directory, so
+    output is read incrementally without waiting for the process to exit. A command that
+    exceeds its timeout kills the worker's whole process group; the next command starts
+    a fresh shell in the last known working directory.
+    """
+
+    def __init__(self, cwd: Optional[Union[str, Path]] = None, env: Optional[Dict[str, str]] = None):
+        self.cwd = str(Path(cwd or os.getcwd()).resolve())
+        self.env = env
+        self.commands_run = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._output: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def stream(self, command: str, timeout: float, max_output_bytes: int) -> Iterator[Union[str, ShellResult]]:
+        """Run `command`, yielding output chunks as they arrive and a `ShellResult` last."""
+        with self._lock:
+            self._ensure_started()
+            marker = f"__DEVPET_DONE_{uuid.uuid4().hex}__".encode()
+            script = (
+                f"{{ eval {shlex.quote(command)}\n}} </dev/null 2>&1\n"
+                f"__status=$?; printf '%s %d %s\\n' {marker.decode()} \"$__status\" \"$PWD\"\n"
+            )
+            start = time.monotonic()
+            deadline = start + timeout
+            buffer = OutputBuffer(max_output_bytes)
+            pending = b""
+            exit_code: Optional[int] = None
+            timed_out = False
+            try:
+                self._process.stdin.write(script.encode())
+                self._process.stdin.flush()
+            except OSError as e:
+                logger.warning(f"Shell worker died before the command was sent: {e}")
+                self._kill()
+                yield ShellResult("Error: the shell exited unexpectedly", None, self.cwd, 0.0)
+                return
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                try:
+                    chunk = self._output.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    continue
+                if chunk is None:
+                    # The command ended the shell itself, e.g. with `exit`.
+                    break
+                pending += chunk
+                index = pending.find(marker)
+                if index >= 0:
+                    output, trailer = pending[:index], pending[index + len(marker):]
+                    if b"\n" not in trailer:
+                        # The exit code and directory after the marker have not arrived yet.
+                        continue
+                    exit_code, self.cwd = self._parse_trailer(trailer)
+                    if output:
+                        buffer.write(output)
+                        yield output.decode(errors="replace")
+                    break
+                # Hold back enough bytes to recognise a marker split across reads.
+                safe = len(pending) - len(marker) - 1
+                if safe > 0:
+                    buffer.write(pending[:safe])
+                    yield pending[:safe].decode(errors="replace")
+                    pending = pending[safe:]
+
+            if exit_code is None:
+                if pending:
+                    buffer.write(pending)
+                self._kill()
+            self.commands_run += 1
+            yield ShellResult(
+                output=buffer.text(),
+                exit_code=exit_code,
+                cwd=self.cwd,
+                duration=time.monotonic() - start,
+                timed_out=timed_out,
+                truncated_bytes=buffer.dropped,
+            )
+
+    def run(self, command: str, timeout: float, max_output_bytes: int, on_output: Optional[Callable[[str], None]] = None) -> ShellResult:
+        for item in self.stream(command, timeout, max_output_bytes):
+            if isinstance(item, ShellResult):
+                return item
+            if on_output is not None:
+                on_output(item)
+        raise RuntimeError("Shell worker stopped without a result")
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
+
+    def _ensure_started(self) -> None:
+        if self.alive:
+            return
+        if not os.path.isdir(self.cwd):
+            self.cwd = os.getcwd()
+        self._output = queue.Queue()
+        self._process = subprocess.Popen(
+            ["bash", "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.cwd,
+            env=self.env,
+            start_new_session=True,
+        )
+        threading.Thread(target=self._pump, args=(self._process, self._output), daemon=True).start()
+
+    @staticmethod
+    def _pump(process: subprocess.Popen, output: "queue.Queue[Optional[bytes]]") -> None:
+        fd = process.stdout.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                output.put(None)
+                return
+            output.put(chunk)
+
+    def _parse_trailer(self, trailer: bytes) -> "tuple[Optional[int], str]":
+        line = trailer.split(b"\n", 1)[0].decode(errors="replace").strip()
+        status, _, cwd = line.partition(" ")
+        try:
+            return int(status), cwd or self.cwd
+        except ValueError:
+            return None, self.cwd
+
+    def _kill(self) -> None:
+        if self._process is None:
+            return
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Shell worker {self._process.pid} did not exit after SIGKILL")
+        for pipe in (self._process.stdin, self._process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self._process = None
+
+
+class ShellWorkerPool:
+    """
+    Bounded set of `ShellWorker`s with per-session affinity.
+
+    A session keeps the same worker, and with it its working directory and variables,
+    for as long as it stays in the pool. Commands run under a `lease`, which pins the
+    worker to its session until the command finishes. When all `size` workers are taken,
+    the least recently used session without a running command loses its worker and a
+    fresh shell is started for the new session; when every worker is leased the new
+    session waits for one to finish, up to the lease timeout. Workers start in `base_dir` with an environment
+    reduced to `SAFE_ENV_VARS`.
+    """
+
+    def __init__(
+            self,
+            size: int = 4,
+            base_dir: Optional[Union[str, Path]] = None,
+            env_vars: Iterable[str] = SAFE_ENV_VARS,
+            extra_env: Optional[Dict[str, str]] = None,
+    ):
+        self.size = size
+        self.base_dir = str(Path(base_dir or os.getcwd()).resolve())
+        self.env = {name: os.environ[name] for name in env_vars if name in os.environ}
+        self.env.update(extra_env or {})
+        self._workers: "OrderedDict[str, ShellWorker]" = OrderedDict()
+        # Running commands per worker; a leased worker is never evicted or closed
+        self._leases: Dict[ShellWorker, int] = {}
+        # Workers released or evicted while leased, closed when their last lease ends
+        self._retired: Set[ShellWorker] = set()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    @contextmanager
+    def lease(self, session_id: str, timeout: Optional[float] = None) -> Iterator[ShellWorker]:
+        """
+        Hold the session's worker for the duration of the block, e.g. one command. Raises
+        `ShellPoolBusy` when every worker stays leased to other sessions for `timeout` seconds.
+        """
+        evicted = None
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            worker = self._workers.get(session_id)
+            while worker is None:
+                if len(self._workers) < self.size:
+                    worker = ShellWorker(cwd=self.base_dir, env=self.env)
+                    break
+                idle = next((sid for sid, w in self._workers.items() if not self._leases.get(w)), None)
+                if idle is not None:
+                    evicted = self._workers.pop(idle)
+                    logger.debug(f"Shell worker of session {idle} evicted for session {session_id}")
+                    worker = ShellWorker(cwd=self.base_dir, env=self.env)
+                    break
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise ShellPoolBusy(f"All {self.size} shell workers are busy with other sessions")
+                self._available.wait(remaining)
+                worker = self._workers.get(session_id)
+            self._workers[session_id] = worker
+            self._workers.move_to_end(session_id)
+            self._leases[worker] = self._leases.get(worker, 0) + 1
+        if evicted is not None:
+            evicted.close()
+        try:
+            yield worker
+        finally:
+            with self._lock:
+                self._leases[worker] -= 1
+                done = not self._leases[worker]
+                if done:
+                    del self._leases[worker]
+                    self._available.notify_all()
+                retired = done and worker in self._retired
+                if retired:
+                    self._retired.discard(worker)
+            if retired:
+                worker.close()
+
+    def release(self, session_id: str) -> None:
+        with self._lock:
+            worker = self._workers.pop(session_id, None)
+            if worker is not None and self._leases.get(worker):
+                self._retired.add(worker)
+                worker = None
+            self._available.notify_all()
+        if worker is not None:
+            worker.close()
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._workers.values()) + list(self._retired)
+            self._workers.clear()
+            self._retired.clear()
+            self._available.notify_all()
+        for worker in workers:
+            worker.close()
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+
+_default_pool: Optional[ShellWorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_shell_pool() -> ShellWorkerPool:
+    """Return the process-wide worker pool shared by the shell toolkits."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ShellWorkerPool()
+        return _default_pool
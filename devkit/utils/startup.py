@@ -0,0 +1,109 @@
+"""
+Import-time startup report.
+
+    python -m devkit.utils.startup agent_os --top 25 --budget 0.5
+
+Imports the module in a fresh interpreter with `-X importtime`, lists the slowest
+modules and exits with status 1 when the total import time exceeds `--budget` seconds.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class ModuleImport:
+    name: str
+    self_seconds: float
+    cumulative_seconds: float
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    module: str
+    total_seconds: float
+    modules: List[ModuleImport] = field(default_factory=list)
+    budget: Optional[float] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total_seconds > self.budget
+
+    def slowest(self, top: int = 20, own_only: bool = False) -> List[ModuleImport]:
+        """Modules ordered by cumulative import time, or by their own time with `own_only`."""
+        key = (lambda m: m.self_seconds) if own_only else (lambda m: m.cumulative_seconds)
+        return sorted(self.modules, key=key, reverse=True)[:top]
+
+    def summary(self, top: int = 20) -> str:
+        lines = [f"Importing {self.module} took {self.total_seconds * 1000:.0f}ms ({len(self.modules)} modules)"]
+        if self.budget is not None:
+            verdict = "OVER BUDGET" if self.over_budget else "within budget"
+            lines.append(f"Budget {self.budget * 1000:.0f}ms: {verdict}")
+        lines.append(f"{'cumulative':>12} {'self':>10}  module")
+        for m in self.slowest(top):
+            lines.append(f"{m.cumulative_seconds * 1000:>10.1f}ms {m.self_seconds * 1000:>8.1f}ms  {'  ' * m.depth}{m.name}")
+        return "\n".join(lines)
+
+
+def parse_importtime(output: str) -> List[ModuleImport]:
+    """Parse the `import time:` lines that `python -X importtime` writes to stderr."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        modules.append(ModuleImport(
+            name=stripped,
+            self_seconds=int(parts[0]) / 1e6,
+            cumulative_seconds=int(parts[1]) / 1e6,
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return modules
+
+
+def startup_report(
+        module: str,
+        budget: Optional[float] = None,
+        path: Optional[str] = None,
+        python: str = sys.executable,
+) -> StartupReport:
+    """
+    Import `module` in a fresh interpreter and report the import time of every module it pulls in.
+    `path` (default the working directory) is put on the interpreter's `PYTHONPATH`.
+    """
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [path or os.getcwd(), os.environ.get("PYTHONPATH")]))},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    # The module's own cumulative time, interpreter startup (site, encodings) is not counted
+    entry = next((m for m in reversed(modules) if m.name == module and m.depth == 0), None)
+    total = entry.cumulative_seconds if entry else sum(m.cumulative_seconds for m in modules if m.depth == 0)
+    return StartupReport(module=module, total_seconds=total, modules=modules, budget=budget)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="agent_os", help="Module to import, default agent_os")
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list")
+    parser.add_argument("--budget", type=float, help="Seconds the import may take")
+    args = parser.parse_args(argv)
+    report = startup_report(args.module, budget=args.budget)
+    print(report.summary(args.top))
+    return 1 if report.over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
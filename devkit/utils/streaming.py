@@ -0,0 +1,121 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from agno.run.agent import RunEvent
+from agno.run.team import TeamRunEvent
+
+CONTENT_EVENTS = {RunEvent.run_content.value, TeamRunEvent.run_content.value}
+
+
+@dataclass
+class StreamStats:
+    started_at: float = 0.0
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tokens: int = 0
+    chars: int = 0
+    frames: int = 0
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        return self.tokens / elapsed if elapsed > 0 else None
+
+    def summary(self) -> str:
+        ttft = self.time_to_first_token
+        tps = self.tokens_per_second
+        return (
+            f"ttft={'n/a' if ttft is None else f'{ttft * 1000:.0f}ms'} "
+            f"tokens={self.tokens} tokens/s={'n/a' if tps is None else f'{tps:.1f}'} "
+            f"chars={self.chars} frames={self.frames}"
+        )
+
+
+class CoalescingStream:
+    """
+    Turns the event stream of `agent.arun(..., stream=True)` into batched text frames.
+
+    Only content deltas are forwarded; tool, reasoning and memory events are dropped. Text is
+    buffered and emitted once `max_chars` are collected or the oldest buffered delta is
+    `max_delay` seconds old, even if the model stalls in between (e.g. during a tool call).
+    Timing and throughput of the run are recorded in `stats`.
+    """
+
+    def __init__(self, events: AsyncIterator[Any], max_chars: int = 256, max_delay: float = 0.04):
+        self.events = events
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self.stats = StreamStats()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        self.stats = StreamStats(started_at=time.perf_counter())
+        buffer = []
+        buffered_chars = 0
+        buffered_at = 0.0
+        iterator = self.events.__aiter__()
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = None
+                if buffer:
+                    timeout = max(0.0, buffered_at + self.max_delay - time.perf_counter())
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    yield self._flush(buffer)
+                    buffer, buffered_chars = [], 0
+                    continue
+
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+
+                text = self._content_of(event)
+                if not text:
+                    continue
+                now = time.perf_counter()
+                if self.stats.first_token_at is None:
+                    self.stats.first_token_at = now
+                self.stats.tokens += 1
+                self.stats.chars += len(text)
+                if not buffer:
+                    buffered_at = now
+                buffer.append(text)
+                buffered_chars += len(text)
+                if buffered_chars >= self.max_chars or now - buffered_at >= self.max_delay:
+                    yield self._flush(buffer)
+                    buffer, buffered_chars = [], 0
+
+            if buffer:
+                yield self._flush(buffer)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            self.stats.finished_at = time.perf_counter()
+
+    def _flush(self, buffer: list) -> str:
+        self.stats.frames += 1
+        return "".join(buffer)
+
+    @staticmethod
+    def _content_of(event: Any) -> Optional[str]:
+        if isinstance(event, str):
+            return event
+        if getattr(event, "event", None) not in CONTENT_EVENTS:
+            return None
+        content = getattr(event, "content", None)
+        return content if isinstance(content, str) else None
@@ -0,0 +1,44 @@
+import json
+from functools import lru_cache
+from typing import Any, Optional
+
+from agno.models.message import Message
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens with tiktoken when it is installed, otherwise estimate ~4 characters per token."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def message_text(message: Message) -> str:
+    content = message.content
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=str)
+
+
+def count_message_tokens(message: Message) -> int:
+    # A few tokens of per-message overhead for role and separators.
+    tokens = 4 + count_tokens(message_text(message))
+    if message.tool_calls:
+        tokens += count_tokens(json.dumps(message.tool_calls, default=str))
+    return tokens
@@ -1,17 +1,19 @@
 import uuid
 
-from agno.models.openai import OpenAIChat
-
 from devkit.agent_dev import build_agent
+from devkit.context import ContextBudget
+from devkit.router import RoutingOpenAIChat
 
 
-def wakeup_agent():
-    model = OpenAIChat(id="gpt-4.1-mini")
+def wakeup_agent(async_tools: bool = False):
+    model = RoutingOpenAIChat(id="gpt-4.1-mini", fast_id="gpt-4.1-nano")
     # model=DeepSeek()
     return build_agent(model=model,
                        user_id="phong",
                        session_id=str(uuid.uuid1()),
-                       debug_mode=True)
+                       debug_mode=True,
+                       async_tools=async_tools,
+                       context_budget=ContextBudget())
 
 
 def chat_with_agent(agent):
@@ -1,20 +1,48 @@
 import chainlit as cl
 
-from main import wakeup_agent
+from devkit.admission import AdmissionRejected, admission_user
+from devkit.agent_pool import AgentPool
+from devkit.context import ContextBudget
+from devkit.utils.log import logger
+from devkit.utils.streaming import CoalescingStream
+
+agent_pool = AgentPool(idle_timeout=1800, context_budget=ContextBudget())
+agent_pool.warmup()
 
 
 @cl.on_chat_start
-async def main():
+async def start():
+    session_id = cl.context.session.id
+    cl.user_session.set("agent", agent_pool.get(session_id))
     await cl.Message(content="Start new session").send()
 
 
 @cl.on_message
 async def main(message: cl.Message):
-    agent = wakeup_agent()
+    # Refresh the pool entry on every turn so active sessions are not evicted as idle.
+    agent = agent_pool.get(cl.context.session.id)
+    cl.user_session.set("agent", agent)
     msg = cl.Message(content="")
-    run_response = await agent.arun(message.content, stream=True)
-    async for chunk in run_response:
-        # yield chunk.content
-        await msg.stream_token(chunk.content)
+    stream = CoalescingStream(agent.arun(message.content, stream=True), max_chars=256, max_delay=0.04)
+    # Model calls of this turn queue for capacity on behalf of the signed-in user (or the chat session)
+    user = cl.context.session.user
+    try:
+        with admission_user(user.identifier if user else cl.context.session.id):
+            async for text in stream:
+                await msg.stream_token(text)
+    except AdmissionRejected as e:
+        logger.warning(f"Turn of session {agent.session_id} not admitted: {e}")
+        await msg.stream_token("The assistant is busy right now, please try again in a moment.")
 
     await msg.update()
+    logger.info(f"Streamed reply for session {agent.session_id}: {stream.stats.summary()}")
+
+
+@cl.on_chat_end
+async def end():
+    agent_pool.evict(cl.context.session.id)
+
+
+@cl.on_app_shutdown
+async def shutdown():
+    await agent_pool.aclose()